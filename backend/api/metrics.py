@@ -0,0 +1,28 @@
+"""Prometheus metrics endpoint"""
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.connection import get_async_db
+from database.unit_of_work import UnitOfWorkRoute
+from repositories.analysis_repository import AnalysisRepository
+from services.async_service import AsyncService
+from services.metrics_service import MetricsService
+
+router = APIRouter(route_class=UnitOfWorkRoute)
+
+
+async def get_metrics_service(db: AsyncSession = Depends(get_async_db)) -> AsyncService[MetricsService]:
+    """Dependency injection for MetricsService"""
+    return AsyncService(db, lambda session: MetricsService(AnalysisRepository(session)))
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Prometheus metrics",
+)
+async def metrics(service: AsyncService[MetricsService] = Depends(get_metrics_service)):
+    """Per-rule cost and analysis counts in Prometheus text format"""
+    return PlainTextResponse(await service.run(MetricsService.render), media_type="text/plain; version=0.0.4")
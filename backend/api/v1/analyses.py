@@ -1,34 +1,164 @@
 """API endpoints for project analyses and findings"""
 
-from fastapi import APIRouter, Depends, status
+import json
+from typing import Iterator, Literal, Optional
+
+from fastapi import APIRouter, Depends, status, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from database.connection import get_db
+from database.connection import get_async_db, get_db
+from database.unit_of_work import UnitOfWorkRoute
 from repositories.analysis_repository import AnalysisRepository
+from repositories.project_repository import ProjectRepository
 from services.analysis_service import AnalysisService
-from models.analysis import Analysis, FindingList
+from services.async_service import AsyncService
+from services.portfolio_service import PortfolioService
+from models.analysis import Analysis, AnalysisProfile, FindingList, PortfolioAnalysis, PortfolioAnalysisRequest
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
-def get_analysis_service(db: Session = Depends(get_db)) -> AnalysisService:
+async def get_analysis_service(db: AsyncSession = Depends(get_async_db)) -> AsyncService[AnalysisService]:
     """Dependency injection for AnalysisService"""
+    return AsyncService(db, lambda session: AnalysisService(AnalysisRepository(session)))
+
+
+def get_sync_analysis_service(db: Session = Depends(get_db)) -> AnalysisService:
+    """Dependency injection for AnalysisService, for the findings stream (a sync generator)"""
     repository = AnalysisRepository(db)
     return AnalysisService(repository)
 
 
+def get_portfolio_service(db: Session = Depends(get_db)) -> PortfolioService:
+    """Dependency injection for PortfolioService"""
+    return PortfolioService(ProjectRepository(db))
+
+
 @router.post(
     "/projects/{project_id}/analyze",
     response_model=Analysis,
-    status_code=status.HTTP_201_CREATED,
-    summary="Run security analysis for a project",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue a security analysis for a project",
 )
-def run_analysis(
+async def run_analysis(
     project_id: str,
-    service: AnalysisService = Depends(get_analysis_service),
+    incremental: bool = Query(False, description="Only re-run rules touching entities changed since the last analysis"),
+    service: AsyncService[AnalysisService] = Depends(get_analysis_service),
+):
+    """Queue analysis of project's architecture; poll /analyses/{id} for its status"""
+    return await service.run(AnalysisService.enqueue_analysis, project_id, incremental=incremental)
+
+
+@router.post(
+    "/analyses/batch",
+    response_model=PortfolioAnalysis,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Analyze many projects in parallel",
+)
+def run_batch_analysis(
+    request: PortfolioAnalysisRequest,
+    service: PortfolioService = Depends(get_portfolio_service),
+):
+    """Queue analysis of the given projects (default: all) over a process pool"""
+    return service.start_batch(request)
+
+
+@router.get(
+    "/analyses/batch/{batch_id}",
+    response_model=PortfolioAnalysis,
+    summary="Get batch analysis progress",
+)
+def get_batch_analysis(
+    batch_id: str,
+    service: PortfolioService = Depends(get_portfolio_service),
+):
+    """Get progress and aggregate throughput of a batch analysis"""
+    return service.get_batch(batch_id)
+
+
+@router.get(
+    "/analyses/{analysis_id}",
+    response_model=Analysis,
+    summary="Get analysis status",
+)
+async def get_analysis(
+    analysis_id: str,
+    service: AsyncService[AnalysisService] = Depends(get_analysis_service),
+):
+    """Get an analysis (status, counters) by ID"""
+    return await service.run(AnalysisService.get_analysis, analysis_id)
+
+
+@router.get(
+    "/analyses/{analysis_id}/profile",
+    response_model=AnalysisProfile,
+    summary="Get per-rule profiling of an analysis",
+)
+async def get_analysis_profile(
+    analysis_id: str,
+    service: AsyncService[AnalysisService] = Depends(get_analysis_service),
+):
+    """Wall time, entities scanned and findings per rule, most expensive rule first"""
+    return await service.run(AnalysisService.get_profile, analysis_id)
+
+
+@router.get(
+    "/analyses/{analysis_id}/findings/stream",
+    summary="Stream findings as the analysis produces them",
+    response_class=StreamingResponse,
+)
+def stream_analysis_findings(
+    analysis_id: str,
+    stream_format: Literal["ndjson", "sse"] = Query(
+        "ndjson", alias="format", description="ndjson (one JSON event per line) or sse (Server-Sent Events)"
+    ),
+    service: AnalysisService = Depends(get_sync_analysis_service),
+):
+    """
+    Stream findings of an analysis
+
+    Live while the analysis runs, from storage (most severe first) once it
+    is finished. Events: `finding` (a finding), `heartbeat` (keep-alive) and
+    a final `end` carrying the analysis with its counters and status.
+    """
+    events = service.stream_findings(analysis_id)
+    if stream_format == "sse":
+        return StreamingResponse(
+            _encode_sse(events),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
+    return StreamingResponse(_encode_ndjson(events), media_type="application/x-ndjson")
+
+
+def _encode_ndjson(events: Iterator[tuple[str, Optional[BaseModel]]]) -> Iterator[str]:
+    for event, payload in events:
+        data = payload.model_dump(mode="json") if payload else None
+        yield json.dumps({"event": event, "data": data}) + "\n"
+
+
+def _encode_sse(events: Iterator[tuple[str, Optional[BaseModel]]]) -> Iterator[str]:
+    for event, payload in events:
+        if payload is None:
+            yield f": {event}\n\n"
+        else:
+            yield f"event: {event}\ndata: {payload.model_dump_json()}\n\n"
+
+
+@router.post(
+    "/analyses/{analysis_id}/cancel",
+    response_model=Analysis,
+    summary="Cancel a pending or running analysis",
+)
+async def cancel_analysis(
+    analysis_id: str,
+    service: AsyncService[AnalysisService] = Depends(get_analysis_service),
 ):
-    """Run analysis on project's architecture"""
-    return service.run_analysis(project_id)
+    """Cancel an analysis; a running one stops before its next rule"""
+    return await service.run(AnalysisService.cancel_analysis, analysis_id)
 
 
 @router.get(
@@ -36,12 +166,12 @@ def run_analysis(
     response_model=Analysis,
     summary="Get latest analysis for a project",
 )
-def get_latest_analysis(
+async def get_latest_analysis(
     project_id: str,
-    service: AnalysisService = Depends(get_analysis_service),
+    service: AsyncService[AnalysisService] = Depends(get_analysis_service),
 ):
     """Get latest analysis for project"""
-    return service.get_latest_analysis(project_id)
+    return await service.run(AnalysisService.get_latest_analysis, project_id)
 
 
 @router.get(
@@ -49,9 +179,11 @@ def get_latest_analysis(
     response_model=FindingList,
     summary="Get findings from latest analysis",
 )
-def get_project_findings(
+async def get_project_findings(
     project_id: str,
-    service: AnalysisService = Depends(get_analysis_service),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size (default: all findings)"),
+    offset: int = Query(0, ge=0, description="Findings to skip"),
+    service: AsyncService[AnalysisService] = Depends(get_analysis_service),
 ):
-    """Get findings from latest analysis for project"""
-    return service.get_findings_for_project(project_id)
+    """Get findings from latest analysis for project, optionally one page at a time"""
+    return await service.run(AnalysisService.get_findings_for_project, project_id, limit, offset)
@@ -3,20 +3,21 @@ API endpoints for Architecture CRUD operations
 """
 
 from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.connection import get_db
+from database.connection import get_async_db
+from database.unit_of_work import UnitOfWorkRoute
 from repositories.architecture_repository import ArchitectureRepository
+from services.async_service import AsyncService
 from services.architecture_service import ArchitectureService
 from models.architecture import Architecture, ArchitectureCreate, ArchitectureUpdate
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
-def get_architecture_service(db: Session = Depends(get_db)) -> ArchitectureService:
+async def get_architecture_service(db: AsyncSession = Depends(get_async_db)) -> AsyncService[ArchitectureService]:
     """Dependency injection for ArchitectureService"""
-    repository = ArchitectureRepository(db)
-    return ArchitectureService(repository)
+    return AsyncService(db, lambda session: ArchitectureService(ArchitectureRepository(session)))
 
 
 @router.post(
@@ -26,12 +27,12 @@ def get_architecture_service(db: Session = Depends(get_db)) -> ArchitectureServi
     summary="Create a new architecture",
     description="Create a new architecture for a project. One architecture per project maximum."
 )
-def create_architecture(
+async def create_architecture(
     architecture: ArchitectureCreate,
-    service: ArchitectureService = Depends(get_architecture_service)
+    service: AsyncService[ArchitectureService] = Depends(get_architecture_service)
 ):
     """Create a new architecture"""
-    return service.create_architecture(architecture)
+    return await service.run(ArchitectureService.create_architecture, architecture)
 
 
 @router.get(
@@ -40,12 +41,12 @@ def create_architecture(
     summary="Get architecture by ID",
     description="Retrieve a single architecture by its ID"
 )
-def get_architecture(
+async def get_architecture(
     architecture_id: str,
-    service: ArchitectureService = Depends(get_architecture_service)
+    service: AsyncService[ArchitectureService] = Depends(get_architecture_service)
 ):
     """Get architecture by ID"""
-    return service.get_architecture(architecture_id)
+    return await service.run(ArchitectureService.get_architecture, architecture_id)
 
 
 @router.get(
@@ -54,12 +55,12 @@ def get_architecture(
     summary="Get architecture for a project",
     description="Retrieve the architecture associated with a project"
 )
-def get_architecture_by_project(
+async def get_architecture_by_project(
     project_id: str,
-    service: ArchitectureService = Depends(get_architecture_service)
+    service: AsyncService[ArchitectureService] = Depends(get_architecture_service)
 ):
     """Get architecture by project ID"""
-    architecture = service.get_architecture_by_project(project_id)
+    architecture = await service.run(ArchitectureService.get_architecture_by_project, project_id)
     if not architecture:
         from fastapi import HTTPException
         raise HTTPException(
@@ -75,13 +76,13 @@ def get_architecture_by_project(
     summary="Update architecture",
     description="Update an existing architecture"
 )
-def update_architecture(
+async def update_architecture(
     architecture_id: str,
     architecture: ArchitectureUpdate,
-    service: ArchitectureService = Depends(get_architecture_service)
+    service: AsyncService[ArchitectureService] = Depends(get_architecture_service)
 ):
     """Update an architecture"""
-    return service.update_architecture(architecture_id, architecture)
+    return await service.run(ArchitectureService.update_architecture, architecture_id, architecture)
 
 
 @router.delete(
@@ -90,9 +91,9 @@ def update_architecture(
     summary="Delete architecture",
     description="Delete an architecture and all related data (zones, components, flows)"
 )
-def delete_architecture(
+async def delete_architecture(
     architecture_id: str,
-    service: ArchitectureService = Depends(get_architecture_service)
+    service: AsyncService[ArchitectureService] = Depends(get_architecture_service)
 ):
     """Delete an architecture"""
-    service.delete_architecture(architecture_id)
+    await service.run(ArchitectureService.delete_architecture, architecture_id)
@@ -3,20 +3,21 @@ API endpoints for Component CRUD operations
 """
 
 from fastapi import APIRouter, Depends, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.connection import get_db
+from database.connection import get_async_db
+from database.unit_of_work import UnitOfWorkRoute
 from repositories.component_repository import ComponentRepository
+from services.async_service import AsyncService
 from services.component_service import ComponentService
 from models.component import Component, ComponentCreate, ComponentUpdate, ComponentList
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
-def get_component_service(db: Session = Depends(get_db)) -> ComponentService:
+async def get_component_service(db: AsyncSession = Depends(get_async_db)) -> AsyncService[ComponentService]:
     """Dependency injection for ComponentService"""
-    repository = ComponentRepository(db)
-    return ComponentService(repository)
+    return AsyncService(db, lambda session: ComponentService(ComponentRepository(session)))
 
 
 @router.post(
@@ -26,12 +27,12 @@ def get_component_service(db: Session = Depends(get_db)) -> ComponentService:
     summary="Create a new component",
     description="Create a new component within a zone"
 )
-def create_component(
+async def create_component(
     component: ComponentCreate,
-    service: ComponentService = Depends(get_component_service)
+    service: AsyncService[ComponentService] = Depends(get_component_service)
 ):
     """Create a new component"""
-    return service.create_component(component)
+    return await service.run(ComponentService.create_component, component)
 
 
 @router.get(
@@ -40,12 +41,12 @@ def create_component(
     summary="Get component by ID",
     description="Retrieve a single component by its ID"
 )
-def get_component(
+async def get_component(
     component_id: str,
-    service: ComponentService = Depends(get_component_service)
+    service: AsyncService[ComponentService] = Depends(get_component_service)
 ):
     """Get component by ID"""
-    return service.get_component(component_id)
+    return await service.run(ComponentService.get_component, component_id)
 
 
 @router.get(
@@ -54,14 +55,14 @@ def get_component(
     summary="Get components for an architecture",
     description="Retrieve all components for a specific architecture"
 )
-def get_components_by_architecture(
+async def get_components_by_architecture(
     architecture_id: str,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    service: ComponentService = Depends(get_component_service)
+    service: AsyncService[ComponentService] = Depends(get_component_service)
 ):
     """Get all components for an architecture"""
-    return service.get_components_by_architecture(architecture_id, skip, limit)
+    return await service.run(ComponentService.get_components_by_architecture, architecture_id, skip, limit)
 
 
 @router.get(
@@ -70,14 +71,14 @@ def get_components_by_architecture(
     summary="Get components for a zone",
     description="Retrieve all components within a specific zone"
 )
-def get_components_by_zone(
+async def get_components_by_zone(
     zone_id: str,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    service: ComponentService = Depends(get_component_service)
+    service: AsyncService[ComponentService] = Depends(get_component_service)
 ):
     """Get all components in a zone"""
-    return service.get_components_by_zone(zone_id, skip, limit)
+    return await service.run(ComponentService.get_components_by_zone, zone_id, skip, limit)
 
 
 @router.put(
@@ -86,13 +87,13 @@ def get_components_by_zone(
     summary="Update component",
     description="Update an existing component"
 )
-def update_component(
+async def update_component(
     component_id: str,
     component: ComponentUpdate,
-    service: ComponentService = Depends(get_component_service)
+    service: AsyncService[ComponentService] = Depends(get_component_service)
 ):
     """Update a component"""
-    return service.update_component(component_id, component)
+    return await service.run(ComponentService.update_component, component_id, component)
 
 
 @router.delete(
@@ -101,9 +102,9 @@ def update_component(
     summary="Delete component",
     description="Delete a component and all flows involving it"
 )
-def delete_component(
+async def delete_component(
     component_id: str,
-    service: ComponentService = Depends(get_component_service)
+    service: AsyncService[ComponentService] = Depends(get_component_service)
 ):
     """Delete a component"""
-    service.delete_component(component_id)
+    await service.run(ComponentService.delete_component, component_id)
@@ -3,20 +3,21 @@ API endpoints for Flow CRUD operations
 """
 
 from fastapi import APIRouter, Depends, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.connection import get_db
+from database.connection import get_async_db
+from database.unit_of_work import UnitOfWorkRoute
 from repositories.flow_repository import FlowRepository
+from services.async_service import AsyncService
 from services.flow_service import FlowService
 from models.flow import Flow, FlowCreate, FlowUpdate, FlowList
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
-def get_flow_service(db: Session = Depends(get_db)) -> FlowService:
+async def get_flow_service(db: AsyncSession = Depends(get_async_db)) -> AsyncService[FlowService]:
     """Dependency injection for FlowService"""
-    repository = FlowRepository(db)
-    return FlowService(repository)
+    return AsyncService(db, lambda session: FlowService(FlowRepository(session)))
 
 
 @router.post(
@@ -26,12 +27,12 @@ def get_flow_service(db: Session = Depends(get_db)) -> FlowService:
     summary="Create a new flow",
     description="Create a new data flow between components"
 )
-def create_flow(
+async def create_flow(
     flow: FlowCreate,
-    service: FlowService = Depends(get_flow_service)
+    service: AsyncService[FlowService] = Depends(get_flow_service)
 ):
     """Create a new flow"""
-    return service.create_flow(flow)
+    return await service.run(FlowService.create_flow, flow)
 
 
 @router.get(
@@ -40,12 +41,12 @@ def create_flow(
     summary="Get flow by ID",
     description="Retrieve a single flow by its ID"
 )
-def get_flow(
+async def get_flow(
     flow_id: str,
-    service: FlowService = Depends(get_flow_service)
+    service: AsyncService[FlowService] = Depends(get_flow_service)
 ):
     """Get flow by ID"""
-    return service.get_flow(flow_id)
+    return await service.run(FlowService.get_flow, flow_id)
 
 
 @router.get(
@@ -54,14 +55,14 @@ def get_flow(
     summary="Get flows for an architecture",
     description="Retrieve all data flows for a specific architecture"
 )
-def get_flows_by_architecture(
+async def get_flows_by_architecture(
     architecture_id: str,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    service: FlowService = Depends(get_flow_service)
+    service: AsyncService[FlowService] = Depends(get_flow_service)
 ):
     """Get all flows for an architecture"""
-    return service.get_flows_by_architecture(architecture_id, skip, limit)
+    return await service.run(FlowService.get_flows_by_architecture, architecture_id, skip, limit)
 
 
 @router.get(
@@ -70,14 +71,14 @@ def get_flows_by_architecture(
     summary="Get flows for a component",
     description="Retrieve all flows involving a specific component (as source or target)"
 )
-def get_flows_by_component(
+async def get_flows_by_component(
     component_id: str,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    service: FlowService = Depends(get_flow_service)
+    service: AsyncService[FlowService] = Depends(get_flow_service)
 ):
     """Get all flows involving a component"""
-    return service.get_flows_by_component(component_id, skip, limit)
+    return await service.run(FlowService.get_flows_by_component, component_id, skip, limit)
 
 
 @router.put(
@@ -86,13 +87,13 @@ def get_flows_by_component(
     summary="Update flow",
     description="Update an existing flow"
 )
-def update_flow(
+async def update_flow(
     flow_id: str,
     flow: FlowUpdate,
-    service: FlowService = Depends(get_flow_service)
+    service: AsyncService[FlowService] = Depends(get_flow_service)
 ):
     """Update a flow"""
-    return service.update_flow(flow_id, flow)
+    return await service.run(FlowService.update_flow, flow_id, flow)
 
 
 @router.delete(
@@ -101,9 +102,9 @@ def update_flow(
     summary="Delete flow",
     description="Delete a data flow"
 )
-def delete_flow(
+async def delete_flow(
     flow_id: str,
-    service: FlowService = Depends(get_flow_service)
+    service: AsyncService[FlowService] = Depends(get_flow_service)
 ):
     """Delete a flow"""
-    service.delete_flow(flow_id)
+    await service.run(FlowService.delete_flow, flow_id)
@@ -0,0 +1,121 @@
+"""
+API endpoints for graph analyses of an architecture
+"""
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from database.connection import get_db
+from database.unit_of_work import UnitOfWorkRoute
+from repositories.architecture_repository import ArchitectureRepository
+from services.graph_service import GraphService
+from models.component import ComponentType
+from models.graph import (
+    AttackPathReport,
+    BlastRadius,
+    BlastRadiusReport,
+    CycleReport,
+    RankedAttackPathReport,
+    ZoneMatrixReport,
+)
+
+router = APIRouter(route_class=UnitOfWorkRoute)
+
+
+def get_graph_service(db: Session = Depends(get_db)) -> GraphService:
+    """Dependency injection for GraphService"""
+    return GraphService(ArchitectureRepository(db))
+
+
+@router.get(
+    "/architectures/{architecture_id}/attack-paths",
+    response_model=AttackPathReport,
+    summary="List attack paths from untrusted zones",
+    description="Shortest flow path from every component of an untrusted zone to every reachable "
+                "component of the target type (databases by default)"
+)
+def get_attack_paths(
+    architecture_id: str,
+    target_type: ComponentType = Query(ComponentType.DATABASE, description="Component type to reach"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of paths returned"),
+    service: GraphService = Depends(get_graph_service),
+):
+    """Get attack paths of an architecture, fewest hops first"""
+    return service.get_attack_paths(architecture_id, target_type, limit)
+
+
+@router.get(
+    "/architectures/{architecture_id}/attack-paths/ranked",
+    response_model=RankedAttackPathReport,
+    summary="Rank the cheapest attack paths between two zones",
+    description="k cheapest loopless paths (Yen) where each flow costs one hop plus the controls it "
+                "crosses: authentication, encryption, MFA on the target, firewall or bastion targets"
+)
+def get_ranked_attack_paths(
+    architecture_id: str,
+    source_zone_id: str = Query(..., description="Zone the attacker starts from"),
+    target_zone_id: str = Query(..., description="Zone to reach"),
+    k: int = Query(5, ge=1, le=50, description="Number of paths"),
+    service: GraphService = Depends(get_graph_service),
+):
+    """Get the k cheapest attack paths from one zone into another"""
+    return service.get_ranked_attack_paths(architecture_id, source_zone_id, target_zone_id, k)
+
+
+@router.get(
+    "/architectures/{architecture_id}/blast-radius",
+    response_model=BlastRadiusReport,
+    summary="Get the blast radius of every component",
+    description="Components and zones reachable through flows from each component, largest first"
+)
+def get_blast_radii(
+    architecture_id: str,
+    limit: int = Query(None, ge=1, description="Maximum number of components returned"),
+    service: GraphService = Depends(get_graph_service),
+):
+    """Get the blast radius of all components of an architecture"""
+    return service.get_blast_radii(architecture_id, limit)
+
+
+@router.get(
+    "/architectures/{architecture_id}/blast-radius/{component_id}",
+    response_model=BlastRadius,
+    summary="Get the blast radius of one component",
+    description="Components and zones an attacker reaches through flows once the component is compromised"
+)
+def get_blast_radius(
+    architecture_id: str,
+    component_id: str,
+    service: GraphService = Depends(get_graph_service),
+):
+    """Get the blast radius of one component"""
+    return service.get_blast_radius(architecture_id, component_id)
+
+
+@router.get(
+    "/architectures/{architecture_id}/cycles",
+    response_model=CycleReport,
+    summary="Get the cycles of the flow graph",
+    description="Groups of components reaching each other through flows, and pairs of components "
+                "with flows in both directions"
+)
+def get_cycles(
+    architecture_id: str,
+    service: GraphService = Depends(get_graph_service),
+):
+    """Get the strongly connected groups and bidirectional flows of an architecture"""
+    return service.get_cycles(architecture_id)
+
+
+@router.get(
+    "/architectures/{architecture_id}/zone-matrix",
+    response_model=ZoneMatrixReport,
+    summary="Get the zone adjacency matrix",
+    description="Flow counts between every pair of zones, with protocols and encrypted/authenticated ratios"
+)
+def get_zone_matrix(
+    architecture_id: str,
+    service: GraphService = Depends(get_graph_service),
+):
+    """Get the zone-by-zone flow matrix of an architecture"""
+    return service.get_zone_matrix(architecture_id)
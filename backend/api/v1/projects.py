@@ -5,18 +5,20 @@ REST API endpoints for project management
 """
 
 from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.connection import get_db
+from database.connection import get_async_db
+from database.unit_of_work import UnitOfWorkRoute
 from models.project import Project, ProjectCreate, ProjectUpdate, ProjectList
+from services.async_service import AsyncService
 from services.project_service import ProjectService
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
-def get_project_service(db: Session = Depends(get_db)) -> ProjectService:
+async def get_project_service(db: AsyncSession = Depends(get_async_db)) -> AsyncService[ProjectService]:
     """Dependency to get ProjectService instance"""
-    return ProjectService(db)
+    return AsyncService(db, lambda session: ProjectService(session))
 
 
 @router.post(
@@ -27,9 +29,9 @@ def get_project_service(db: Session = Depends(get_db)) -> ProjectService:
     description="Create a new architecture analysis project",
     tags=["Projects"]
 )
-def create_project(
+async def create_project(
     project: ProjectCreate,
-    service: ProjectService = Depends(get_project_service)
+    service: AsyncService[ProjectService] = Depends(get_project_service)
 ) -> Project:
     """
     Create a new project.
@@ -39,7 +41,7 @@ def create_project(
     - **business_context**: Business context and objectives (optional)
     - **criticality_level**: Criticality level (low, medium, high, critical)
     """
-    return service.create_project(project)
+    return await service.run(ProjectService.create_project, project)
 
 
 @router.get(
@@ -49,10 +51,10 @@ def create_project(
     description="Get a list of all architecture analysis projects",
     tags=["Projects"]
 )
-def list_projects(
+async def list_projects(
     skip: int = 0,
     limit: int = 100,
-    service: ProjectService = Depends(get_project_service)
+    service: AsyncService[ProjectService] = Depends(get_project_service)
 ) -> ProjectList:
     """
     List all projects with pagination.
@@ -62,7 +64,7 @@ def list_projects(
     """
     if limit > 100:
         limit = 100
-    return service.list_projects(skip=skip, limit=limit)
+    return await service.run(ProjectService.list_projects, skip=skip, limit=limit)
 
 
 @router.get(
@@ -72,16 +74,16 @@ def list_projects(
     description="Get a specific project by ID",
     tags=["Projects"]
 )
-def get_project(
+async def get_project(
     project_id: str,
-    service: ProjectService = Depends(get_project_service)
+    service: AsyncService[ProjectService] = Depends(get_project_service)
 ) -> Project:
     """
     Get a project by ID.
 
     - **project_id**: Project UUID
     """
-    return service.get_project(project_id)
+    return await service.run(ProjectService.get_project, project_id)
 
 
 @router.put(
@@ -91,10 +93,10 @@ def get_project(
     description="Update a project's information",
     tags=["Projects"]
 )
-def update_project(
+async def update_project(
     project_id: str,
     project: ProjectUpdate,
-    service: ProjectService = Depends(get_project_service)
+    service: AsyncService[ProjectService] = Depends(get_project_service)
 ) -> Project:
     """
     Update a project.
@@ -104,7 +106,7 @@ def update_project(
     - **business_context**: Updated business context (optional)
     - **criticality_level**: Updated criticality level (optional)
     """
-    return service.update_project(project_id, project)
+    return await service.run(ProjectService.update_project, project_id, project)
 
 
 @router.delete(
@@ -114,9 +116,9 @@ def update_project(
     description="Delete a project and all associated data",
     tags=["Projects"]
 )
-def delete_project(
+async def delete_project(
     project_id: str,
-    service: ProjectService = Depends(get_project_service)
+    service: AsyncService[ProjectService] = Depends(get_project_service)
 ) -> None:
     """
     Delete a project.
@@ -129,4 +131,4 @@ def delete_project(
 
     - **project_id**: Project UUID
     """
-    service.delete_project(project_id)
+    await service.run(ProjectService.delete_project, project_id)
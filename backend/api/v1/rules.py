@@ -0,0 +1,38 @@
+"""
+API endpoints for the security rule set
+"""
+
+from fastapi import APIRouter, Depends
+
+from services.rule_service import RuleService
+from models.rule import RuleSet
+
+router = APIRouter()
+
+
+def get_rule_service() -> RuleService:
+    """Dependency injection for RuleService"""
+    return RuleService()
+
+
+@router.get(
+    "/rules",
+    response_model=RuleSet,
+    summary="Get the active rule set",
+    description="Rules new analyses run with, in execution order, and the rule-set version they record"
+)
+def get_rule_set(service: RuleService = Depends(get_rule_service)):
+    """Get the active rule set"""
+    return service.get_rule_set()
+
+
+@router.post(
+    "/rules/reload",
+    response_model=RuleSet,
+    summary="Reload rule packs",
+    description="Recompile the rule packs, validate them and atomically swap the active rule set; "
+                "running analyses finish on the previous one"
+)
+def reload_rules(service: RuleService = Depends(get_rule_service)):
+    """Reload the rule set (422 and no change if a pack is invalid)"""
+    return service.reload()
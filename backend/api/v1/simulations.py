@@ -0,0 +1,35 @@
+"""
+API endpoints for what-if simulations
+"""
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from database.connection import get_read_db
+from database.unit_of_work import UnitOfWorkRoute
+from repositories.architecture_repository import ArchitectureRepository
+from services.simulation_service import SimulationService
+from models.simulation import SimulationRequest, SimulationResult
+
+router = APIRouter(route_class=UnitOfWorkRoute)
+
+
+def get_simulation_service(db: Session = Depends(get_read_db)) -> SimulationService:
+    """Dependency injection for SimulationService"""
+    return SimulationService(ArchitectureRepository(db))
+
+
+@router.post(
+    "/architectures/{architecture_id}/simulate",
+    response_model=SimulationResult,
+    summary="Simulate changes to an architecture",
+    description="Apply hypothetical changes in memory, run the rule engine and return the findings "
+                "introduced or resolved and the new risk score; nothing is persisted"
+)
+def simulate(
+    architecture_id: str,
+    request: SimulationRequest,
+    service: SimulationService = Depends(get_simulation_service),
+):
+    """Simulate changes to an architecture (422 if a change refers to an unknown entity)"""
+    return service.simulate(architecture_id, request)
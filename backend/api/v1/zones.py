@@ -3,20 +3,21 @@ API endpoints for Zone CRUD operations
 """
 
 from fastapi import APIRouter, Depends, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.connection import get_db
+from database.connection import get_async_db
+from database.unit_of_work import UnitOfWorkRoute
 from repositories.zone_repository import ZoneRepository
+from services.async_service import AsyncService
 from services.zone_service import ZoneService
 from models.zone import Zone, ZoneCreate, ZoneUpdate, ZoneList
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
-def get_zone_service(db: Session = Depends(get_db)) -> ZoneService:
+async def get_zone_service(db: AsyncSession = Depends(get_async_db)) -> AsyncService[ZoneService]:
     """Dependency injection for ZoneService"""
-    repository = ZoneRepository(db)
-    return ZoneService(repository)
+    return AsyncService(db, lambda session: ZoneService(ZoneRepository(session)))
 
 
 @router.post(
@@ -26,12 +27,12 @@ def get_zone_service(db: Session = Depends(get_db)) -> ZoneService:
     summary="Create a new zone",
     description="Create a new security zone within an architecture"
 )
-def create_zone(
+async def create_zone(
     zone: ZoneCreate,
-    service: ZoneService = Depends(get_zone_service)
+    service: AsyncService[ZoneService] = Depends(get_zone_service)
 ):
     """Create a new zone"""
-    return service.create_zone(zone)
+    return await service.run(ZoneService.create_zone, zone)
 
 
 @router.get(
@@ -40,12 +41,12 @@ def create_zone(
     summary="Get zone by ID",
     description="Retrieve a single zone by its ID"
 )
-def get_zone(
+async def get_zone(
     zone_id: str,
-    service: ZoneService = Depends(get_zone_service)
+    service: AsyncService[ZoneService] = Depends(get_zone_service)
 ):
     """Get zone by ID"""
-    return service.get_zone(zone_id)
+    return await service.run(ZoneService.get_zone, zone_id)
 
 
 @router.get(
@@ -54,14 +55,14 @@ def get_zone(
     summary="Get zones for an architecture",
     description="Retrieve all zones for a specific architecture"
 )
-def get_zones_by_architecture(
+async def get_zones_by_architecture(
     architecture_id: str,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    service: ZoneService = Depends(get_zone_service)
+    service: AsyncService[ZoneService] = Depends(get_zone_service)
 ):
     """Get all zones for an architecture"""
-    return service.get_zones_by_architecture(architecture_id, skip, limit)
+    return await service.run(ZoneService.get_zones_by_architecture, architecture_id, skip, limit)
 
 
 @router.put(
@@ -70,13 +71,13 @@ def get_zones_by_architecture(
     summary="Update zone",
     description="Update an existing zone"
 )
-def update_zone(
+async def update_zone(
     zone_id: str,
     zone: ZoneUpdate,
-    service: ZoneService = Depends(get_zone_service)
+    service: AsyncService[ZoneService] = Depends(get_zone_service)
 ):
     """Update a zone"""
-    return service.update_zone(zone_id, zone)
+    return await service.run(ZoneService.update_zone, zone_id, zone)
 
 
 @router.delete(
@@ -85,9 +86,9 @@ def update_zone(
     summary="Delete zone",
     description="Delete a zone and all components within it"
 )
-def delete_zone(
+async def delete_zone(
     zone_id: str,
-    service: ZoneService = Depends(get_zone_service)
+    service: AsyncService[ZoneService] = Depends(get_zone_service)
 ):
     """Delete a zone"""
-    service.delete_zone(zone_id)
+    await service.run(ZoneService.delete_zone, zone_id)
@@ -0,0 +1,115 @@
+"""
+BLACKMANE command line interface
+
+Usage:
+    python cli.py analyze-all [--workers N] [--project ID ...]
+    python cli.py check-parity [--project ID ...]
+    python cli.py check-query-plans
+"""
+
+import argparse
+import sys
+
+from core.rule_engine import get_rule_engine
+from core.sql_engine import SqlRuleEngine
+from database.connection import ReadSessionLocal, engine, init_db
+from database.query_plans import HOT_QUERIES, check_query_plans
+from repositories.analysis_repository import AnalysisRepository
+from repositories.project_repository import ProjectRepository
+from services.portfolio_service import analyze_portfolio
+
+
+def analyze_all(args: argparse.Namespace) -> int:
+    """Analyze every project (or the given ones) in parallel"""
+    init_db()
+    if args.project:
+        project_ids = args.project
+    else:
+        db = ReadSessionLocal()
+        try:
+            project_ids = ProjectRepository(db).get_all_ids()
+        finally:
+            db.close()
+
+    def report(run, outcome):
+        done = len(run.outcomes)
+        detail = f"{outcome.total_findings} findings" if outcome.status == "completed" else outcome.error
+        print(f"[{done}/{run.total_projects}] {outcome.project_id} {outcome.status} ({outcome.duration_seconds:.2f}s) {detail}")
+
+    run = analyze_portfolio(project_ids, args.workers, progress=report)
+    summary = run.to_model()
+    print(
+        f"{summary.completed_projects} completed, {summary.skipped_projects} skipped, "
+        f"{summary.failed_projects} failed, {summary.total_findings} findings "
+        f"in {summary.elapsed_seconds:.2f}s ({summary.projects_per_second:.1f} projects/s)"
+    )
+    return 1 if summary.failed_projects else 0
+
+
+def check_parity(args: argparse.Namespace) -> int:
+    """Run pushed-down rules in SQL and in Python and report any difference"""
+    init_db()
+    engine = SqlRuleEngine(get_rule_engine())
+    db = ReadSessionLocal()
+    try:
+        repository = AnalysisRepository(db)
+        mismatched = 0
+        for project_id in args.project or ProjectRepository(db).get_all_ids():
+            architecture_id = repository.get_architecture_id(project_id)
+            if not architecture_id:
+                print(f"{project_id} skipped (no architecture)")
+                continue
+
+            snapshot = repository.load_snapshot(architecture_id)
+            mismatches = engine.diff(snapshot, repository.select_rule_findings)
+            if not mismatches:
+                print(f"{project_id} ok")
+                continue
+
+            mismatched += 1
+            for rule_id, (missing, extra) in mismatches.items():
+                print(f"{project_id} {rule_id}: {len(missing)} only in Python, {len(extra)} only in SQL")
+                for finding in missing:
+                    print(f"  - {finding.title}")
+                for finding in extra:
+                    print(f"  + {finding.title}")
+    finally:
+        db.close()
+    return 1 if mismatched else 0
+
+
+def check_plans(args: argparse.Namespace) -> int:
+    """Fail if a hot query no longer uses an index"""
+    init_db()
+    with engine.connect() as connection:
+        regressions = check_query_plans(connection)
+    for name, plan in regressions.items():
+        print(f"{name}: full table scan")
+        for step in plan:
+            print(f"  {step}")
+    print(f"{len(HOT_QUERIES) - len(regressions)}/{len(HOT_QUERIES)} hot queries use an index")
+    return 1 if regressions else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="blackmane", description="BLACKMANE command line interface")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    analyze = commands.add_parser("analyze-all", help="Analyze all projects in parallel")
+    analyze.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    analyze.add_argument("--project", action="append", help="Only analyze this project ID (repeatable)")
+    analyze.set_defaults(handler=analyze_all)
+
+    parity = commands.add_parser("check-parity", help="Compare SQL pushdown and Python rule results")
+    parity.add_argument("--project", action="append", help="Only check this project ID (repeatable)")
+    parity.set_defaults(handler=check_parity)
+
+    plans = commands.add_parser("check-query-plans", help="Check that hot queries use an index (EXPLAIN QUERY PLAN)")
+    plans.set_defaults(handler=check_plans)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,6 +15,10 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite:///./blackmane.db"
+    database_read_pool_size: int = 8  # read-only connections (writes share a single connection)
+    database_busy_timeout: float = 30  # seconds a writer waits for the write lock
+    database_cache_size_kib: int = 64 * 1024  # page cache per connection
+    database_mmap_size: int = 256 * 1024 * 1024  # bytes of the database file memory-mapped
 
     # Security
     secret_key: str = "dev-secret-key-change-in-production"  # TODO: Generate secure key
@@ -25,6 +29,14 @@ class Settings(BaseSettings):
     max_flows: int = 1000
     max_zones: int = 50
     analysis_timeout: int = 30  # seconds
+    analysis_workers: int = 2
+    analysis_queue_size: int = 32  # pending + running jobs
+    portfolio_workers: int | None = None  # processes for batch analysis (default: CPU count)
+    vectorized_rules: bool = True  # evaluate attribute rules with NumPy when installed
+    rule_backend: str = "python"  # python, sql (push simple rules down to SQLite) or parity (sql + diff with python)
+    rule_packs_dir: str = "./rules"  # declarative YAML/JSON rule packs loaded next to the built-in rules
+    rule_reload_interval: float = 0  # seconds between rule pack change checks (0: reload only on request)
+    debug_query_guard: bool = False  # fail analyses issuing more SELECTs than their fixed budget (N+1 loads)
 
     # File uploads (for future image/PDF import)
     max_upload_size: int = 10 * 1024 * 1024  # 10 MB
@@ -0,0 +1,60 @@
+"""
+Cooperative time budget for analyses
+
+The engine checks the budget between rules and after every finding; rules
+with heavy loops (graph expansions, pairwise scans) call `checkpoint()` so a
+pathological architecture cannot pin a worker past `settings.analysis_timeout`.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Event
+from typing import Iterator, Optional
+
+
+class AnalysisCancelled(Exception):
+    """Raised when the caller asked the engine to stop"""
+
+
+class AnalysisTimeout(Exception):
+    """Raised when the analysis deadline has passed"""
+
+
+class Budget:
+    """Deadline plus optional cancellation event"""
+
+    def __init__(self, timeout: Optional[float] = None, cancel: Optional[Event] = None):
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.cancel = cancel
+
+    def check(self) -> None:
+        """
+        Raises:
+            AnalysisCancelled: If cancellation was requested
+            AnalysisTimeout: If the deadline has passed
+        """
+        if self.cancel is not None and self.cancel.is_set():
+            raise AnalysisCancelled()
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise AnalysisTimeout()
+
+
+_current: ContextVar[Optional[Budget]] = ContextVar("analysis_budget", default=None)
+
+
+@contextmanager
+def active_budget(budget: Optional[Budget]) -> Iterator[None]:
+    """Make `budget` the one checked by `checkpoint()` in this context"""
+    token = _current.set(budget)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def checkpoint() -> None:
+    """Check the active budget, if any (call from long-running rule loops)"""
+    budget = _current.get()
+    if budget is not None:
+        budget.check()
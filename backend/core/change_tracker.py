@@ -0,0 +1,82 @@
+"""
+Change tracker - dirty entity ids per architecture for incremental analysis
+
+Repositories record every zone/component/flow they create, update or delete,
+once the change is committed.
+When an analysis starts it takes the pending change set and becomes the new
+baseline. An architecture that is not tracked (never analyzed since process
+start, or whose last analysis failed) has no change set, which forces a full
+analysis: the tracker never claims "nothing changed" unless it saw everything.
+"""
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from threading import Lock
+from typing import Optional
+
+
+@dataclass
+class ChangeSet:
+    """Entities modified since the baseline analysis"""
+    zone_ids: set[str] = field(default_factory=set)
+    component_ids: set[str] = field(default_factory=set)
+    flow_ids: set[str] = field(default_factory=set)
+
+    def is_empty(self) -> bool:
+        return not (self.zone_ids or self.component_ids or self.flow_ids)
+
+
+class ChangeTracker:
+    """Thread-safe registry of pending changes, keyed by architecture id"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._pending: dict[str, ChangeSet] = {}
+        self._baselines: dict[str, str] = {}
+
+    def record(
+        self,
+        architecture_id: str,
+        zone_id: Optional[str] = None,
+        component_id: Optional[str] = None,
+        flow_id: Optional[str] = None,
+    ) -> None:
+        """Mark entities of an architecture as dirty"""
+        with self._lock:
+            changes = self._pending.get(architecture_id)
+            if changes is None:
+                # Untracked: the next analysis is a full one anyway
+                return
+            if zone_id:
+                changes.zone_ids.add(zone_id)
+            if component_id:
+                changes.component_ids.add(component_id)
+            if flow_id:
+                changes.flow_ids.add(flow_id)
+
+    def start(self, architecture_id: str, analysis_id: str) -> tuple[Optional[str], Optional[ChangeSet]]:
+        """
+        Make `analysis_id` the new baseline and hand over pending changes
+
+        Returns:
+            (previous baseline analysis id, changes since it), or (None, None)
+            when the architecture was not tracked
+        """
+        with self._lock:
+            baseline = self._baselines.get(architecture_id)
+            changes = self._pending.get(architecture_id)
+            self._baselines[architecture_id] = analysis_id
+            self._pending[architecture_id] = ChangeSet()
+            return baseline, changes
+
+    def discard(self, architecture_id: str) -> None:
+        """Stop tracking an architecture (its baseline is no longer usable)"""
+        with self._lock:
+            self._pending.pop(architecture_id, None)
+            self._baselines.pop(architecture_id, None)
+
+
+@lru_cache()
+def get_change_tracker() -> ChangeTracker:
+    """Get the process-wide change tracker"""
+    return ChangeTracker()
@@ -0,0 +1,188 @@
+"""
+Column store - NumPy arrays over a snapshot's components and flows
+
+Attribute rules (pure predicates over one component's or flow's fields) are
+evaluated as vector expressions over these columns instead of Python loops:
+booleans become masks, enum-like strings become integer codes and
+references become index arrays. NumPy is optional; without it (or with
+`settings.vectorized_rules` off) `column_store` returns None and rules fall
+back to their per-record predicate.
+"""
+
+from functools import cached_property
+from operator import attrgetter
+from typing import TYPE_CHECKING, Callable, Iterable, Optional, Sequence
+
+from config import get_settings
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+if TYPE_CHECKING:
+    from core.snapshot import ArchitectureSnapshot
+
+
+def _codes(records: Sequence, attribute: str) -> tuple["np.ndarray", dict[str, int]]:
+    """Encode a string attribute as int codes; returns (codes, vocabulary)"""
+    vocabulary: dict[str, int] = {}
+    encode = vocabulary.setdefault
+    codes = np.fromiter(
+        (encode(v, len(vocabulary)) for v in map(attrgetter(attribute), records)),
+        dtype=np.int32,
+        count=len(records),
+    )
+    return codes, vocabulary
+
+
+def _flags(records: Sequence, attribute: str) -> "np.ndarray":
+    return np.fromiter(map(attrgetter(attribute), records), dtype=bool, count=len(records))
+
+
+def _index(records: Sequence, attribute: str, index: dict[str, int]) -> "np.ndarray":
+    """Position of each referenced id in `index`, -1 when absent"""
+    lookup = index.get
+    return np.fromiter(
+        (lookup(ref, -1) for ref in map(attrgetter(attribute), records)), dtype=np.int32, count=len(records)
+    )
+
+
+def _where(records: Sequence, predicate: Callable) -> "np.ndarray":
+    return np.fromiter(map(predicate, records), dtype=bool, count=len(records))
+
+
+def _gather(mask: "np.ndarray", index: "np.ndarray") -> "np.ndarray":
+    """`mask[index]`, false where the index is -1"""
+    if not len(mask):
+        return np.zeros(len(index), dtype=bool)
+    return (index >= 0) & mask[index]
+
+
+def _isin(codes: "np.ndarray", vocabulary: dict[str, int], values: Iterable[str]) -> "np.ndarray":
+    wanted = [vocabulary[v] for v in values if v in vocabulary]
+    if not wanted:
+        return np.zeros(len(codes), dtype=bool)
+    return np.isin(codes, wanted)
+
+
+class ComponentColumns:
+    """
+    Component attributes as arrays, row i = `snapshot.components[i]`
+
+    Each column is built on first use, so a snapshot only pays for the
+    attributes its rules actually read.
+    """
+
+    def __init__(self, snapshot: "ArchitectureSnapshot"):
+        self._snapshot = snapshot
+        self.size = len(snapshot.components)
+
+    @cached_property
+    def _types(self) -> tuple["np.ndarray", dict[str, int]]:
+        return _codes(self._snapshot.components, "component_type")
+
+    @cached_property
+    def zone_index(self) -> "np.ndarray":
+        zones = {z.id: i for i, z in enumerate(self._snapshot.zones)}
+        return _index(self._snapshot.components, "zone_id", zones)
+
+    @cached_property
+    def has_admin_interface(self) -> "np.ndarray":
+        return _flags(self._snapshot.components, "has_admin_interface")
+
+    @cached_property
+    def requires_mfa(self) -> "np.ndarray":
+        return _flags(self._snapshot.components, "requires_mfa")
+
+    @cached_property
+    def has_logging(self) -> "np.ndarray":
+        return _flags(self._snapshot.components, "has_logging")
+
+    @cached_property
+    def encryption_at_rest(self) -> "np.ndarray":
+        return _flags(self._snapshot.components, "encryption_at_rest")
+
+    @cached_property
+    def encryption_in_transit(self) -> "np.ndarray":
+        return _flags(self._snapshot.components, "encryption_in_transit")
+
+    def of_type(self, *component_types: str) -> "np.ndarray":
+        return _isin(*self._types, component_types)
+
+    def where(self, predicate: Callable) -> "np.ndarray":
+        """Mask of an arbitrary per-component predicate (evaluated record by record)"""
+        return _where(self._snapshot.components, predicate)
+
+    def in_zones(self, predicate: Callable) -> "np.ndarray":
+        """Components whose zone matches `predicate` (evaluated once per zone)"""
+        return _gather(_where(self._snapshot.zones, predicate), self.zone_index)
+
+
+class FlowColumns:
+    """Flow attributes as arrays, row i = `snapshot.flows[i]`, built on first use"""
+
+    def __init__(self, snapshot: "ArchitectureSnapshot"):
+        self._snapshot = snapshot
+        self.size = len(snapshot.flows)
+
+    @cached_property
+    def _protocols(self) -> tuple["np.ndarray", dict[str, int]]:
+        return _codes(self._snapshot.flows, "protocol")
+
+    @cached_property
+    def _component_index(self) -> dict[str, int]:
+        return {c.id: i for i, c in enumerate(self._snapshot.components)}
+
+    @cached_property
+    def source_index(self) -> "np.ndarray":
+        """Row of the source component, -1 when not part of the snapshot"""
+        return _index(self._snapshot.flows, "source_component_id", self._component_index)
+
+    @cached_property
+    def target_index(self) -> "np.ndarray":
+        """Row of the target component, -1 when not part of the snapshot"""
+        return _index(self._snapshot.flows, "target_component_id", self._component_index)
+
+    @cached_property
+    def is_authenticated(self) -> "np.ndarray":
+        return _flags(self._snapshot.flows, "is_authenticated")
+
+    @cached_property
+    def is_encrypted(self) -> "np.ndarray":
+        return _flags(self._snapshot.flows, "is_encrypted")
+
+    def of_protocol(self, *protocols: str) -> "np.ndarray":
+        return _isin(*self._protocols, protocols)
+
+    def where(self, predicate: Callable) -> "np.ndarray":
+        """Mask of an arbitrary per-flow predicate (evaluated record by record)"""
+        return _where(self._snapshot.flows, predicate)
+
+    def at_source(self, component_mask: "np.ndarray") -> "np.ndarray":
+        """Flows whose source component is set in `component_mask`"""
+        return _gather(component_mask, self.source_index)
+
+    def at_target(self, component_mask: "np.ndarray") -> "np.ndarray":
+        """Flows whose target component is set in `component_mask`"""
+        return _gather(component_mask, self.target_index)
+
+
+class ColumnStore:
+    """Component and flow columns of one snapshot"""
+
+    def __init__(self, snapshot: "ArchitectureSnapshot"):
+        self.components = ComponentColumns(snapshot)
+        self.flows = FlowColumns(snapshot)
+
+    @staticmethod
+    def offenders(mask: "np.ndarray") -> list[int]:
+        """Row indexes where `mask` is true, in row order"""
+        return np.flatnonzero(mask).tolist()
+
+
+def column_store(snapshot: "ArchitectureSnapshot") -> Optional[ColumnStore]:
+    """Build the column store of a snapshot, or None if vectorized evaluation is unavailable"""
+    if np is None or not get_settings().vectorized_rules:
+        return None
+    return ColumnStore(snapshot)
@@ -0,0 +1,94 @@
+"""
+Live finding streams for running analyses
+
+While an analysis runs, the worker publishes each finding to the analysis'
+channel as soon as the engine yields it; stream readers replay what was
+already published and then block for more until the channel is closed.
+Channels only live for the duration of the analysis: once it is persisted,
+readers fall back to the stored findings.
+"""
+
+from functools import lru_cache
+from threading import Condition, Lock
+from typing import Iterator, Optional
+
+from core.rules import RuleFinding
+
+
+class FindingChannel:
+    """Append-only buffer of one analysis' findings with blocking readers"""
+
+    def __init__(self):
+        self._findings: list[RuleFinding] = []
+        self._condition = Condition()
+        self.closed = False
+        # Rules whose findings went straight to the database (SQL pushdown)
+        self.deferred_rules: set[str] = set()
+
+    def publish(self, finding: RuleFinding) -> None:
+        with self._condition:
+            self._findings.append(finding)
+            self._condition.notify_all()
+
+    def defer(self, rule_id: str) -> None:
+        """Mark a rule whose findings are only readable once stored"""
+        with self._condition:
+            self.deferred_rules.add(rule_id)
+
+    def close(self) -> None:
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+    def follow(self, heartbeat: Optional[float] = None) -> Iterator[Optional[RuleFinding]]:
+        """
+        Yield every finding from the first one until the channel is closed
+
+        With `heartbeat`, yields `None` whenever nothing was published for
+        that many seconds, so callers can keep idle connections alive.
+        """
+        position = 0
+        while True:
+            with self._condition:
+                if position == len(self._findings) and not self.closed:
+                    self._condition.wait(heartbeat)
+                batch = self._findings[position:]
+                closed = self.closed
+            position += len(batch)
+
+            if batch:
+                yield from batch
+            elif closed:
+                return
+            else:
+                yield None
+
+
+class FindingBroker:
+    """Channels of the analyses currently running in this process"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._channels: dict[str, FindingChannel] = {}
+
+    def open(self, analysis_id: str) -> FindingChannel:
+        with self._lock:
+            channel = self._channels[analysis_id] = FindingChannel()
+        return channel
+
+    def get(self, analysis_id: str) -> Optional[FindingChannel]:
+        with self._lock:
+            return self._channels.get(analysis_id)
+
+    def close(self, analysis_id: str) -> None:
+        """Close and forget a channel; readers already following it drain it"""
+        with self._lock:
+            channel = self._channels.pop(analysis_id, None)
+        if channel:
+            channel.close()
+
+
+@lru_cache()
+def get_finding_broker() -> FindingBroker:
+    """Get the process-wide finding broker"""
+    return FindingBroker()
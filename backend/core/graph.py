@@ -0,0 +1,301 @@
+"""
+Component graph - flows as directed edges between components
+
+Built once per snapshot (`ArchitectureSnapshot.graph`). Node i is
+`snapshot.components[i]`; every flow whose two endpoints exist is an edge,
+parallel flows collapsing into one edge indexed by (source, target).
+
+Reachability is precomputed on the condensation: strongly connected
+components (iterative Tarjan, O(V + E)) come out in reverse topological
+order, so a single pass ORs each component's successors into its own
+reachable set. Sets are Python ints used as bitsets (bit i = node i), which
+keeps the whole pass near-linear: O(V + E) big-int ORs of V bits each.
+
+The same components give the cycles of the architecture, and the
+(source, target) edge index finds every bidirectional pair with one lookup
+per edge instead of comparing flows pairwise.
+"""
+
+from collections import OrderedDict, deque
+from functools import cached_property, lru_cache
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterable, Iterator, Optional
+
+if TYPE_CHECKING:
+    from core.snapshot import ArchitectureSnapshot
+
+
+def iter_bits(bits: int) -> Iterator[int]:
+    """Positions of the set bits, lowest first"""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def _strongly_connected(successors: list[list[int]]) -> tuple[list[int], int]:
+    """
+    Tarjan's algorithm without recursion
+
+    Returns:
+        (component of each node, number of components); component ids are
+        in reverse topological order: an edge between two components always
+        goes from a higher id to a lower one
+    """
+    size = len(successors)
+    index = [-1] * size
+    low = [0] * size
+    on_stack = [False] * size
+    component = [-1] * size
+    stack: list[int] = []
+    counter = 0
+    components = 0
+
+    for root in range(size):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, 0)]
+
+        while work:
+            node, position = work[-1]
+            edges = successors[node]
+            if position < len(edges):
+                work[-1] = (node, position + 1)
+                nxt = edges[position]
+                if index[nxt] == -1:
+                    index[nxt] = low[nxt] = counter
+                    counter += 1
+                    stack.append(nxt)
+                    on_stack[nxt] = True
+                    work.append((nxt, 0))
+                elif on_stack[nxt] and index[nxt] < low[node]:
+                    low[node] = index[nxt]
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if low[node] < low[parent]:
+                    low[parent] = low[node]
+            if low[node] == index[node]:
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component[member] = components
+                    if member == node:
+                        break
+                components += 1
+
+    return component, components
+
+
+class ComponentGraph:
+    """Directed component graph of one snapshot with cached reachability"""
+
+    def __init__(self, snapshot: "ArchitectureSnapshot"):
+        self.snapshot = snapshot
+        self.node_of: dict[str, int] = {c.id: i for i, c in enumerate(snapshot.components)}
+        self.size = len(snapshot.components)
+        # (source node, target node) -> first flow id, the hash index behind every edge lookup
+        self.edges: dict[tuple[int, int], str] = {}
+        self.successors: list[list[int]] = [[] for _ in range(self.size)]
+
+        node_of = self.node_of
+        for flow in snapshot.flows:
+            source = node_of.get(flow.source_component_id)
+            target = node_of.get(flow.target_component_id)
+            if source is None or target is None or (source, target) in self.edges:
+                continue
+            self.edges[(source, target)] = flow.id
+            self.successors[source].append(target)
+
+    def component(self, node: int):
+        return self.snapshot.components[node]
+
+    def bits(self, component_ids: Iterable[str]) -> int:
+        """Bitset of the given components (unknown ids ignored)"""
+        bits = 0
+        for component_id in component_ids:
+            node = self.node_of.get(component_id)
+            if node is not None:
+                bits |= 1 << node
+        return bits
+
+    def nodes_where(self, predicate) -> int:
+        """Bitset of the components matching `predicate`"""
+        bits = 0
+        for node, component in enumerate(self.snapshot.components):
+            if predicate(component):
+                bits |= 1 << node
+        return bits
+
+    @cached_property
+    def _scc(self) -> tuple[list[int], int]:
+        return _strongly_connected(self.successors)
+
+    @cached_property
+    def _condensation(self) -> list[set[int]]:
+        """Successor components of each strongly connected component"""
+        component, count = self._scc
+        successors: list[set[int]] = [set() for _ in range(count)]
+        for source, target in self.edges:
+            if component[source] != component[target]:
+                successors[component[source]].add(component[target])
+        return successors
+
+    def _propagate(self, node_bits: Callable[[int], int]) -> list[int]:
+        """
+        Per component: OR of `node_bits(n)` over every node it reaches
+
+        One pass over the condensation, whatever the number of nodes asking.
+        """
+        component, count = self._scc
+        reach = [0] * count
+        for node in range(self.size):
+            reach[component[node]] |= node_bits(node)
+        # Successor components always have lower ids: they are complete already
+        for scc, successors in enumerate(self._condensation):
+            bits = reach[scc]
+            for nxt in successors:
+                bits |= reach[nxt]
+            reach[scc] = bits
+        return reach
+
+    @cached_property
+    def _scc_reach(self) -> list[int]:
+        """Nodes reachable from each strongly connected component (members included)"""
+        return self._propagate(lambda node: 1 << node)
+
+    @cached_property
+    def _scc_zone_reach(self) -> list[int]:
+        """Zones (bit i = `snapshot.zones[i]`) of the nodes reachable from each component"""
+        zone_bit = {z.id: 1 << i for i, z in enumerate(self.snapshot.zones)}
+        components = self.snapshot.components
+        return self._propagate(lambda node: zone_bit.get(components[node].zone_id, 0))
+
+    def scc_of(self, node: int) -> int:
+        return self._scc[0][node]
+
+    @cached_property
+    def cycles(self) -> list[tuple[list[int], list[str]]]:
+        """
+        Strongly connected groups: components reaching each other through flows
+
+        Returns:
+            (nodes, flow ids inside the group) for every component of more
+            than one node or with a flow to itself, in reverse topological order
+        """
+        component, count = self._scc
+        members: list[list[int]] = [[] for _ in range(count)]
+        for node in range(self.size):
+            members[component[node]].append(node)
+        inner: list[list[str]] = [[] for _ in range(count)]
+        for (source, target), flow_id in self.edges.items():
+            if component[source] == component[target]:
+                inner[component[source]].append(flow_id)
+        return [(members[scc], inner[scc]) for scc in range(count) if inner[scc]]
+
+    @cached_property
+    def reverse_pairs(self) -> list[tuple[int, int]]:
+        """
+        Edges whose reverse edge exists, one per pair of nodes
+
+        Each pair is reported by the direction of its earliest flow; a flow
+        from a component to itself is its own reverse.
+        """
+        pairs = []
+        seen: set[tuple[int, int]] = set()
+        for source, target in self.edges:
+            if (target, source) in self.edges and (target, source) not in seen:
+                seen.add((source, target))
+                pairs.append((source, target))
+        return pairs
+
+    def reachable(self, node: int) -> int:
+        """Bitset of the nodes reachable from `node`, itself included"""
+        return self._scc_reach[self._scc[0][node]]
+
+    def reachable_zones(self, node: int) -> int:
+        """Bitset of the zones of `node` and of every node it reaches"""
+        return self._scc_zone_reach[self._scc[0][node]]
+
+    def shortest_paths(self, source: int, wanted: Optional[int] = None) -> list[int]:
+        """
+        Breadth-first parent of every node reachable from `source` (-1: unreached, source: itself)
+
+        Stops early once every node of the `wanted` bitset has been reached.
+        """
+        parent = [-1] * self.size
+        parent[source] = source
+        remaining = (wanted or 0) & ~(1 << source)
+        queue = deque((source,))
+        while queue:
+            node = queue.popleft()
+            for nxt in self.successors[node]:
+                if parent[nxt] == -1:
+                    parent[nxt] = node
+                    remaining &= ~(1 << nxt)
+                    queue.append(nxt)
+            if wanted is not None and not remaining:
+                break
+        return parent
+
+    def path_to(self, parent: list[int], target: int) -> list[int]:
+        """Nodes from the BFS source to `target` (empty if unreached)"""
+        if parent[target] == -1:
+            return []
+        path = [target]
+        while parent[path[-1]] != path[-1]:
+            path.append(parent[path[-1]])
+        path.reverse()
+        return path
+
+    def flows_along(self, path: list[int]) -> list[str]:
+        """Flow id of each hop of a node path"""
+        return [self.edges[(a, b)] for a, b in zip(path, path[1:])]
+
+
+class GraphResultCache:
+    """
+    Results of graph queries per architecture version
+
+    Entries are keyed by architecture and tagged with the snapshot's
+    content hash: the first query on a changed architecture drops every
+    result computed for its previous version. The least recently used
+    architectures are evicted beyond `max_architectures`.
+    """
+
+    def __init__(self, max_architectures: int = 64):
+        self.max_architectures = max_architectures
+        self._lock = Lock()
+        self._entries: OrderedDict[str, tuple[str, dict[Hashable, Any]]] = OrderedDict()
+
+    def get_or_compute(self, snapshot: "ArchitectureSnapshot", key: Hashable, compute: Callable[[], Any]) -> Any:
+        version = snapshot.content_hash
+        with self._lock:
+            entry = self._entries.get(snapshot.architecture_id)
+            if entry and entry[0] == version and key in entry[1]:
+                self._entries.move_to_end(snapshot.architecture_id)
+                return entry[1][key]
+
+        value = compute()
+
+        with self._lock:
+            entry = self._entries.get(snapshot.architecture_id)
+            if not entry or entry[0] != version:
+                entry = self._entries[snapshot.architecture_id] = (version, {})
+            entry[1][key] = value
+            self._entries.move_to_end(snapshot.architecture_id)
+            while len(self._entries) > self.max_architectures:
+                self._entries.popitem(last=False)
+        return value
+
+
+@lru_cache()
+def get_graph_cache() -> GraphResultCache:
+    """Get the process-wide graph result cache"""
+    return GraphResultCache()
@@ -0,0 +1,84 @@
+"""
+Bounded background job queue for analyses
+
+Jobs run on a small thread pool so analyses never occupy the request
+threadpool. The queue is bounded (queued + running jobs) and each job gets a
+cancellation event it is expected to check cooperatively.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from threading import Event, Lock
+from typing import Callable
+
+from config import get_settings
+
+
+class JobQueueFull(Exception):
+    """Raised when the queue already holds its maximum number of jobs"""
+
+
+class JobQueue:
+    """Thread pool with a bounded backlog and per-job cancellation"""
+
+    def __init__(self, max_workers: int, max_jobs: int):
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis")
+        self._lock = Lock()
+        self._jobs: dict[str, tuple[Future, Event]] = {}
+
+    def submit(self, job_id: str, fn: Callable[[Event], None]) -> None:
+        """
+        Schedule `fn(cancel_event)` under `job_id`
+
+        Raises:
+            JobQueueFull: If the backlog is full
+        """
+        with self._lock:
+            if len(self._jobs) >= self.max_jobs:
+                raise JobQueueFull()
+            cancel_event = Event()
+            future = self._executor.submit(fn, cancel_event)
+            self._jobs[job_id] = (future, cancel_event)
+        future.add_done_callback(lambda _: self._forget(job_id))
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a job: drop it if still queued, otherwise signal it to stop
+
+        Returns:
+            True if the job was queued and will never run
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if not job:
+            return False
+        future, cancel_event = job
+        cancel_event.set()
+        return future.cancel()
+
+    def is_full(self) -> bool:
+        with self._lock:
+            return len(self._jobs) >= self.max_jobs
+
+    def __contains__(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._jobs
+
+    def shutdown(self) -> None:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for _, cancel_event in jobs:
+            cancel_event.set()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _forget(self, job_id: str) -> None:
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+
+@lru_cache()
+def get_job_queue() -> JobQueue:
+    """Get the process-wide analysis job queue"""
+    settings = get_settings()
+    return JobQueue(settings.analysis_workers, settings.analysis_queue_size)
@@ -0,0 +1,143 @@
+"""
+Ranked attack paths - Dijkstra and Yen's k-shortest paths with control-aware costs
+
+Every flow an attacker follows costs one hop plus the controls standing in
+the way: an authenticated or encrypted flow, a target requiring MFA, a
+firewall or bastion to get through. Between two zones, paths start at any
+component of the source zone and stop at the first component reached in the
+target zone; Yen's algorithm yields them cheapest first without enumerating
+every path of the graph.
+"""
+
+from heapq import heappop, heappush
+from typing import TYPE_CHECKING, Iterable, Optional
+
+if TYPE_CHECKING:
+    from core.snapshot import ArchitectureSnapshot, ComponentSnapshot, FlowSnapshot
+
+
+HOP_COST = 1.0
+AUTHENTICATED_COST = 3.0  # credentials needed to use the flow
+ENCRYPTED_COST = 1.0  # no sniffing or tampering on the way
+MFA_COST = 4.0  # target requires MFA
+CONTROL_POINT_COSTS = {"firewall": 5.0, "bastion": 4.0}  # target filters or audits what goes through
+
+
+def flow_cost(flow: "FlowSnapshot", target: "ComponentSnapshot") -> float:
+    """Attacker cost of moving along `flow` into `target`"""
+    cost = HOP_COST
+    if flow.is_authenticated:
+        cost += AUTHENTICATED_COST
+    if flow.is_encrypted:
+        cost += ENCRYPTED_COST
+    if target.requires_mfa:
+        cost += MFA_COST
+    return cost + CONTROL_POINT_COSTS.get(target.component_type, 0.0)
+
+
+class WeightedPaths:
+    """
+    Cheapest paths from a set of source components to a set of target components
+
+    Nodes are snapshot component positions; a virtual start node links to
+    every source and every target links to a virtual end node, so one
+    single-pair search covers all zone members. Parallel flows keep the
+    cheapest one. Paths never re-enter the source set or leave the target set.
+    """
+
+    def __init__(self, snapshot: "ArchitectureSnapshot", sources: Iterable[int], targets: Iterable[int]):
+        graph = snapshot.graph
+        self.size = graph.size
+        self.start = graph.size
+        self.end = graph.size + 1
+        sources = set(sources)
+        targets = set(targets) - sources
+
+        # (source, target) -> (cost, flow id) of the cheapest parallel flow
+        self.edges: dict[tuple[int, int], tuple[float, str]] = {}
+        for flow in snapshot.flows:
+            u = graph.node_of.get(flow.source_component_id)
+            v = graph.node_of.get(flow.target_component_id)
+            if u is None or v is None or u == v or u in targets or v in sources:
+                continue
+            cost = flow_cost(flow, graph.component(v))
+            if (u, v) not in self.edges or cost < self.edges[(u, v)][0]:
+                self.edges[(u, v)] = (cost, flow.id)
+        for node in sources:
+            self.edges[(self.start, node)] = (0.0, "")
+        for node in targets:
+            self.edges[(node, self.end)] = (0.0, "")
+
+        self.adjacency: list[list[tuple[int, float]]] = [[] for _ in range(self.size + 2)]
+        for (u, v), (cost, _) in sorted(self.edges.items()):
+            self.adjacency[u].append((v, cost))
+
+    def _cheapest(
+        self,
+        origin: int,
+        banned_nodes: set[int],
+        banned_edges: set[tuple[int, int]],
+    ) -> Optional[tuple[float, list[int]]]:
+        """Dijkstra from `origin` to the end node, avoiding banned nodes and edges"""
+        distance = {origin: 0.0}
+        previous: dict[int, int] = {}
+        heap = [(0.0, origin)]
+        while heap:
+            cost, node = heappop(heap)
+            if node == self.end:
+                break
+            if cost > distance[node]:
+                continue
+            for nxt, weight in self.adjacency[node]:
+                if nxt in banned_nodes or (node, nxt) in banned_edges:
+                    continue
+                candidate = cost + weight
+                if candidate < distance.get(nxt, float("inf")):
+                    distance[nxt] = candidate
+                    previous[nxt] = node
+                    heappush(heap, (candidate, nxt))
+
+        if self.end not in distance:
+            return None
+        path = [self.end]
+        while path[-1] != origin:
+            path.append(previous[path[-1]])
+        path.reverse()
+        return distance[self.end], path
+
+    def shortest(self, k: int = 1) -> list[tuple[float, list[int]]]:
+        """
+        Up to `k` loopless paths, cheapest first (Yen's algorithm)
+
+        Returns:
+            (cost, component positions from the source to the target) pairs
+        """
+        first = self._cheapest(self.start, set(), set())
+        if first is None or k < 1:
+            return []
+        found = [first]
+        seen = {tuple(first[1])}
+        candidates: list[tuple[float, list[int]]] = []
+
+        while len(found) < k:
+            _, last = found[-1]
+            for i in range(len(last) - 2):
+                spur, root = last[i], last[: i + 1]
+                root_cost = sum(self.edges[(a, b)][0] for a, b in zip(root, root[1:]))
+                banned_edges = {(path[i], path[i + 1]) for _, path in found if path[: i + 1] == root}
+                spur_path = self._cheapest(spur, set(root[:-1]), banned_edges)
+                if spur_path is None:
+                    continue
+                path = root[:-1] + spur_path[1]
+                if tuple(path) not in seen:
+                    seen.add(tuple(path))
+                    heappush(candidates, (root_cost + spur_path[0], path))
+            if not candidates:
+                break
+            found.append(heappop(candidates))
+
+        # Strip the virtual start and end nodes
+        return [(cost, path[1:-1]) for cost, path in found]
+
+    def flow_ids(self, path: list[int]) -> list[str]:
+        return [self.edges[(a, b)][1] for a, b in zip(path, path[1:])]
@@ -0,0 +1,371 @@
+"""
+Rule engine - registry of security rules and single-pass evaluation
+
+Usage:
+    snapshot = ArchitectureSnapshot.build(architecture.id, zones, components, flows)
+    result = get_rule_engine().run(snapshot, Budget(timeout=30))
+
+The active engine is replaced as a whole by `reload_rule_engine`: callers
+that already hold an engine keep using it until they let go of it.
+"""
+
+import hashlib
+import time
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Callable, Iterable, Iterator, Optional
+
+from config import get_settings
+from core.budget import AnalysisTimeout, Budget, active_budget
+from core.change_tracker import ChangeSet
+from core.rules import Rule, RuleFinding, RuleScope, default_rules
+from core.rules.declarative import load_rule_packs
+from core.snapshot import DERIVED_COSTS, TRUST_ORDER, ArchitectureSnapshot, ComponentSnapshot, FlowSnapshot, ZoneSnapshot, derived_closure
+from models.orm import ComponentTypeEnum, FlowProtocolEnum
+
+
+RULE_COMPLETED = "completed"
+RULE_PARTIAL = "partial"
+RULE_SKIPPED = "skipped"
+
+
+class RuleRegistry:
+    """Ordered collection of rules, keyed by rule id"""
+
+    def __init__(self, rules: Optional[Iterable[Rule]] = None):
+        self._rules: dict[str, Rule] = {}
+        self._version: Optional[str] = None
+        self._schedule: Optional[list[Rule]] = None
+        for rule in rules or ():
+            self.register(rule)
+
+    def register(self, rule: Rule) -> Rule:
+        """Register a rule; ids must be unique"""
+        if rule.id in self._rules:
+            raise ValueError(f"Rule {rule.id} is already registered")
+        self._rules[rule.id] = rule
+        self._version = None
+        self._schedule = None
+        return rule
+
+    @property
+    def version(self) -> str:
+        """Rule-set version: hash of every registered rule's fingerprint"""
+        if self._version is None:
+            digest = hashlib.sha256()
+            for rule in self._rules.values():
+                digest.update(rule.fingerprint().encode())
+            self._version = digest.hexdigest()
+        return self._version
+
+    def scheduled(self) -> list[Rule]:
+        """
+        Rules in execution order: most severe first, then cheapest first
+
+        A rule's cost is its own `cost` plus that of the derived sets it
+        requires which no earlier rule already computed, so rules sharing an
+        intermediate result are pulled together once someone paid for it.
+        Ties keep registration order.
+        """
+        if self._schedule is None:
+            position = {rule.id: i for i, rule in enumerate(self._rules.values())}
+            pending = list(self._rules.values())
+            computed: set[str] = set()
+            schedule = []
+
+            def key(rule: Rule) -> tuple[int, int, int]:
+                missing = derived_closure(rule.requires) - computed
+                return rule.severity.rank, rule.cost + sum(DERIVED_COSTS[name] for name in missing), position[rule.id]
+
+            while pending:
+                rule = min(pending, key=key)
+                pending.remove(rule)
+                computed |= derived_closure(rule.requires)
+                schedule.append(rule)
+            self._schedule = schedule
+        return self._schedule
+
+    def get(self, rule_id: str) -> Optional[Rule]:
+        return self._rules.get(rule_id)
+
+    def __iter__(self) -> Iterator[Rule]:
+        return iter(self._rules.values())
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+
+@dataclass
+class RuleStats:
+    """Cost of one rule in one engine run"""
+    duration_seconds: float = 0.0
+    entities_scanned: int = 0  # components and/or flows in the view the rule read
+    findings: int = 0  # produced by evaluation (carried-forward findings excluded)
+
+    @staticmethod
+    def scanned(rule: Rule, view: ArchitectureSnapshot) -> int:
+        if rule.scope == RuleScope.COMPONENT:
+            return len(view.components)
+        if rule.scope == RuleScope.FLOW:
+            return len(view.flows)
+        return len(view.components) + len(view.flows)
+
+
+@dataclass
+class EngineResult:
+    """Findings of one engine run plus per-rule completion and cost"""
+    findings: list[RuleFinding]
+    rule_status: dict[str, str] = field(default_factory=dict)  # rule id -> completed, partial, skipped
+    rule_stats: dict[str, RuleStats] = field(default_factory=dict)
+
+    @property
+    def timed_out(self) -> bool:
+        return any(state != RULE_COMPLETED for state in self.rule_status.values())
+
+
+class RuleEngine:
+    """Runs every registered rule against one architecture snapshot, in the registry's scheduled order"""
+
+    def __init__(self, registry: RuleRegistry):
+        self.registry = registry
+
+    def result_key(self, snapshot: ArchitectureSnapshot) -> str:
+        """Cache key of an analysis result: architecture content + rule-set version"""
+        return hashlib.sha256(f"{snapshot.content_hash}|{self.registry.version}".encode()).hexdigest()
+
+    def iter_findings(
+        self,
+        snapshot: ArchitectureSnapshot,
+        budget: Optional[Budget] = None,
+        rule_status: Optional[dict[str, str]] = None,
+        rule_stats: Optional[dict[str, RuleStats]] = None,
+    ) -> Iterator[RuleFinding]:
+        """
+        Yield findings rule by rule as they are produced
+
+        Stops early when the budget's deadline passes; `rule_status` (if
+        given) then tells which rules completed, ran partially or were
+        skipped, and `rule_stats` (if given) receives each rule's cost.
+        """
+        plan = [(rule, snapshot, ()) for rule in self.registry.scheduled()]
+        return self._execute(
+            plan,
+            budget,
+            rule_status if rule_status is not None else {},
+            rule_stats if rule_stats is not None else {},
+        )
+
+    def run(
+        self,
+        snapshot: ArchitectureSnapshot,
+        budget: Optional[Budget] = None,
+        on_finding: Optional[Callable[[RuleFinding], None]] = None,
+    ) -> EngineResult:
+        """Run every rule; `on_finding` is called with each finding as it is produced"""
+        rule_status: dict[str, str] = {}
+        rule_stats: dict[str, RuleStats] = {}
+        findings = _collect(self.iter_findings(snapshot, budget, rule_status, rule_stats), on_finding)
+        return EngineResult(findings, rule_status, rule_stats)
+
+    def run_incremental(
+        self,
+        snapshot: ArchitectureSnapshot,
+        changes: ChangeSet,
+        previous: Iterable[RuleFinding],
+        budget: Optional[Budget] = None,
+        on_finding: Optional[Callable[[RuleFinding], None]] = None,
+    ) -> EngineResult:
+        """
+        Re-evaluate only what `changes` can affect
+
+        COMPONENT/FLOW scoped rules run on the changed entities and carry
+        forward their previous findings for every other entity that still
+        exists. ARCHITECTURE rules run in full whenever anything changed.
+        `previous` must come from a run of this same rule set.
+        """
+        previous_by_rule: dict[str, list[RuleFinding]] = {}
+        for finding in previous:
+            previous_by_rule.setdefault(finding.rule_id, []).append(finding)
+
+        if changes.is_empty():
+            return EngineResult(
+                _collect(
+                    (f for rule in self.registry.scheduled() for f in previous_by_rule.get(rule.id, ())), on_finding
+                ),
+                {rule.id: RULE_COMPLETED for rule in self.registry},
+            )
+
+        dirty_components = set(changes.component_ids)
+        dirty_flows = set(changes.flow_ids)
+        for component_id in dirty_components:
+            dirty_flows.update(f.id for f in snapshot.outgoing.get(component_id, ()))
+            dirty_flows.update(f.id for f in snapshot.incoming.get(component_id, ()))
+
+        plan = []
+        for rule in self.registry.scheduled():
+            if rule.scope == RuleScope.COMPONENT:
+                carried = [
+                    f for f in previous_by_rule.get(rule.id, ())
+                    if f.affected_component_id in snapshot.components_by_id
+                    and f.affected_component_id not in dirty_components
+                ]
+                plan.append((rule, snapshot.restrict(component_ids=dirty_components, flow_ids=()), carried))
+            elif rule.scope == RuleScope.FLOW:
+                carried = [
+                    f for f in previous_by_rule.get(rule.id, ())
+                    if f.affected_flow_id in snapshot.flows_by_id
+                    and f.affected_flow_id not in dirty_flows
+                ]
+                plan.append((rule, snapshot.restrict(flow_ids=dirty_flows), carried))
+            else:
+                plan.append((rule, snapshot, ()))
+
+        rule_status: dict[str, str] = {}
+        rule_stats: dict[str, RuleStats] = {}
+        findings = _collect(self._execute(plan, budget, rule_status, rule_stats), on_finding)
+        return EngineResult(findings, rule_status, rule_stats)
+
+    def _execute(
+        self,
+        plan: list[tuple[Rule, ArchitectureSnapshot, Iterable[RuleFinding]]],
+        budget: Optional[Budget],
+        rule_status: dict[str, str],
+        rule_stats: dict[str, RuleStats],
+    ) -> Iterator[RuleFinding]:
+        for rule, _, _ in plan:
+            rule_status[rule.id] = RULE_SKIPPED
+
+        with active_budget(budget):
+            for rule, view, carried in plan:
+                yield from carried
+                stats = RuleStats()
+                started = time.perf_counter()
+                try:
+                    if budget:
+                        budget.check()
+                    rule_status[rule.id] = RULE_PARTIAL
+                    rule_stats[rule.id] = stats
+                    stats.entities_scanned = RuleStats.scanned(rule, view)
+                    for finding in rule.evaluate(view):
+                        stats.findings += 1
+                        yield finding
+                        if budget:
+                            budget.check()
+                except AnalysisTimeout:
+                    # Keep what was found so far; remaining rules stay skipped
+                    return
+                finally:
+                    stats.duration_seconds = time.perf_counter() - started
+                rule_status[rule.id] = RULE_COMPLETED
+
+
+def _collect(
+    findings: Iterable[RuleFinding],
+    on_finding: Optional[Callable[[RuleFinding], None]],
+) -> list[RuleFinding]:
+    if on_finding is None:
+        return list(findings)
+    collected = []
+    for finding in findings:
+        collected.append(finding)
+        on_finding(finding)
+    return collected
+
+
+def _probe_snapshot() -> ArchitectureSnapshot:
+    """Small architecture with every zone trust level, component type and protocol"""
+    zones = [ZoneSnapshot(id=f"probe-zone-{level}", name=f"Probe {level}", trust_level=level) for level in TRUST_ORDER]
+    components = [
+        ComponentSnapshot(
+            id=f"probe-{zone.trust_level}-{kind.value}",
+            zone_id=zone.id,
+            name=f"Probe {kind.value}",
+            component_type=kind.value,
+            has_admin_interface=i % 2 == 0,
+            requires_mfa=i % 3 == 0,
+            has_logging=i % 4 == 0,
+            encryption_at_rest=i % 5 == 0,
+            encryption_in_transit=i % 2 == 1,
+        )
+        for zone in zones
+        for i, kind in enumerate(ComponentTypeEnum)
+    ]
+    protocols = list(FlowProtocolEnum)
+    flows = [
+        FlowSnapshot(
+            id=f"probe-flow-{i}",
+            source_component_id=source.id,
+            target_component_id=components[(i * 7 + 1) % len(components)].id,
+            protocol=protocols[i % len(protocols)].value,
+            port=None,
+            is_authenticated=i % 2 == 0,
+            is_encrypted=i % 3 == 0,
+        )
+        for i, source in enumerate(components)
+    ]
+    return ArchitectureSnapshot("probe", tuple(zones), tuple(components), tuple(flows))
+
+
+def build_rule_engine(rule_packs_dir: Optional[str] = None) -> RuleEngine:
+    """
+    Build and validate an engine: built-in rules plus the declarative rule packs
+
+    Every rule is run once on a probe architecture so a rule that compiles
+    but fails at evaluation time is rejected before it can serve analyses.
+
+    Raises:
+        ValueError: If a rule pack is invalid, rule ids collide or a rule fails on the probe
+    """
+    if rule_packs_dir is None:
+        rule_packs_dir = get_settings().rule_packs_dir
+    engine = RuleEngine(RuleRegistry(default_rules() + load_rule_packs(rule_packs_dir)))
+
+    probe = _probe_snapshot()
+    for rule in engine.registry.scheduled():
+        try:
+            for _ in rule.evaluate(probe):
+                pass
+        except Exception as exc:
+            raise ValueError(f"Rule {rule.id} fails on the probe architecture: {type(exc).__name__}: {exc}") from exc
+    return engine
+
+
+_active_engine: Optional[RuleEngine] = None
+_engine_lock = Lock()
+_reload_lock = Lock()
+
+
+def get_rule_engine() -> RuleEngine:
+    """
+    Get the active engine
+
+    Hold on to the returned engine for the duration of one analysis: a
+    concurrent reload swaps the active engine but never mutates this one.
+    """
+    global _active_engine
+    engine = _active_engine
+    if engine is None:
+        with _engine_lock:
+            if _active_engine is None:
+                _active_engine = build_rule_engine()
+            engine = _active_engine
+    return engine
+
+
+def reload_rule_engine(rule_packs_dir: Optional[str] = None) -> RuleEngine:
+    """
+    Rebuild the engine from the current rule packs and make it the active one
+
+    The new engine is built and validated before the swap; on error the
+    active engine is left untouched. Analyses already running finish on the
+    engine they started with.
+
+    Raises:
+        ValueError: If the new rule set is invalid (see `build_rule_engine`)
+    """
+    global _active_engine
+    with _reload_lock:
+        engine = build_rule_engine(rule_packs_dir)
+        with _engine_lock:
+            _active_engine = engine
+    return engine
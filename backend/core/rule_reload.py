@@ -0,0 +1,93 @@
+"""
+Rule pack watcher - reloads the rule engine when rule packs change
+
+A daemon thread polls the rule pack directory every
+`settings.rule_reload_interval` seconds. When the set of pack files or their
+modification times change it rebuilds the engine off the request path and
+swaps it in (`reload_rule_engine`); an invalid pack is logged and the active
+engine keeps serving.
+"""
+
+import logging
+from functools import lru_cache
+from pathlib import Path
+from threading import Event, Thread
+from typing import Optional
+
+from config import get_settings
+from core.rule_engine import reload_rule_engine
+from core.rules.declarative import RULE_PACK_SUFFIXES
+
+
+logger = logging.getLogger(__name__)
+
+
+def pack_signature(directory: str) -> tuple:
+    """Name, size and mtime of every rule pack file; changes when a pack is added, edited or removed"""
+    root = Path(directory)
+    if not root.is_dir():
+        return ()
+    signature = []
+    for path in sorted(root.iterdir()):
+        if path.suffix in RULE_PACK_SUFFIXES and path.is_file():
+            stat = path.stat()
+            signature.append((path.name, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+class RulePackWatcher:
+    """Background thread reloading the engine whenever the pack signature changes"""
+
+    def __init__(self, directory: str, interval: float):
+        self.directory = directory
+        self.interval = interval
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+        self._signature = pack_signature(directory)
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = Thread(target=self._run, name="rule-pack-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def check(self) -> bool:
+        """
+        Reload if the packs changed since the last check
+
+        Returns:
+            True if a new engine was swapped in
+        """
+        signature = pack_signature(self.directory)
+        if signature == self._signature:
+            return False
+        # Remember the signature even on failure: a broken pack is reported once
+        self._signature = signature
+        try:
+            engine = reload_rule_engine(self.directory)
+        except ValueError as exc:
+            logger.error("Rule packs in %s not reloaded, keeping the active rule set: %s", self.directory, exc)
+            return False
+        logger.info("Rule set reloaded: %d rules, version %s", len(engine.registry), engine.registry.version[:12])
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Rule pack watcher check failed")
+
+
+@lru_cache()
+def get_rule_pack_watcher() -> Optional[RulePackWatcher]:
+    """Get the process-wide watcher, or None when periodic reload is disabled"""
+    settings = get_settings()
+    if settings.rule_reload_interval <= 0:
+        return None
+    return RulePackWatcher(settings.rule_packs_dir, settings.rule_reload_interval)
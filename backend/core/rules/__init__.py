@@ -1 +1,44 @@
 """Security rules package"""
+
+from core.rules.base import AttributeRule, Rule, RuleCategory, RuleFinding, RuleScope, Severity
+from core.rules.identity import AdminAccessWithoutMFARule, CriticalComponentWithoutAuthRule
+from core.rules.network import (
+    DirectInternetAccessRule,
+    NoBastionRule,
+    UncontrolledInterZoneFlowRule,
+    ManagementZoneExposedRule,
+    UnencryptedCrossZoneFlowRule,
+    NoSegmentationRule,
+    ExposedWithoutFirewallRule,
+    BidirectionalFlowRule,
+)
+from core.rules.data import (
+    DatabaseEncryptionAtRestRule,
+    SensitiveFlowUnencryptedRule,
+    ExposedApiWithoutTlsRule,
+)
+from core.rules.observability import CriticalComponentWithoutLoggingRule, NoCentralizedLoggingRule
+
+
+def default_rules() -> list[Rule]:
+    """Instantiate the MVP rule set (docs/SECURITY_RULES.md)"""
+    return [
+        AdminAccessWithoutMFARule(),
+        CriticalComponentWithoutAuthRule(),
+        DirectInternetAccessRule(),
+        NoBastionRule(),
+        UncontrolledInterZoneFlowRule(),
+        ManagementZoneExposedRule(),
+        UnencryptedCrossZoneFlowRule(),
+        NoSegmentationRule(),
+        ExposedWithoutFirewallRule(),
+        BidirectionalFlowRule(),
+        DatabaseEncryptionAtRestRule(),
+        SensitiveFlowUnencryptedRule(),
+        ExposedApiWithoutTlsRule(),
+        CriticalComponentWithoutLoggingRule(),
+        NoCentralizedLoggingRule(),
+    ]
+
+
+__all__ = ["AttributeRule", "Rule", "RuleCategory", "RuleFinding", "RuleScope", "Severity", "default_rules"]
@@ -0,0 +1,178 @@
+"""
+Rule base class and finding record shared by all security rules
+"""
+
+import hashlib
+import inspect
+from dataclasses import dataclass
+from enum import Enum
+from typing import Iterable, Optional
+
+from core.snapshot import DERIVED_COSTS, ArchitectureSnapshot
+
+
+class Severity(str, Enum):
+    """Finding severity"""
+    CRITICAL = "critical"
+    HIGH = "high"
+    MEDIUM = "medium"
+    LOW = "low"
+
+    @property
+    def rank(self) -> int:
+        """0 for the most severe"""
+        return list(Severity).index(self)
+
+
+class RuleCategory(str, Enum):
+    """Rule categories"""
+    IDENTITY = "identity"
+    NETWORK = "network"
+    DATA = "data"
+    OBSERVABILITY = "observability"
+
+
+class RuleScope(str, Enum):
+    """
+    What a rule's findings depend on, used by incremental analysis
+
+    COMPONENT rules read one component's own attributes, FLOW rules read one
+    flow and its endpoints, ARCHITECTURE rules may read anything.
+    """
+    COMPONENT = "component"
+    FLOW = "flow"
+    ARCHITECTURE = "architecture"
+
+
+@dataclass(frozen=True, slots=True)
+class RuleFinding:
+    """Finding produced by a rule, not yet persisted"""
+    rule_id: str
+    rule_name: str
+    category: str
+    severity: str
+    title: str
+    description: str
+    impact: str
+    affected_component_id: Optional[str] = None
+    affected_flow_id: Optional[str] = None
+
+
+class Rule:
+    """
+    Base class for security rules
+
+    Subclasses call `super().__init__(...)` with their metadata and implement
+    `evaluate`, which reads an `ArchitectureSnapshot` and yields findings.
+    Rules whose findings only depend on a single component or flow narrow
+    `scope` so incremental analysis can skip unchanged entities.
+
+    `requires` names the derived snapshot sets the rule reads (see
+    `core.snapshot.derived`) and `cost` estimates its own work in passes over
+    the entities; both drive the registry's execution order.
+    """
+
+    scope = RuleScope.ARCHITECTURE
+    requires: tuple[str, ...] = ()
+    cost = 1
+
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        description: str,
+        category: RuleCategory,
+        severity: Severity,
+        rationale: str,
+    ):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.category = category
+        self.severity = severity
+        self.rationale = rationale
+
+        unknown = set(self.requires) - DERIVED_COSTS.keys()
+        if unknown:
+            raise ValueError(f"Rule {id} requires unknown derived data: {', '.join(sorted(unknown))}")
+
+    def evaluate(self, architecture: ArchitectureSnapshot) -> Iterable[RuleFinding]:
+        raise NotImplementedError
+
+    def finding(
+        self,
+        title: str,
+        description: str,
+        impact: str,
+        severity: Optional[Severity] = None,
+        affected_component_id: Optional[str] = None,
+        affected_flow_id: Optional[str] = None,
+    ) -> RuleFinding:
+        """Build a finding carrying this rule's metadata"""
+        return RuleFinding(
+            rule_id=self.id,
+            rule_name=self.name,
+            category=self.category.value,
+            severity=(severity or self.severity).value,
+            title=title,
+            description=description,
+            impact=impact,
+            affected_component_id=affected_component_id,
+            affected_flow_id=affected_flow_id,
+        )
+
+    def fingerprint(self) -> str:
+        """
+        Hash of the rule's metadata and implementation
+
+        Changes whenever the rule's code or parameters change, which
+        invalidates cached analysis results.
+        """
+        try:
+            source = inspect.getsource(type(self))
+        except (OSError, TypeError):
+            source = f"{type(self).__module__}.{type(self).__qualname__}"
+        state = repr(sorted((k, repr(v)) for k, v in vars(self).items()))
+        return hashlib.sha256(f"{source}|{state}|{self.scope.value}".encode()).hexdigest()
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.id}>"
+
+
+class AttributeRule(Rule):
+    """
+    Rule that is a pure predicate over one component's (or flow's) attributes
+
+    Subclasses implement the predicate twice: `matches` on one record and
+    `mask` as a vector expression over the snapshot's column store, plus
+    `finding_for` to describe an offender. When the column store is
+    available offenders are selected with the mask, otherwise record by
+    record; both paths yield findings in snapshot order.
+    """
+
+    scope = RuleScope.COMPONENT
+
+    def matches(self, record) -> bool:
+        raise NotImplementedError
+
+    def mask(self, columns):
+        """Boolean array over `columns.components` (or `columns.flows` for FLOW rules)"""
+        raise NotImplementedError
+
+    def finding_for(self, architecture: ArchitectureSnapshot, record) -> RuleFinding:
+        raise NotImplementedError
+
+    def evaluate(self, architecture: ArchitectureSnapshot) -> Iterable[RuleFinding]:
+        flows = self.scope == RuleScope.FLOW
+        records = architecture.flows if flows else architecture.components
+        columns = architecture.columns
+        if columns is not None:
+            selected = (
+                records[i]
+                for i in columns.offenders(self.mask(columns.flows if flows else columns.components))
+            )
+        else:
+            selected = (r for r in records if self.matches(r))
+
+        for record in selected:
+            yield self.finding_for(architecture, record)
@@ -0,0 +1,95 @@
+"""
+Data Protection rules (SEC-011 to SEC-013)
+"""
+
+from core.rules.base import AttributeRule, Rule, RuleCategory, RuleScope, Severity
+from core.snapshot import ArchitectureSnapshot
+
+
+class DatabaseEncryptionAtRestRule(AttributeRule):
+    """SEC-011: database without encryption at rest"""
+
+    def __init__(self):
+        super().__init__(
+            id="SEC-011",
+            name="Database Without Encryption at Rest",
+            description="Database without encryption at rest",
+            category=RuleCategory.DATA,
+            severity=Severity.HIGH,
+            rationale="Protects sensitive data if storage or backups are compromised",
+        )
+
+    def matches(self, component) -> bool:
+        return component.component_type == "database" and not component.encryption_at_rest
+
+    def mask(self, columns):
+        return columns.of_type("database") & ~columns.encryption_at_rest
+
+    def finding_for(self, architecture: ArchitectureSnapshot, component):
+        return self.finding(
+            title=f"Database {component.name} without encryption at rest",
+            description="Database does not have encryption at rest enabled",
+            impact="Data exposure risk if storage is compromised",
+            affected_component_id=component.id,
+        )
+
+
+class SensitiveFlowUnencryptedRule(AttributeRule):
+    """SEC-012: SQL/LDAP flow without encryption"""
+
+    scope = RuleScope.FLOW
+
+    SENSITIVE_PROTOCOLS = ("sql", "ldap")
+
+    def __init__(self):
+        super().__init__(
+            id="SEC-012",
+            name="Sensitive Data Flow Without Encryption",
+            description="Flow likely carrying sensitive data without encryption (heuristic)",
+            category=RuleCategory.DATA,
+            severity=Severity.HIGH,
+            rationale="Sensitive data must be protected in transit",
+        )
+
+    def matches(self, flow) -> bool:
+        return flow.protocol in self.SENSITIVE_PROTOCOLS and not flow.is_encrypted
+
+    def mask(self, columns):
+        return columns.of_protocol(*self.SENSITIVE_PROTOCOLS) & ~columns.is_encrypted
+
+    def finding_for(self, architecture: ArchitectureSnapshot, flow):
+        source = architecture.get_component(flow.source_component_id)
+        target = architecture.get_component(flow.target_component_id)
+        return self.finding(
+            title=f"Unencrypted {flow.protocol} flow between {source.name} and {target.name}",
+            description="Potentially sensitive data transmitted without encryption",
+            impact="Credential or data interception risk",
+            affected_flow_id=flow.id,
+        )
+
+
+class ExposedApiWithoutTlsRule(Rule):
+    """SEC-013: API gateway reachable from the Internet over plain HTTP"""
+
+    requires = ("internet_flows",)
+
+    def __init__(self):
+        super().__init__(
+            id="SEC-013",
+            name="No TLS on Exposed API",
+            description="API exposed without TLS",
+            category=RuleCategory.DATA,
+            severity=Severity.CRITICAL,
+            rationale="Every exposed API must use HTTPS",
+        )
+
+    def evaluate(self, architecture: ArchitectureSnapshot):
+        for flow in architecture.internet_flows:
+            target = architecture.get_component(flow.target_component_id)
+            if target and target.component_type == "api_gateway" and flow.protocol == "http":
+                yield self.finding(
+                    title=f"API {target.name} exposed over HTTP",
+                    description="API accessible from Internet without TLS encryption",
+                    impact="Man-in-the-middle attacks, credential theft",
+                    affected_flow_id=flow.id,
+                )
@@ -0,0 +1,466 @@
+"""
+Declarative rules - YAML/JSON rule packs compiled to closures
+
+A rule pack is a file holding a `rules` list. Each rule gives its metadata,
+the entity it targets (`component` or `flow`), a condition tree over that
+entity, its zone and (for flows) its endpoints, and finding templates:
+
+    rules:
+      - id: ORG-001
+        name: Database Without Logging
+        description: Databases must keep an audit trail
+        category: observability
+        severity: high
+        rationale: Audit trails are required on every data store
+        target: component
+        when:
+          all:
+            - {field: component_type, eq: database}
+            - {field: has_logging, eq: false}
+        finding:
+          title: "No logging on {component.name}"
+          description: "Database in zone {zone.name} without audit logging"
+          impact: "Data access cannot be investigated"
+
+Conditions are leaves `{field: <path>, <operator>: <value>}` combined with
+`all`, `any` and `not`. A path is a field of the target (`has_logging`) or of
+a related record (`zone.trust_level`, `source.component_type`,
+`target_zone.name`); operators are `eq`, `ne`, `in`, `not_in` and `contains`
+(case-insensitive substring).
+
+A pack is parsed and validated once and each condition is compiled twice: a
+predicate closure over one record, and a NumPy mask expression over the
+snapshot's column store (used when available, like `AttributeRule`).
+Compiled packs are cached by the SHA-256 of the file contents.
+"""
+
+import hashlib
+import inspect
+import json
+from functools import reduce
+from pathlib import Path
+from string import Formatter
+from threading import Lock
+from typing import Any, Callable, Iterable, Optional, Union
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover - optional dependency
+    yaml = None
+
+from core.rules.base import Rule, RuleCategory, RuleFinding, RuleScope, Severity
+from core.snapshot import TRUST_ORDER, ArchitectureSnapshot
+from models.orm import ComponentTypeEnum, FlowProtocolEnum
+
+
+RULE_PACK_SUFFIXES = (".yaml", ".yml", ".json")
+
+# Record kind -> field -> (type, accepted values or None for any)
+FIELDS: dict[str, dict[str, tuple[type, Optional[frozenset]]]] = {
+    "component": {
+        "id": (str, None),
+        "name": (str, None),
+        "component_type": (str, frozenset(t.value for t in ComponentTypeEnum)),
+        "has_admin_interface": (bool, None),
+        "requires_mfa": (bool, None),
+        "has_logging": (bool, None),
+        "encryption_at_rest": (bool, None),
+        "encryption_in_transit": (bool, None),
+    },
+    "zone": {
+        "id": (str, None),
+        "name": (str, None),
+        "trust_level": (str, frozenset(TRUST_ORDER)),
+    },
+    "flow": {
+        "id": (str, None),
+        "protocol": (str, frozenset(p.value for p in FlowProtocolEnum)),
+        "port": (int, None),
+        "is_authenticated": (bool, None),
+        "is_encrypted": (bool, None),
+    },
+}
+
+# Target -> reference usable in paths and templates -> record kind
+REFERENCES: dict[str, dict[str, str]] = {
+    "component": {"component": "component", "zone": "zone"},
+    "flow": {
+        "flow": "flow",
+        "source": "component",
+        "target": "component",
+        "source_zone": "zone",
+        "target_zone": "zone",
+    },
+}
+
+OPERATORS = ("eq", "ne", "in", "not_in", "contains")
+
+_RULE_KEYS = {"id", "name", "description", "category", "severity", "rationale", "target", "when", "finding", "cost"}
+_FINDING_KEYS = ("title", "description", "impact")
+
+# Columns with a native vector form: kind -> field -> ColumnStore accessor
+_FLAG_COLUMNS = {
+    "component": {"has_admin_interface", "requires_mfa", "has_logging", "encryption_at_rest", "encryption_in_transit"},
+    "flow": {"is_authenticated", "is_encrypted"},
+}
+_CODE_COLUMNS = {"component": ("component_type", "of_type"), "flow": ("protocol", "of_protocol")}
+
+Predicate = Callable[[ArchitectureSnapshot, Any], bool]
+Mask = Callable[[Any], Any]  # ColumnStore -> boolean array over the target's records
+
+
+class RuleDefinitionError(ValueError):
+    """Invalid rule pack or rule definition"""
+
+
+def _resolver(target: str, reference: str) -> Callable[[ArchitectureSnapshot, Any], Any]:
+    """Record referenced by `reference` from a target record, None when absent"""
+    if reference == target:
+        return lambda snapshot, record: record
+    if reference == "zone":
+        return lambda snapshot, component: snapshot.zones_by_id.get(component.zone_id)
+    if reference == "source":
+        return lambda snapshot, flow: snapshot.components_by_id.get(flow.source_component_id)
+    if reference == "target":
+        return lambda snapshot, flow: snapshot.components_by_id.get(flow.target_component_id)
+    if reference == "source_zone":
+        return lambda snapshot, flow: snapshot.zone_of(flow.source_component_id)
+    return lambda snapshot, flow: snapshot.zone_of(flow.target_component_id)
+
+
+class _Compiler:
+    """Compiles the definitions of one rule, collecting the references it reads"""
+
+    def __init__(self, target: str, where: str):
+        self.target = target
+        self.where = where
+        self.references: set[str] = set()
+
+    def error(self, message: str) -> RuleDefinitionError:
+        return RuleDefinitionError(f"{self.where}: {message}")
+
+    def path(self, path: Any) -> tuple[str, str, str]:
+        """(reference, record kind, field) of a field path"""
+        if not isinstance(path, str) or not path:
+            raise self.error(f"invalid field path {path!r}")
+        reference, _, name = path.rpartition(".")
+        reference = reference or self.target
+        kind = REFERENCES[self.target].get(reference)
+        if kind is None:
+            known = ", ".join(REFERENCES[self.target])
+            raise self.error(f"unknown reference {reference!r} in {path!r} (expected one of: {known})")
+        if name not in FIELDS[kind]:
+            raise self.error(f"unknown {kind} field {name!r} in {path!r}")
+        self.references.add(reference)
+        return reference, kind, name
+
+    def value(self, path: str, kind: str, name: str, value: Any) -> Any:
+        expected, choices = FIELDS[kind][name]
+        if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+            raise self.error(f"{path} expects a {expected.__name__}, got {value!r}")
+        if choices is not None and value not in choices:
+            raise self.error(f"{path} cannot be {value!r} (expected one of: {', '.join(sorted(choices))})")
+        return value
+
+    def condition(self, node: Any) -> tuple[Predicate, Mask]:
+        if not isinstance(node, dict) or not node:
+            raise self.error(f"invalid condition {node!r}")
+
+        if "field" not in node:
+            if len(node) != 1:
+                raise self.error(f"condition must have exactly one of all/any/not, got {sorted(node)}")
+            (combinator, operand), = node.items()
+            if combinator == "not":
+                predicate, mask = self.condition(operand)
+                return (lambda s, r: not predicate(s, r)), (lambda columns: ~mask(columns))
+            if combinator not in ("all", "any"):
+                raise self.error(f"unknown combinator {combinator!r}")
+            if not isinstance(operand, list) or not operand:
+                raise self.error(f"{combinator} expects a non-empty list of conditions")
+            predicates, masks = zip(*(self.condition(child) for child in operand))
+            if combinator == "all":
+                return (
+                    lambda s, r: all(p(s, r) for p in predicates),
+                    lambda columns: reduce(lambda a, b: a & b, (m(columns) for m in masks)),
+                )
+            return (
+                lambda s, r: any(p(s, r) for p in predicates),
+                lambda columns: reduce(lambda a, b: a | b, (m(columns) for m in masks)),
+            )
+
+        operators = [key for key in node if key != "field"]
+        if len(operators) != 1 or operators[0] not in OPERATORS:
+            raise self.error(f"condition on {node['field']!r} needs exactly one operator among {', '.join(OPERATORS)}")
+        return self.leaf(node["field"], operators[0], node[operators[0]])
+
+    def leaf(self, path: str, operator: str, operand: Any) -> tuple[Predicate, Mask]:
+        reference, kind, name = self.path(path)
+
+        if operator in ("in", "not_in"):
+            if not isinstance(operand, list) or not operand:
+                raise self.error(f"{path} {operator} expects a non-empty list")
+            values = frozenset(self.value(path, kind, name, v) for v in operand)
+            test = (lambda v: v in values) if operator == "in" else (lambda v: v not in values)
+        elif operator == "contains":
+            if FIELDS[kind][name][0] is not str or not isinstance(operand, str):
+                raise self.error(f"{path} contains expects a text field and a string")
+            needle = operand.lower()
+
+            def test(v) -> bool:
+                return v is not None and needle in v.lower()
+        else:
+            expected = self.value(path, kind, name, operand)
+            test = (lambda v: v == expected) if operator == "eq" else (lambda v: v != expected)
+
+        def record_test(record) -> bool:
+            return test(getattr(record, name))
+
+        resolve = _resolver(self.target, reference)
+
+        def predicate(snapshot: ArchitectureSnapshot, record) -> bool:
+            related = resolve(snapshot, record)
+            return related is not None and record_test(related)
+
+        if kind == "zone":
+            # Zones are few: test each zone once, then gather through the component's zone
+            def component_mask(columns) -> Any:
+                return columns.components.in_zones(record_test)
+        else:
+            component_mask = None
+        mask = self.native_mask(kind, name, operator, operand, record_test)
+        return predicate, self.lift(reference, kind, mask, component_mask)
+
+    @staticmethod
+    def native_mask(kind: str, name: str, operator: str, operand: Any, record_test: Callable) -> Mask:
+        """Mask over the columns of `kind` (ComponentColumns/FlowColumns -> array)"""
+        negated = operator in ("ne", "not_in")
+        if name in _FLAG_COLUMNS.get(kind, ()) and operator in ("eq", "ne"):
+            wanted = bool(operand) != negated
+            return lambda cols: getattr(cols, name) if wanted else ~getattr(cols, name)
+        code_field, method = _CODE_COLUMNS.get(kind, (None, None))
+        if name == code_field and operator != "contains":
+            values = tuple(operand) if isinstance(operand, list) else (operand,)
+            if negated:
+                return lambda cols: ~getattr(cols, method)(*values)
+            return lambda cols: getattr(cols, method)(*values)
+        return lambda cols: cols.where(record_test)
+
+    def lift(self, reference: str, kind: str, mask: Mask, component_mask: Optional[Mask]) -> Mask:
+        """Turn a mask over the referenced records into one over the target's records"""
+        if kind == "flow":
+            return lambda columns: mask(columns.flows)
+        if kind == "component":
+            def component_mask(columns) -> Any:
+                return mask(columns.components)
+
+        if self.target == "component":
+            return component_mask
+        if reference.startswith("source"):
+            return lambda columns: columns.flows.at_source(component_mask(columns))
+        return lambda columns: columns.flows.at_target(component_mask(columns))
+
+    def template(self, key: str, text: Any) -> Callable[[ArchitectureSnapshot, Any], str]:
+        if not isinstance(text, str):
+            raise self.error(f"finding {key} must be a string")
+        parts: list[Union[str, Callable]] = []
+        try:
+            parsed = list(Formatter().parse(text))
+        except ValueError as e:
+            raise self.error(f"finding {key}: {e}") from None
+        for literal, field_name, format_spec, conversion in parsed:
+            if literal:
+                parts.append(literal)
+            if field_name is None:
+                continue
+            if format_spec or conversion or "." not in field_name:
+                placeholder = field_name + (f"!{conversion}" if conversion else "") + (f":{format_spec}" if format_spec else "")
+                raise self.error(f"finding {key}: placeholders must look like {{reference.field}}, got {{{placeholder}}}")
+            reference, _, name = self.path(field_name)
+            parts.append(_placeholder(_resolver(self.target, reference), name))
+
+        def render(snapshot: ArchitectureSnapshot, record) -> str:
+            return "".join(part if isinstance(part, str) else part(snapshot, record) for part in parts)
+
+        return render
+
+
+def _placeholder(resolve: Callable, name: str) -> Callable[[ArchitectureSnapshot, Any], str]:
+    def render(snapshot: ArchitectureSnapshot, record) -> str:
+        related = resolve(snapshot, record)
+        value = getattr(related, name) if related is not None else None
+        return "unknown" if value is None else str(value)
+
+    return render
+
+
+class DeclarativeRule(Rule):
+    """Rule compiled from a declarative definition (see module docstring)"""
+
+    def __init__(
+        self,
+        definition: dict,
+        target: str,
+        predicate: Predicate,
+        mask: Mask,
+        templates: dict[str, Callable[[ArchitectureSnapshot, Any], str]],
+        scope: RuleScope,
+    ):
+        super().__init__(
+            id=definition["id"],
+            name=definition["name"],
+            description=definition["description"],
+            category=RuleCategory(definition["category"]),
+            severity=Severity(definition["severity"]),
+            rationale=definition["rationale"],
+        )
+        self.definition = definition
+        self.target = target
+        self.scope = scope
+        self.cost = definition.get("cost", 1)
+        self._predicate = predicate
+        self._mask = mask
+        self._templates = templates
+
+    def matches(self, architecture: ArchitectureSnapshot, record) -> bool:
+        return self._predicate(architecture, record)
+
+    def evaluate(self, architecture: ArchitectureSnapshot) -> Iterable[RuleFinding]:
+        records = architecture.flows if self.target == "flow" else architecture.components
+        columns = architecture.columns
+        if columns is not None:
+            selected = (records[i] for i in columns.offenders(self._mask(columns)))
+        else:
+            selected = (r for r in records if self._predicate(architecture, r))
+
+        for record in selected:
+            texts = {key: render(architecture, record) for key, render in self._templates.items()}
+            if self.target == "flow":
+                yield self.finding(**texts, affected_flow_id=record.id)
+            else:
+                yield self.finding(**texts, affected_component_id=record.id)
+
+    def fingerprint(self) -> str:
+        """Hash of the definition and of the compiler that produced the rule"""
+        canonical = json.dumps(self.definition, sort_keys=True, default=str)
+        return hashlib.sha256(f"{_compiler_source()}|{canonical}".encode()).hexdigest()
+
+
+def _compiler_source() -> str:
+    try:
+        return inspect.getsource(inspect.getmodule(DeclarativeRule))
+    except (OSError, TypeError):
+        return __name__
+
+
+def compile_rule(definition: Any, source: str = "<inline>") -> DeclarativeRule:
+    """
+    Validate one rule definition and compile it
+
+    Raises:
+        RuleDefinitionError: If the definition is invalid
+    """
+    if not isinstance(definition, dict):
+        raise RuleDefinitionError(f"{source}: rule definitions must be mappings")
+    where = f"{source}: rule {definition.get('id', '?')}"
+
+    missing = (_RULE_KEYS - {"cost"}) - definition.keys()
+    unknown = definition.keys() - _RULE_KEYS
+    if missing or unknown:
+        details = [f"missing {', '.join(sorted(missing))}"] if missing else []
+        details += [f"unknown {', '.join(sorted(unknown))}"] if unknown else []
+        raise RuleDefinitionError(f"{where}: {'; '.join(details)}")
+    for key in ("id", "name", "description", "rationale"):
+        if not isinstance(definition[key], str) or not definition[key]:
+            raise RuleDefinitionError(f"{where}: {key} must be a non-empty string")
+    try:
+        RuleCategory(definition["category"])
+        Severity(definition["severity"])
+    except ValueError as e:
+        raise RuleDefinitionError(f"{where}: {e}") from None
+    cost = definition.get("cost", 1)
+    if not isinstance(cost, int) or isinstance(cost, bool) or cost < 0:
+        raise RuleDefinitionError(f"{where}: cost must be a non-negative integer")
+
+    target = definition["target"]
+    if target not in REFERENCES:
+        raise RuleDefinitionError(f"{where}: target must be one of: {', '.join(REFERENCES)}")
+
+    compiler = _Compiler(target, where)
+    predicate, mask = compiler.condition(definition["when"])
+
+    finding = definition["finding"]
+    if not isinstance(finding, dict) or set(finding) != set(_FINDING_KEYS):
+        raise RuleDefinitionError(f"{where}: finding must define exactly {', '.join(_FINDING_KEYS)}")
+    templates = {key: compiler.template(key, finding[key]) for key in _FINDING_KEYS}
+
+    # Incremental analysis only re-runs entity-scoped rules on changed
+    # components/flows; a rule reading zones must see the whole architecture
+    if any(REFERENCES[target][ref] == "zone" for ref in compiler.references):
+        scope = RuleScope.ARCHITECTURE
+    else:
+        scope = RuleScope.FLOW if target == "flow" else RuleScope.COMPONENT
+
+    return DeclarativeRule(definition, target, predicate, mask, templates, scope)
+
+
+def _parse(content: bytes, source: str) -> Any:
+    """JSON for .json files, YAML (a JSON superset) otherwise"""
+    if source.endswith(".json"):
+        try:
+            return json.loads(content)
+        except ValueError as e:
+            raise RuleDefinitionError(f"{source}: {e}") from None
+    if yaml is None:
+        raise RuleDefinitionError(f"{source}: PyYAML is required to load YAML rule packs")
+    try:
+        return yaml.safe_load(content)
+    except yaml.YAMLError as e:
+        raise RuleDefinitionError(f"{source}: {e}") from None
+
+
+_PACK_CACHE_SIZE = 64
+_packs: dict[str, tuple[DeclarativeRule, ...]] = {}
+_packs_lock = Lock()
+
+
+def compile_rule_pack(content: bytes, source: str = "<inline>") -> tuple[DeclarativeRule, ...]:
+    """
+    Compile a rule pack, reusing the compiled rules of identical content
+
+    Raises:
+        RuleDefinitionError: If the pack or one of its rules is invalid
+    """
+    digest = hashlib.sha256(content).hexdigest()
+    with _packs_lock:
+        cached = _packs.get(digest)
+    if cached is not None:
+        return cached
+
+    document = _parse(content, source)
+    if not isinstance(document, dict) or not isinstance(document.get("rules"), list):
+        raise RuleDefinitionError(f"{source}: a rule pack must have a top-level 'rules' list")
+    rules = tuple(compile_rule(definition, source) for definition in document["rules"])
+    ids = [rule.id for rule in rules]
+    duplicates = sorted({i for i in ids if ids.count(i) > 1})
+    if duplicates:
+        raise RuleDefinitionError(f"{source}: duplicate rule ids {', '.join(duplicates)}")
+
+    with _packs_lock:
+        if len(_packs) >= _PACK_CACHE_SIZE:
+            _packs.pop(next(iter(_packs)))
+        _packs[digest] = rules
+    return rules
+
+
+def load_rule_pack(path: Union[str, Path]) -> tuple[DeclarativeRule, ...]:
+    """Compile one rule pack file (cached by content hash)"""
+    path = Path(path)
+    return compile_rule_pack(path.read_bytes(), str(path))
+
+
+def load_rule_packs(directory: Optional[Union[str, Path]]) -> list[Rule]:
+    """Compile every rule pack of a directory, in file name order; missing directory -> no rules"""
+    if not directory or not Path(directory).is_dir():
+        return []
+    paths = sorted(p for p in Path(directory).iterdir() if p.suffix in RULE_PACK_SUFFIXES and p.is_file())
+    return [rule for path in paths for rule in load_rule_pack(path)]
@@ -0,0 +1,62 @@
+"""
+Identity & Access Management rules (SEC-001, SEC-002)
+"""
+
+from core.rules.base import AttributeRule, Rule, RuleCategory, Severity
+from core.snapshot import ArchitectureSnapshot
+
+
+class AdminAccessWithoutMFARule(AttributeRule):
+    """SEC-001: admin interface without mandatory MFA"""
+
+    def __init__(self):
+        super().__init__(
+            id="SEC-001",
+            name="Admin Access Without MFA",
+            description="Detects components with an administrative interface that do not require MFA",
+            category=RuleCategory.IDENTITY,
+            severity=Severity.HIGH,
+            rationale="MFA is essential to protect privileged access against credential theft",
+        )
+
+    def matches(self, component) -> bool:
+        return component.has_admin_interface and not component.requires_mfa
+
+    def mask(self, columns):
+        return columns.has_admin_interface & ~columns.requires_mfa
+
+    def finding_for(self, architecture: ArchitectureSnapshot, component):
+        return self.finding(
+            title=f"Admin interface without MFA on {component.name}",
+            description=f"Component {component.name} has administrative access without MFA requirement",
+            impact="Risk of unauthorized access if credentials are compromised",
+            affected_component_id=component.id,
+        )
+
+
+class CriticalComponentWithoutAuthRule(Rule):
+    """SEC-002: critical component reachable through unauthenticated flows"""
+
+    CRITICAL_TYPES = ("database", "iam", "api_gateway")
+
+    def __init__(self):
+        super().__init__(
+            id="SEC-002",
+            name="Critical Component Without Authentication",
+            description="Critical component accessible without authentication",
+            category=RuleCategory.IDENTITY,
+            severity=Severity.CRITICAL,
+            rationale="Every critical component must enforce strict access control",
+        )
+
+    def evaluate(self, architecture: ArchitectureSnapshot):
+        for component in architecture.components_of_type(*self.CRITICAL_TYPES):
+            incoming = architecture.incoming.get(component.id, ())
+            unauthenticated = [f for f in incoming if not f.is_authenticated]
+            if unauthenticated:
+                yield self.finding(
+                    title=f"Critical component {component.name} accessible without authentication",
+                    description=f"{len(unauthenticated)} unauthenticated flow(s) to critical component",
+                    impact="Unauthorized access to sensitive resources",
+                    affected_component_id=component.id,
+                )
@@ -0,0 +1,275 @@
+"""
+Network & Segmentation rules (SEC-003 to SEC-010)
+"""
+
+from core.budget import checkpoint
+from core.rules.base import Rule, RuleCategory, Severity
+from core.snapshot import ArchitectureSnapshot
+
+
+class DirectInternetAccessRule(Rule):
+    """SEC-003: flow from the Internet straight into an internal zone"""
+
+    requires = ("internet_flows",)
+
+    def __init__(self):
+        super().__init__(
+            id="SEC-003",
+            name="Direct Internet Access to Internal Zone",
+            description="Detects direct access from the Internet to internal (non-DMZ) zones",
+            category=RuleCategory.NETWORK,
+            severity=Severity.CRITICAL,
+            rationale="Zero Trust: any Internet access must go through a control zone (DMZ)",
+        )
+
+    def evaluate(self, architecture: ArchitectureSnapshot):
+        for flow in architecture.internet_flows:
+            target = architecture.get_component(flow.target_component_id)
+            target_zone = architecture.get_zone(target.zone_id) if target else None
+            if target_zone and target_zone.trust_level in ("medium", "high"):
+                yield self.finding(
+                    title=f"Direct Internet access to {target.name} in internal zone",
+                    description=f"Flow from Internet directly to {target_zone.name} zone bypasses DMZ",
+                    impact="Exposure of internal resources without perimeter defense",
+                    affected_flow_id=flow.id,
+                )
+
+
+class NoBastionRule(Rule):
+    """SEC-004: administrative interfaces without any bastion host"""
+
+    requires = ("has_bastion",)
+
+    def __init__(self):
+        super().__init__(
+            id="SEC-004",
+            name="No Bastion for Administration",
+            description="Administration of components without a bastion host",
+            category=RuleCategory.NETWORK,
+            severity=Severity.HIGH,
+            rationale="Administrative access must go through a hardened, auditable bastion",
+        )
+
+    def evaluate(self, architecture: ArchitectureSnapshot):
+        if architecture.has_bastion:
+            return
+
+        admin_components = [c for c in architecture.components if c.has_admin_interface]
+        if admin_components:
+            yield self.finding(
+                title="No bastion host for administrative access",
+                description=f"{len(admin_components)} components with admin interfaces but no bastion in architecture",
+                impact="Difficult to audit and control administrative access",
+                affected_component_id=admin_components[0].id,
+            )
+
+
+class UncontrolledInterZoneFlowRule(Rule):
+    """SEC-005: inter-zone flow without a firewall endpoint"""
+
+    requires = ("zone_crossing_flows",)
+
+    def __init__(self):
+        super().__init__(
+            id="SEC-005",
+            name="Uncontrolled Inter-Zone Flow",
+            description="Flow between different trust zones without explicit control",
+            category=RuleCategory.NETWORK,
+            severity=Severity.MEDIUM,
+            rationale="Every flow crossing a zone boundary must be controlled (firewall, ACL)",
+        )
+
+    def evaluate(self, architecture: ArchitectureSnapshot):
+        for flow in architecture.zone_crossing_flows:
+            checkpoint()
+            source = architecture.get_component(flow.source_component_id)
+            target = architecture.get_component(flow.target_component_id)
+            if "firewall" in (source.component_type, target.component_type):
+                continue
+
+            yield self.finding(
+                title=f"Uncontrolled flow between {source.name} and {target.name}",
+                description="Inter-zone flow without explicit firewall control",
+                impact="Lateral movement risk if one zone is compromised",
+                affected_flow_id=flow.id,
+            )
+
+
+class ManagementZoneExposedRule(Rule):
+    """SEC-006: management zone reachable from the Internet"""
+
+    requires = ("internet_flows",)
+
+    def __init__(self):
+        super().__init__(
+            id="SEC-006",
+            name="Management Zone Accessible from Internet",
+            description="Management zone (control plane) accessible from the Internet",
+            category=RuleCategory.NETWORK,
+            severity=Severity.CRITICAL,
+            rationale="The management plane must be isolated and never directly exposed",
+        )
+
+    @staticmethod
+    def is_management_zone(name: str) -> bool:
+        lowered = name.lower()
+        return "management" in lowered or "admin" in lowered
+
+    def evaluate(self, architecture: ArchitectureSnapshot):
+        for flow in architecture.internet_flows:
+            target_zone = architecture.zone_of(flow.target_component_id)
+            if target_zone and self.is_management_zone(target_zone.name):
+                yield self.finding(
+                    title="Management zone accessible from Internet",
+                    description=f"Direct access from Internet to management zone {target_zone.name}",
+                    impact="Administrative plane compromise risk",
+                    affected_flow_id=flow.id,
+                )
+
+
+class UnencryptedCrossZoneFlowRule(Rule):
+    """SEC-007: unencrypted flow between different trust zones"""
+
+    requires = ("zone_crossing_flows",)
+
+    def __init__(self):
+        super().__init__(
+            id="SEC-007",
+            name="Unencrypted Flow Between Different Trust Zones",
+            description="Unencrypted flow between zones of different trust",
+            category=RuleCategory.DATA,
+            severity=Severity.MEDIUM,
+            rationale="Data crossing zone boundaries must be encrypted",
+        )
+
+    def evaluate(self, architecture: ArchitectureSnapshot):
+        for flow in architecture.zone_crossing_flows:
+            checkpoint()
+            if flow.is_encrypted:
+                continue
+
+            source_zone = architecture.zone_of(flow.source_component_id)
+            target_zone = architecture.zone_of(flow.target_component_id)
+            if not source_zone or not target_zone:
+                continue
+
+            trust_diff = abs(source_zone.trust_rank - target_zone.trust_rank)
+            source = architecture.get_component(flow.source_component_id)
+            target = architecture.get_component(flow.target_component_id)
+            yield self.finding(
+                title=f"Unencrypted flow between {source_zone.name} and {target_zone.name}",
+                description=f"Flow from {source.name} to {target.name} crosses trust boundaries without encryption",
+                impact="Data exposure risk during transit",
+                severity=Severity.HIGH if trust_diff >= 2 else Severity.MEDIUM,
+                affected_flow_id=flow.id,
+            )
+
+
+class NoSegmentationRule(Rule):
+    """SEC-008: critical components talking to each other inside one zone"""
+
+    CRITICAL_TYPES = ("database", "iam")
+    cost = 2  # both adjacency lists of every critical component
+
+    def __init__(self):
+        super().__init__(
+            id="SEC-008",
+            name="No Segmentation Between Critical Components",
+            description="Critical components in the same zone without segmentation",
+            category=RuleCategory.NETWORK,
+            severity=Severity.MEDIUM,
+            rationale="Micro-segmentation limits the blast radius",
+        )
+
+    def evaluate(self, architecture: ArchitectureSnapshot):
+        critical = architecture.components_of_type(*self.CRITICAL_TYPES)
+        order = {c.id: i for i, c in enumerate(architecture.components)}
+        reported: set[frozenset] = set()
+
+        for component in sorted(critical, key=lambda c: order[c.id]):
+            checkpoint()
+            for flow in architecture.outgoing.get(component.id, ()) + architecture.incoming.get(component.id, ()):
+                other_id = flow.target_component_id if flow.source_component_id == component.id else flow.source_component_id
+                other = architecture.get_component(other_id)
+                if (
+                    not other
+                    or other.component_type not in self.CRITICAL_TYPES
+                    or other.zone_id != component.zone_id
+                ):
+                    continue
+
+                pair = frozenset((component.id, other.id))
+                if pair in reported:
+                    continue
+                reported.add(pair)
+
+                first, second = sorted((component, other), key=lambda c: order[c.id])
+                yield self.finding(
+                    title=f"No segmentation between {first.name} and {second.name}",
+                    description="Critical components in same zone without micro-segmentation",
+                    impact="Lateral movement risk between critical assets",
+                    affected_component_id=first.id,
+                )
+
+
+class ExposedWithoutFirewallRule(Rule):
+    """SEC-009: Internet-exposed component without firewall protection"""
+
+    requires = ("internet_exposed_components",)
+    cost = 2  # scans the zone of every exposed component
+
+    def __init__(self):
+        super().__init__(
+            id="SEC-009",
+            name="Internet-Exposed Component Without Firewall",
+            description="Component exposed to the Internet without a firewall in front",
+            category=RuleCategory.NETWORK,
+            severity=Severity.HIGH,
+            rationale="Every Internet exposure must be protected by a firewall or WAF",
+        )
+
+    def evaluate(self, architecture: ArchitectureSnapshot):
+        for target in architecture.internet_exposed_components:
+            if target.component_type == "firewall":
+                continue
+
+            zone_has_firewall = any(
+                c.component_type == "firewall"
+                for c in architecture.components_by_zone.get(target.zone_id, ())
+            )
+            if zone_has_firewall:
+                continue
+
+            yield self.finding(
+                title=f"Internet-exposed {target.name} without firewall protection",
+                description="Component accessible from Internet without firewall",
+                impact="Direct exposure to Internet-based attacks",
+                affected_component_id=target.id,
+            )
+
+
+class BidirectionalFlowRule(Rule):
+    """SEC-010: two-way communication between the same pair of components"""
+
+    requires = ("graph",)
+
+    def __init__(self):
+        super().__init__(
+            id="SEC-010",
+            name="Bidirectional Flow Without Justification",
+            description="Bidirectional flow detected (may indicate an architecture issue)",
+            category=RuleCategory.NETWORK,
+            severity=Severity.LOW,
+            rationale="Flows should be unidirectional in a well segmented architecture",
+        )
+
+    def evaluate(self, architecture: ArchitectureSnapshot):
+        graph = architecture.graph
+        for source, target in graph.reverse_pairs:
+            checkpoint()
+            yield self.finding(
+                title=f"Bidirectional flow between {graph.component(source).name} and {graph.component(target).name}",
+                description="Two-way communication pattern detected",
+                impact="May indicate architectural complexity or unnecessary exposure",
+                affected_flow_id=graph.edges[(source, target)],
+            )
@@ -0,0 +1,73 @@
+"""
+Observability & Logging rules (SEC-014, SEC-015)
+"""
+
+from core.rules.base import AttributeRule, Rule, RuleCategory, Severity
+from core.snapshot import ArchitectureSnapshot
+
+
+class CriticalComponentWithoutLoggingRule(AttributeRule):
+    """SEC-014: critical or administrable component without logging"""
+
+    CRITICAL_TYPES = ("database", "iam", "api_gateway", "firewall")
+
+    def __init__(self):
+        super().__init__(
+            id="SEC-014",
+            name="Critical Component Without Logging",
+            description="Critical component without logging enabled",
+            category=RuleCategory.OBSERVABILITY,
+            severity=Severity.MEDIUM,
+            rationale="Observability is essential for incident detection and forensics",
+        )
+
+    def matches(self, component) -> bool:
+        return not component.has_logging and (
+            component.component_type in self.CRITICAL_TYPES or component.has_admin_interface
+        )
+
+    def mask(self, columns):
+        return ~columns.has_logging & (columns.of_type(*self.CRITICAL_TYPES) | columns.has_admin_interface)
+
+    def finding_for(self, architecture: ArchitectureSnapshot, component):
+        return self.finding(
+            title=f"No logging enabled on {component.name}",
+            description="Critical component without audit logging",
+            impact="Blind spot for security monitoring and incident response",
+            affected_component_id=component.id,
+        )
+
+
+class NoCentralizedLoggingRule(Rule):
+    """SEC-015: components log locally but no central collector exists"""
+
+    COLLECTOR_KEYWORDS = ("siem", "log", "splunk", "elk")
+    cost = 2  # every component name against every keyword
+
+    def __init__(self):
+        super().__init__(
+            id="SEC-015",
+            name="No Centralized Logging",
+            description="No centralized log collection",
+            category=RuleCategory.OBSERVABILITY,
+            severity=Severity.MEDIUM,
+            rationale="Centralized logs enable correlation and detection of distributed attacks",
+        )
+
+    def evaluate(self, architecture: ArchitectureSnapshot):
+        has_collector = any(
+            keyword in c.name.lower()
+            for c in architecture.components
+            for keyword in self.COLLECTOR_KEYWORDS
+        )
+        if has_collector:
+            return
+
+        components_with_logging = [c for c in architecture.components if c.has_logging]
+        if components_with_logging:
+            yield self.finding(
+                title="No centralized logging solution detected",
+                description=f"{len(components_with_logging)} components have logging but no central collector",
+                impact="Difficult correlation and security monitoring",
+                affected_component_id=components_with_logging[0].id,
+            )
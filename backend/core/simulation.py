@@ -0,0 +1,145 @@
+"""
+What-if overlay - hypothetical changes applied to a snapshot, in memory only
+
+`overlay` returns a new snapshot sharing every untouched record with the
+original (records are immutable, so copy-on-write only rebuilds the changed
+ones); nothing is read from or written to the database. Running the rule
+engine on both snapshots gives the effect of the changes before anyone
+edits the real architecture.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, fields, replace
+from typing import Any, Iterable, Mapping, Optional
+
+from core.rules import RuleFinding
+from core.snapshot import ArchitectureSnapshot, ComponentSnapshot, FlowSnapshot
+
+
+COMPONENT_FIELDS = frozenset(f.name for f in fields(ComponentSnapshot)) - {"id"}
+FLOW_FIELDS = frozenset(f.name for f in fields(FlowSnapshot)) - {"id"}
+
+
+class OverlayError(ValueError):
+    """A hypothetical change refers to something that does not exist"""
+
+
+def _record(record_type, record_id: str, values: Mapping[str, Any], allowed: frozenset):
+    return record_type(id=record_id, **{k: values.get(k) for k in allowed})
+
+
+def _changed(record, values: Mapping[str, Any], allowed: frozenset):
+    changes = {k: v for k, v in values.items() if k in allowed and v is not None}
+    return replace(record, **changes) if changes else record
+
+
+def overlay(
+    snapshot: ArchitectureSnapshot,
+    component_updates: Optional[Mapping[str, Mapping[str, Any]]] = None,
+    flow_updates: Optional[Mapping[str, Mapping[str, Any]]] = None,
+    added_components: Iterable[Mapping[str, Any]] = (),
+    added_flows: Iterable[Mapping[str, Any]] = (),
+    removed_components: Iterable[str] = (),
+    removed_flows: Iterable[str] = (),
+) -> ArchitectureSnapshot:
+    """
+    Snapshot of the architecture as it would be after the given changes
+
+    Values are plain record values (enum values as strings).
+
+    Args:
+        snapshot: Current architecture
+        component_updates: Component id -> attributes to change (None values are ignored)
+        flow_updates: Flow id -> attributes to change
+        added_components: New components (`id` optional, then generated)
+        added_flows: New flows, whose endpoints may be added components
+        removed_components: Components to drop, with every flow touching them
+        removed_flows: Flows to drop
+
+    Returns:
+        Overlay snapshot (same architecture id, untouched records shared)
+
+    Raises:
+        OverlayError: Unknown component, flow or zone
+    """
+    component_updates = component_updates or {}
+    flow_updates = flow_updates or {}
+    removed_components = set(removed_components)
+    removed_flows = set(removed_flows)
+
+    for kind, ids, known in (
+        ("component", set(component_updates) | removed_components, snapshot.components_by_id),
+        ("flow", set(flow_updates) | removed_flows, snapshot.flows_by_id),
+    ):
+        unknown = ids - known.keys()
+        if unknown:
+            raise OverlayError(f"Unknown {kind}: {', '.join(sorted(unknown))}")
+
+    components = [
+        _changed(c, component_updates[c.id], COMPONENT_FIELDS) if c.id in component_updates else c
+        for c in snapshot.components
+        if c.id not in removed_components
+    ]
+    for position, values in enumerate(added_components):
+        component_id = values.get("id") or f"simulated-component-{position + 1}"
+        components.append(_record(ComponentSnapshot, component_id, values, COMPONENT_FIELDS))
+
+    component_ids = {c.id for c in components}
+    if len(component_ids) != len(components):
+        raise OverlayError("Added components must have unique ids")
+    missing_zones = {c.zone_id for c in components} - snapshot.zones_by_id.keys()
+    if missing_zones:
+        raise OverlayError(f"Unknown zone: {', '.join(sorted(missing_zones))}")
+
+    flows = [
+        _changed(f, flow_updates[f.id], FLOW_FIELDS) if f.id in flow_updates else f
+        for f in snapshot.flows
+        if f.id not in removed_flows
+        and f.source_component_id not in removed_components
+        and f.target_component_id not in removed_components
+    ]
+    for position, values in enumerate(added_flows):
+        flow_id = values.get("id") or f"simulated-flow-{position + 1}"
+        flow = _record(FlowSnapshot, flow_id, values, FLOW_FIELDS)
+        missing = {flow.source_component_id, flow.target_component_id} - component_ids
+        if missing:
+            raise OverlayError(f"Flow {flow_id} refers to unknown component: {', '.join(sorted(missing))}")
+        flows.append(flow)
+    if len({f.id for f in flows}) != len(flows):
+        raise OverlayError("Added flows must have unique ids")
+
+    return ArchitectureSnapshot(snapshot.architecture_id, snapshot.zones, tuple(components), tuple(flows))
+
+
+def _identity(finding: RuleFinding) -> tuple:
+    return (finding.rule_id, finding.title, finding.affected_component_id, finding.affected_flow_id)
+
+
+@dataclass
+class FindingDelta:
+    """Findings present only after (introduced) or only before (resolved) the changes"""
+    introduced: list[RuleFinding]
+    resolved: list[RuleFinding]
+
+
+def finding_delta(before: Iterable[RuleFinding], after: Iterable[RuleFinding]) -> FindingDelta:
+    """Compare two finding lists by rule, title and affected entity (duplicates counted)"""
+    before = list(before)
+    after = list(after)
+    remaining = Counter(_identity(f) for f in before)
+    introduced = []
+    for finding in after:
+        key = _identity(finding)
+        if remaining[key]:
+            remaining[key] -= 1
+        else:
+            introduced.append(finding)
+
+    resolved = []
+    for finding in reversed(before):
+        key = _identity(finding)
+        if remaining[key]:
+            remaining[key] -= 1
+            resolved.append(finding)
+    resolved.reverse()
+    return FindingDelta(introduced, resolved)
@@ -0,0 +1,289 @@
+"""
+Architecture snapshot - immutable, indexed view of an architecture
+
+The rule engine never walks ORM relationships. An architecture is loaded once
+into plain frozen records and indexed (by id, by type, by zone, adjacency
+lists) so every rule reads the same in-memory structure.
+"""
+
+import hashlib
+from dataclasses import astuple, dataclass, field
+from functools import cached_property
+from types import MappingProxyType
+from typing import Iterable, Mapping, Optional
+
+from core.columns import ColumnStore, column_store
+from core.graph import ComponentGraph
+from core.zone_matrix import ZoneMatrix
+
+
+TRUST_ORDER = ("untrusted", "low", "medium", "high")
+
+# Derived data shared between rules: name -> estimated cost (passes over the entities)
+DERIVED_COSTS: dict[str, int] = {}
+# Derived data built on top of other derived data: name -> names it reads
+DERIVED_REQUIRES: dict[str, tuple[str, ...]] = {}
+
+
+def derived(cost: int, requires: tuple[str, ...] = ()):
+    """
+    Declare a derived set computed once per snapshot and shared by rules
+
+    Rules list the names they read in `Rule.requires`; the registry uses
+    the declared cost (plus that of `requires`) to schedule rules.
+    """
+    def decorator(method):
+        DERIVED_COSTS[method.__name__] = cost
+        DERIVED_REQUIRES[method.__name__] = requires
+        return cached_property(method)
+    return decorator
+
+
+def derived_closure(names: Iterable[str]) -> set[str]:
+    """`names` plus every derived set they are computed from"""
+    closure: set[str] = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name not in closure:
+            closure.add(name)
+            pending.extend(DERIVED_REQUIRES.get(name, ()))
+    return closure
+
+
+def _value(value) -> Optional[str]:
+    """Normalize enum members to their plain string value"""
+    if value is None:
+        return None
+    return getattr(value, "value", value)
+
+
+@dataclass(frozen=True, slots=True)
+class ZoneSnapshot:
+    """Immutable zone record"""
+    id: str
+    name: str
+    trust_level: str
+
+    @property
+    def trust_rank(self) -> int:
+        return TRUST_ORDER.index(self.trust_level)
+
+
+@dataclass(frozen=True, slots=True)
+class ComponentSnapshot:
+    """Immutable component record"""
+    id: str
+    zone_id: str
+    name: str
+    component_type: str
+    has_admin_interface: bool
+    requires_mfa: bool
+    has_logging: bool
+    encryption_at_rest: bool
+    encryption_in_transit: bool
+
+
+@dataclass(frozen=True, slots=True)
+class FlowSnapshot:
+    """Immutable flow record"""
+    id: str
+    source_component_id: str
+    target_component_id: str
+    protocol: str
+    port: Optional[int]
+    is_authenticated: bool
+    is_encrypted: bool
+
+
+def _group(items: Iterable, key) -> Mapping[str, tuple]:
+    grouped: dict[str, list] = {}
+    for item in items:
+        grouped.setdefault(key(item), []).append(item)
+    return MappingProxyType({k: tuple(v) for k, v in grouped.items()})
+
+
+@dataclass(frozen=True)
+class ArchitectureSnapshot:
+    """
+    Immutable, indexed snapshot of one architecture
+
+    Build it with `ArchitectureSnapshot.build`; all indexes are computed once
+    at construction time.
+    """
+    architecture_id: str
+    zones: tuple[ZoneSnapshot, ...]
+    components: tuple[ComponentSnapshot, ...]
+    flows: tuple[FlowSnapshot, ...]
+
+    zones_by_id: Mapping[str, ZoneSnapshot] = field(init=False, repr=False)
+    components_by_id: Mapping[str, ComponentSnapshot] = field(init=False, repr=False)
+    flows_by_id: Mapping[str, FlowSnapshot] = field(init=False, repr=False)
+    components_by_type: Mapping[str, tuple[ComponentSnapshot, ...]] = field(init=False, repr=False)
+    components_by_zone: Mapping[str, tuple[ComponentSnapshot, ...]] = field(init=False, repr=False)
+    outgoing: Mapping[str, tuple[FlowSnapshot, ...]] = field(init=False, repr=False)
+    incoming: Mapping[str, tuple[FlowSnapshot, ...]] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        def index(name, value):
+            object.__setattr__(self, name, value)
+
+        index("zones_by_id", MappingProxyType({z.id: z for z in self.zones}))
+        index("components_by_id", MappingProxyType({c.id: c for c in self.components}))
+        index("flows_by_id", MappingProxyType({f.id: f for f in self.flows}))
+        index("components_by_type", _group(self.components, lambda c: c.component_type))
+        index("components_by_zone", _group(self.components, lambda c: c.zone_id))
+        index("outgoing", _group(self.flows, lambda f: f.source_component_id))
+        index("incoming", _group(self.flows, lambda f: f.target_component_id))
+
+    @classmethod
+    def build(cls, architecture_id: str, zones: Iterable, components: Iterable, flows: Iterable) -> "ArchitectureSnapshot":
+        """
+        Build a snapshot from ORM objects or any attribute-compatible records
+
+        Args:
+            architecture_id: Architecture UUID
+            zones: Zone records (id, name, trust_level)
+            components: Component records
+            flows: Flow records
+
+        Returns:
+            Indexed, immutable snapshot
+        """
+        return cls(
+            architecture_id=architecture_id,
+            zones=tuple(
+                ZoneSnapshot(id=z.id, name=z.name, trust_level=_value(z.trust_level))
+                for z in zones
+            ),
+            components=tuple(
+                ComponentSnapshot(
+                    id=c.id,
+                    zone_id=c.zone_id,
+                    name=c.name,
+                    component_type=_value(c.component_type),
+                    has_admin_interface=bool(c.has_admin_interface),
+                    requires_mfa=bool(c.requires_mfa),
+                    has_logging=bool(c.has_logging),
+                    encryption_at_rest=bool(c.encryption_at_rest),
+                    encryption_in_transit=bool(c.encryption_in_transit),
+                )
+                for c in components
+            ),
+            flows=tuple(
+                FlowSnapshot(
+                    id=f.id,
+                    source_component_id=f.source_component_id,
+                    target_component_id=f.target_component_id,
+                    protocol=_value(f.protocol),
+                    port=f.port,
+                    is_authenticated=bool(f.is_authenticated),
+                    is_encrypted=bool(f.is_encrypted),
+                )
+                for f in flows
+            ),
+        )
+
+    def restrict(
+        self,
+        component_ids: Optional[Iterable[str]] = None,
+        flow_ids: Optional[Iterable[str]] = None,
+    ) -> "ArchitectureSnapshot":
+        """
+        Snapshot keeping every zone but only the given components/flows
+
+        `None` keeps the whole collection. Used to re-run entity-scoped rules
+        on changed entities only.
+        """
+        components = self.components
+        if component_ids is not None:
+            keep = set(component_ids)
+            components = tuple(c for c in components if c.id in keep)
+        flows = self.flows
+        if flow_ids is not None:
+            keep = set(flow_ids)
+            flows = tuple(f for f in flows if f.id in keep)
+        return ArchitectureSnapshot(self.architecture_id, self.zones, components, flows)
+
+    @cached_property
+    def content_hash(self) -> str:
+        """
+        Stable SHA-256 over every zone, component and flow attribute
+
+        Independent of load order, so two snapshots of an unchanged
+        architecture always hash the same.
+        """
+        digest = hashlib.sha256()
+        for records in (self.zones, self.components, self.flows):
+            for record in sorted(astuple(r) for r in records):
+                digest.update(repr(record).encode())
+            digest.update(b"|")
+        return digest.hexdigest()
+
+    @cached_property
+    def columns(self) -> Optional[ColumnStore]:
+        """NumPy column store for vectorized rules (None without NumPy)"""
+        return column_store(self)
+
+    @derived(cost=1)
+    def graph(self) -> ComponentGraph:
+        """Directed component graph of the flows, with cached reachability"""
+        return ComponentGraph(self)
+
+    def get_zone(self, zone_id: str) -> Optional[ZoneSnapshot]:
+        return self.zones_by_id.get(zone_id)
+
+    def get_component(self, component_id: str) -> Optional[ComponentSnapshot]:
+        return self.components_by_id.get(component_id)
+
+    def zone_of(self, component_id: str) -> Optional[ZoneSnapshot]:
+        component = self.components_by_id.get(component_id)
+        return self.zones_by_id.get(component.zone_id) if component else None
+
+    def components_of_type(self, *component_types: str) -> tuple[ComponentSnapshot, ...]:
+        result: tuple[ComponentSnapshot, ...] = ()
+        for component_type in component_types:
+            result += self.components_by_type.get(_value(component_type), ())
+        return result
+
+    @property
+    def internet_zone(self) -> Optional[ZoneSnapshot]:
+        """First untrusted zone, used as the Internet by perimeter rules"""
+        return next((z for z in self.zones if z.trust_level == "untrusted"), None)
+
+    @derived(cost=1)
+    def internet_flows(self) -> tuple[FlowSnapshot, ...]:
+        """Flows leaving a component of the Internet zone"""
+        internet_zone = self.internet_zone
+        if not internet_zone:
+            return ()
+        return tuple(
+            flow
+            for source in self.components_by_zone.get(internet_zone.id, ())
+            for flow in self.outgoing.get(source.id, ())
+        )
+
+    @derived(cost=1, requires=("internet_flows",))
+    def internet_exposed_components(self) -> tuple[ComponentSnapshot, ...]:
+        """Distinct targets of Internet flows, in order of first exposure"""
+        exposed: dict[str, ComponentSnapshot] = {}
+        for flow in self.internet_flows:
+            target = self.components_by_id.get(flow.target_component_id)
+            if target:
+                exposed.setdefault(target.id, target)
+        return tuple(exposed.values())
+
+    @derived(cost=1)
+    def zone_matrix(self) -> ZoneMatrix:
+        """Flow counts, protocols and encryption/authentication per zone pair"""
+        return ZoneMatrix(self)
+
+    @derived(cost=0, requires=("zone_matrix",))
+    def zone_crossing_flows(self) -> tuple[FlowSnapshot, ...]:
+        """Flows whose endpoints both exist and sit in different zones, in flow order"""
+        return tuple(self.flows[i] for i in self.zone_matrix.crossing_positions())
+
+    @derived(cost=0)
+    def has_bastion(self) -> bool:
+        """Whether the architecture has at least one bastion host"""
+        return "bastion" in self.components_by_type
@@ -0,0 +1,349 @@
+"""
+SQL rule engine - rules pushed down to SQLite as INSERT ... SELECT
+
+Rules that are plain joins over zones, components and flows have a SQL
+translation here. `SqlRuleEngine.run` compiles them into SELECTs the caller
+stores with INSERT ... SELECT, so their findings go straight from SQLite
+into the findings table without being loaded into Python. Every other rule
+is still evaluated in Python on the snapshot. Translations are
+keyed by rule class, so a replaced or customised rule is never pushed down.
+`SqlRuleEngine.diff` runs both implementations to check that they agree.
+"""
+
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import String, and_, case, cast, func, literal, or_, select
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import Select
+
+from core.budget import AnalysisTimeout, Budget, active_budget
+from core.rule_engine import RULE_COMPLETED, RULE_PARTIAL, RULE_SKIPPED, EngineResult, RuleEngine, RuleStats
+from core.rules import Rule, RuleFinding, Severity
+from core.rules.data import DatabaseEncryptionAtRestRule, SensitiveFlowUnencryptedRule
+from core.rules.identity import AdminAccessWithoutMFARule, CriticalComponentWithoutAuthRule
+from core.rules.network import UncontrolledInterZoneFlowRule, UnencryptedCrossZoneFlowRule
+from core.rules.observability import CriticalComponentWithoutLoggingRule
+from core.snapshot import ArchitectureSnapshot
+from models.orm import Component, ComponentTypeEnum, Flow, FlowProtocolEnum, TrustLevelEnum, Zone
+
+
+# Columns of every compiled query, in RuleFinding field order
+FINDING_COLUMNS = (
+    "rule_id",
+    "rule_name",
+    "category",
+    "severity",
+    "title",
+    "description",
+    "impact",
+    "affected_component_id",
+    "affected_flow_id",
+)
+
+
+def _text(*parts):
+    """SQL string concatenation of literals and columns"""
+    expression = None
+    for part in parts:
+        part = literal(part) if isinstance(part, str) else part
+        expression = part if expression is None else expression + part
+    return expression
+
+
+def _finding_columns(
+    rule: Rule,
+    title,
+    description,
+    impact: str,
+    severity=None,
+    affected_component_id=None,
+    affected_flow_id=None,
+) -> list:
+    return [
+        literal(rule.id).label("rule_id"),
+        literal(rule.name).label("rule_name"),
+        literal(rule.category.value).label("category"),
+        (literal(rule.severity.value) if severity is None else severity).label("severity"),
+        title.label("title"),
+        description.label("description"),
+        literal(impact).label("impact"),
+        (affected_component_id if affected_component_id is not None else literal(None, String)).label(
+            "affected_component_id"
+        ),
+        (affected_flow_id if affected_flow_id is not None else literal(None, String)).label("affected_flow_id"),
+    ]
+
+
+def _component_types(*values: str) -> list[ComponentTypeEnum]:
+    return [ComponentTypeEnum(v) for v in values]
+
+
+def _trust_rank(zone):
+    # Compare through the column so enum members are bound as stored
+    return case(*[(zone.trust_level == level, rank) for rank, level in enumerate(TrustLevelEnum)])
+
+
+def _sec_001(rule: AdminAccessWithoutMFARule, architecture_id: str) -> Select:
+    return select(
+        *_finding_columns(
+            rule,
+            title=_text("Admin interface without MFA on ", Component.name),
+            description=_text("Component ", Component.name, " has administrative access without MFA requirement"),
+            impact="Risk of unauthorized access if credentials are compromised",
+            affected_component_id=Component.id,
+        )
+    ).where(
+        Component.architecture_id == architecture_id,
+        Component.has_admin_interface,
+        ~Component.requires_mfa,
+    )
+
+
+def _sec_002(rule: CriticalComponentWithoutAuthRule, architecture_id: str) -> Select:
+    unauthenticated = func.count(Flow.id)
+    return (
+        select(
+            *_finding_columns(
+                rule,
+                title=_text("Critical component ", Component.name, " accessible without authentication"),
+                description=_text(cast(unauthenticated, String), " unauthenticated flow(s) to critical component"),
+                impact="Unauthorized access to sensitive resources",
+                affected_component_id=Component.id,
+            )
+        )
+        .select_from(Component)
+        .join(
+            Flow,
+            and_(
+                Flow.target_component_id == Component.id,
+                Flow.architecture_id == architecture_id,
+                ~Flow.is_authenticated,
+            ),
+        )
+        .where(
+            Component.architecture_id == architecture_id,
+            Component.component_type.in_(_component_types(*rule.CRITICAL_TYPES)),
+        )
+        .group_by(Component.id)
+    )
+
+
+def _sec_005(rule: UncontrolledInterZoneFlowRule, architecture_id: str) -> Select:
+    source, target = aliased(Component), aliased(Component)
+    firewall = ComponentTypeEnum.FIREWALL
+    return (
+        select(
+            *_finding_columns(
+                rule,
+                title=_text("Uncontrolled flow between ", source.name, " and ", target.name),
+                description=literal("Inter-zone flow without explicit firewall control"),
+                impact="Lateral movement risk if one zone is compromised",
+                affected_flow_id=Flow.id,
+            )
+        )
+        .select_from(Flow)
+        .join(source, and_(source.id == Flow.source_component_id, source.architecture_id == architecture_id))
+        .join(target, and_(target.id == Flow.target_component_id, target.architecture_id == architecture_id))
+        .where(
+            Flow.architecture_id == architecture_id,
+            source.zone_id != target.zone_id,
+            source.component_type != firewall,
+            target.component_type != firewall,
+        )
+    )
+
+
+def _sec_007(rule: UnencryptedCrossZoneFlowRule, architecture_id: str) -> Select:
+    source, target = aliased(Component), aliased(Component)
+    source_zone, target_zone = aliased(Zone), aliased(Zone)
+    trust_diff = func.abs(_trust_rank(source_zone) - _trust_rank(target_zone))
+    return (
+        select(
+            *_finding_columns(
+                rule,
+                title=_text("Unencrypted flow between ", source_zone.name, " and ", target_zone.name),
+                description=_text(
+                    "Flow from ", source.name, " to ", target.name, " crosses trust boundaries without encryption"
+                ),
+                impact="Data exposure risk during transit",
+                severity=case((trust_diff >= 2, Severity.HIGH.value), else_=Severity.MEDIUM.value),
+                affected_flow_id=Flow.id,
+            )
+        )
+        .select_from(Flow)
+        .join(source, and_(source.id == Flow.source_component_id, source.architecture_id == architecture_id))
+        .join(target, and_(target.id == Flow.target_component_id, target.architecture_id == architecture_id))
+        .join(source_zone, and_(source_zone.id == source.zone_id, source_zone.architecture_id == architecture_id))
+        .join(target_zone, and_(target_zone.id == target.zone_id, target_zone.architecture_id == architecture_id))
+        .where(
+            Flow.architecture_id == architecture_id,
+            ~Flow.is_encrypted,
+            source_zone.id != target_zone.id,
+        )
+    )
+
+
+def _sec_011(rule: DatabaseEncryptionAtRestRule, architecture_id: str) -> Select:
+    return select(
+        *_finding_columns(
+            rule,
+            title=_text("Database ", Component.name, " without encryption at rest"),
+            description=literal("Database does not have encryption at rest enabled"),
+            impact="Data exposure risk if storage is compromised",
+            affected_component_id=Component.id,
+        )
+    ).where(
+        Component.architecture_id == architecture_id,
+        Component.component_type == ComponentTypeEnum.DATABASE,
+        ~Component.encryption_at_rest,
+    )
+
+
+def _sec_012(rule: SensitiveFlowUnencryptedRule, architecture_id: str) -> Select:
+    source, target = aliased(Component), aliased(Component)
+    protocols = [FlowProtocolEnum(p) for p in rule.SENSITIVE_PROTOCOLS]
+    protocol_name = case(*[(Flow.protocol == p, p.value) for p in protocols])
+    return (
+        select(
+            *_finding_columns(
+                rule,
+                title=_text("Unencrypted ", protocol_name, " flow between ", source.name, " and ", target.name),
+                description=literal("Potentially sensitive data transmitted without encryption"),
+                impact="Credential or data interception risk",
+                affected_flow_id=Flow.id,
+            )
+        )
+        .select_from(Flow)
+        .join(source, and_(source.id == Flow.source_component_id, source.architecture_id == architecture_id))
+        .join(target, and_(target.id == Flow.target_component_id, target.architecture_id == architecture_id))
+        .where(
+            Flow.architecture_id == architecture_id,
+            Flow.protocol.in_(protocols),
+            ~Flow.is_encrypted,
+        )
+    )
+
+
+def _sec_014(rule: CriticalComponentWithoutLoggingRule, architecture_id: str) -> Select:
+    return select(
+        *_finding_columns(
+            rule,
+            title=_text("No logging enabled on ", Component.name),
+            description=literal("Critical component without audit logging"),
+            impact="Blind spot for security monitoring and incident response",
+            affected_component_id=Component.id,
+        )
+    ).where(
+        Component.architecture_id == architecture_id,
+        ~Component.has_logging,
+        or_(
+            Component.component_type.in_(_component_types(*rule.CRITICAL_TYPES)),
+            Component.has_admin_interface,
+        ),
+    )
+
+
+SQL_RULES: dict[type, Callable[[Rule, str], Select]] = {
+    AdminAccessWithoutMFARule: _sec_001,
+    CriticalComponentWithoutAuthRule: _sec_002,
+    UncontrolledInterZoneFlowRule: _sec_005,
+    UnencryptedCrossZoneFlowRule: _sec_007,
+    DatabaseEncryptionAtRestRule: _sec_011,
+    SensitiveFlowUnencryptedRule: _sec_012,
+    CriticalComponentWithoutLoggingRule: _sec_014,
+}
+
+
+@dataclass
+class SqlEngineResult(EngineResult):
+    """Engine result plus the SELECTs of the rules pushed down to SQL"""
+    statements: dict[str, Select] = field(default_factory=dict)  # rule id -> compiled query
+
+
+class SqlRuleEngine:
+    """Pushes translatable rules down to SQL, evaluates the others in Python"""
+
+    def __init__(self, engine: RuleEngine):
+        self.engine = engine
+
+    def compile(self, rule: Rule, architecture_id: str) -> Optional[Select]:
+        """SELECT producing the rule's findings (FINDING_COLUMNS), or None if not translatable"""
+        translate = SQL_RULES.get(type(rule))
+        return translate(rule, architecture_id) if translate else None
+
+    def run(
+        self,
+        snapshot: ArchitectureSnapshot,
+        budget: Optional[Budget] = None,
+        on_finding: Optional[Callable[[RuleFinding], None]] = None,
+    ) -> SqlEngineResult:
+        """
+        Run every rule of the registry, without touching the database
+
+        Pushed-down rules are only compiled: their findings never show up in
+        the returned findings, the caller stores them by running
+        `statements` as INSERT ... SELECT, and records the inserted row count
+        (and time) in their stats.
+        """
+        findings: list[RuleFinding] = []
+        rule_status = {rule.id: RULE_SKIPPED for rule in self.engine.registry}
+        rule_stats: dict[str, RuleStats] = {}
+        statements: dict[str, Select] = {}
+
+        with active_budget(budget):
+            for rule in self.engine.registry.scheduled():
+                stats = RuleStats()
+                started = time.perf_counter()
+                try:
+                    if budget:
+                        budget.check()
+                    rule_status[rule.id] = RULE_PARTIAL
+                    rule_stats[rule.id] = stats
+                    stats.entities_scanned = RuleStats.scanned(rule, snapshot)
+                    statement = self.compile(rule, snapshot.architecture_id)
+                    if statement is not None:
+                        statements[rule.id] = statement
+                    else:
+                        for finding in rule.evaluate(snapshot):
+                            findings.append(finding)
+                            stats.findings += 1
+                            if on_finding:
+                                on_finding(finding)
+                            if budget:
+                                budget.check()
+                except AnalysisTimeout:
+                    break
+                finally:
+                    stats.duration_seconds = time.perf_counter() - started
+                rule_status[rule.id] = RULE_COMPLETED
+
+        return SqlEngineResult(findings, rule_status, rule_stats, statements)
+
+    def diff(
+        self,
+        snapshot: ArchitectureSnapshot,
+        fetch: Callable[[Select], Iterable[RuleFinding]],
+    ) -> dict[str, tuple[list[RuleFinding], list[RuleFinding]]]:
+        """
+        Compare SQL and Python results of every pushed-down rule
+
+        Returns:
+            rule id -> (findings only Python produced, findings only SQL produced),
+            for the rules whose results differ
+        """
+        mismatches = {}
+        for rule in self.engine.registry:
+            statement = self.compile(rule, snapshot.architecture_id)
+            if statement is None:
+                continue
+            expected = Counter(rule.evaluate(snapshot))
+            actual = Counter(fetch(statement))
+            if expected != actual:
+                mismatches[rule.id] = (
+                    list((expected - actual).elements()),
+                    list((actual - expected).elements()),
+                )
+        return mismatches
@@ -0,0 +1,89 @@
+"""
+Zone adjacency matrix - flows aggregated per (source zone, target zone)
+
+Built once per snapshot (`snapshot.zone_matrix`) in a single pass over the
+flows. Each cell counts the flows between two zones, their protocols and how
+many are encrypted or authenticated, and keeps the positions of those flows
+in `snapshot.flows`, so rules and the zone view read one compact structure
+instead of resolving both endpoint zones of every flow.
+"""
+
+from dataclasses import dataclass, field
+from heapq import merge
+from typing import TYPE_CHECKING, Iterator, Optional
+
+if TYPE_CHECKING:
+    from core.snapshot import ArchitectureSnapshot
+
+
+@dataclass
+class ZoneLink:
+    """Flows from one zone to another (or within a zone)"""
+    source_zone_id: str
+    target_zone_id: str
+    flow_positions: list[int] = field(default_factory=list)  # in `snapshot.flows` order
+    protocols: dict[str, int] = field(default_factory=dict)
+    encrypted: int = 0
+    authenticated: int = 0
+
+    @property
+    def flow_count(self) -> int:
+        return len(self.flow_positions)
+
+    @property
+    def crosses_zones(self) -> bool:
+        return self.source_zone_id != self.target_zone_id
+
+    @property
+    def encrypted_ratio(self) -> float:
+        return self.encrypted / self.flow_count
+
+    @property
+    def authenticated_ratio(self) -> float:
+        return self.authenticated / self.flow_count
+
+
+class ZoneMatrix:
+    """Sparse zone-by-zone adjacency matrix of one snapshot"""
+
+    def __init__(self, snapshot: "ArchitectureSnapshot"):
+        self.snapshot = snapshot
+        # (source zone id, target zone id) -> link, only for zone pairs with flows
+        self.links: dict[tuple[str, str], ZoneLink] = {}
+
+        zone_of = {c.id: c.zone_id for c in snapshot.components}
+        for position, flow in enumerate(snapshot.flows):
+            source = zone_of.get(flow.source_component_id)
+            target = zone_of.get(flow.target_component_id)
+            if source is None or target is None:
+                continue
+            link = self.links.get((source, target))
+            if link is None:
+                link = self.links[(source, target)] = ZoneLink(source, target)
+            link.flow_positions.append(position)
+            link.protocols[flow.protocol] = link.protocols.get(flow.protocol, 0) + 1
+            link.encrypted += flow.is_encrypted
+            link.authenticated += flow.is_authenticated
+
+    def link(self, source_zone_id: str, target_zone_id: str) -> Optional[ZoneLink]:
+        return self.links.get((source_zone_id, target_zone_id))
+
+    def outgoing(self, zone_id: str) -> list[ZoneLink]:
+        return [link for (source, _), link in self.links.items() if source == zone_id]
+
+    def crossing(self) -> list[ZoneLink]:
+        """Links between two different zones"""
+        return [link for link in self.links.values() if link.crosses_zones]
+
+    def crossing_positions(self) -> Iterator[int]:
+        """Positions of the zone-crossing flows, in `snapshot.flows` order"""
+        return merge(*(link.flow_positions for link in self.crossing()))
+
+    def counts(self) -> list[list[int]]:
+        """Dense flow counts, rows and columns in `snapshot.zones` order"""
+        index = {z.id: i for i, z in enumerate(self.snapshot.zones)}
+        counts = [[0] * len(index) for _ in index]
+        for (source, target), link in self.links.items():
+            if source in index and target in index:
+                counts[index[source]][index[target]] = link.flow_count
+        return counts
@@ -1,4 +1,24 @@
 """Database package"""
-from .connection import Base, get_db, init_db, SessionLocal
+from .connection import (
+    AsyncReadSessionLocal,
+    AsyncSessionLocal,
+    Base,
+    get_async_db,
+    get_db,
+    get_read_db,
+    init_db,
+    ReadSessionLocal,
+    SessionLocal,
+)
 
-__all__ = ["Base", "get_db", "init_db", "SessionLocal"]
+__all__ = [
+    "AsyncReadSessionLocal",
+    "AsyncSessionLocal",
+    "Base",
+    "get_async_db",
+    "get_db",
+    "get_read_db",
+    "init_db",
+    "ReadSessionLocal",
+    "SessionLocal",
+]
@@ -1,56 +1,216 @@
 """
 Database connection and session management
+
+File databases run in WAL mode with two engines: a pool of read-only
+connections for read requests, and a single writer connection. SQLite only
+ever lets one transaction write, so writers queue on the writer pool instead
+of failing with "database is locked", while readers keep reading the last
+committed state without waiting for them. In-memory databases only exist
+inside one connection: reads and writes then share it.
+
+Every engine exists twice: a sync one (pysqlite) for sync routes, analysis
+jobs and the CLI, and an async one (aiosqlite) for `async def` routes, which
+then wait for SQLite without holding a threadpool thread. Each stack has its
+own writer, so there are two: SQLite serializes them. Writer transactions
+start with BEGIN IMMEDIATE: they take the database write lock upfront
+(waiting up to busy_timeout) instead of failing when a transaction that
+started by reading tries to write after the other writer committed. Write
+transactions are kept short (analyses never hold one while their rules run),
+so waiting for the other writer stays well under busy_timeout.
 """
 
-from sqlalchemy import create_engine
+from pathlib import Path
+
+from fastapi import Request
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
 
 from config import get_settings
 
 settings = get_settings()
 
-# Create SQLite engine
-# Using StaticPool for SQLite to handle concurrent access
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
+# HTTP methods served by a read-only session
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+# Revision matching the schema create_all produced before migrations existed
+BASELINE_REVISION = "0001"
+
+
+def _set_pragmas(query_only: bool = False):
+    """Connect hook applying the journal and cache pragmas to every new connection"""
+
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        # Safe in WAL mode: a power loss can only lose the last commits, never corrupt
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.database_busy_timeout * 1000)}")
+        cursor.execute(f"PRAGMA cache_size=-{settings.database_cache_size_kib}")
+        cursor.execute(f"PRAGMA mmap_size={settings.database_mmap_size}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        if query_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+    return on_connect
+
+
+def _begin_immediate(writer: Engine) -> None:
+    """Make the writer's transactions take the write lock when they begin"""
+
+    @event.listens_for(writer, "connect")
+    def disable_driver_transactions(dbapi_connection, connection_record):
+        # The driver would otherwise issue its own deferred BEGIN before the first write
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(writer, "begin")
+    def begin_immediate(connection):
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+if ":memory:" in settings.database_url:
+    # A plain :memory: database is private to its connection: use a named
+    # shared-cache one, so that the sync and async engines see the same data
+    url = make_url("sqlite:///file:blackmane?mode=memory&cache=shared&uri=true")
+    engine = create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    read_engine = engine
+    async_engine = create_async_engine(url.set(drivername="sqlite+aiosqlite"), poolclass=StaticPool)
+    async_read_engine = async_engine
+else:
+    # Single writer: sessions wait (up to busy_timeout) for the connection to come back
+    engine = create_engine(
+        settings.database_url,
+        connect_args={"check_same_thread": False, "timeout": settings.database_busy_timeout},
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.database_busy_timeout,
+    )
+    event.listen(engine, "connect", _set_pragmas())
+    _begin_immediate(engine)
+
+    read_engine = create_engine(
+        settings.database_url,
+        connect_args={"check_same_thread": False, "timeout": settings.database_busy_timeout},
+        pool_size=settings.database_read_pool_size,
+        max_overflow=settings.database_read_pool_size,
+        pool_timeout=settings.database_busy_timeout,
+    )
+    event.listen(read_engine, "connect", _set_pragmas(query_only=True))
+
+    async_url = make_url(settings.database_url).set(drivername="sqlite+aiosqlite")
+    async_engine = create_async_engine(
+        async_url,
+        connect_args={"timeout": settings.database_busy_timeout},
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.database_busy_timeout,
+    )
+    event.listen(async_engine.sync_engine, "connect", _set_pragmas())
+    _begin_immediate(async_engine.sync_engine)
+
+    async_read_engine = create_async_engine(
+        async_url,
+        connect_args={"timeout": settings.database_busy_timeout},
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=settings.database_read_pool_size,
+        max_overflow=settings.database_read_pool_size,
+        pool_timeout=settings.database_busy_timeout,
+    )
+    event.listen(async_read_engine.sync_engine, "connect", _set_pragmas(query_only=True))
 
-# Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Session factories. Writers commit once per unit of work (see database/unit_of_work.py),
+# when the caller already holds every value it returns: nothing to reload after it
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False)
 
 # Base class for ORM models
 Base = declarative_base()
 
 
-def get_db():
+def get_db(request: Request):
     """
     Dependency for FastAPI to get database session
 
+    GET/HEAD/OPTIONS requests get a read-only session from the reader pool,
+    every other method a session on the single writer connection. That one
+    is the request's unit of work: repositories only flush, and routes of
+    routers built with `UnitOfWorkRoute` commit it once the endpoint returns.
+
     Usage in routes:
         @app.get("/items")
         def get_items(db: Session = Depends(get_db)):
             ...
     """
-    db = SessionLocal()
+    if request.method in READ_METHODS:
+        db = ReadSessionLocal()
+    else:
+        db = SessionLocal()
+        request.state.db = db
     try:
         yield db
     finally:
         db.close()
 
 
+def get_read_db():
+    """
+    Dependency for routes that only read, whatever their HTTP method
+
+    E.g. a POST computing a result from stored data without storing
+    anything: a `get_db` writer session would hold the write lock for the
+    whole computation.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db(request: Request):
+    """
+    Dependency for `async def` routes: `get_db` on the aiosqlite engines
+
+    Sync services run on the session through `AsyncService` (see
+    services/async_service.py).
+    """
+    if request.method in READ_METHODS:
+        db = AsyncReadSessionLocal()
+    else:
+        db = AsyncSessionLocal()
+        request.state.db = db
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def dispose_async_engines():
+    """Close the aiosqlite connections (each runs in its own thread) on shutdown"""
+    await async_engine.dispose()
+    await async_read_engine.dispose()
+
+
 def init_db():
-    """Initialize database schema"""
-    # Import all ORM models here to ensure they're registered
-    from models.orm import (
-        Project, Architecture, Zone, Component, Flow,
-        Analysis, Finding, Recommendation, MaturityAssessment
-    )
+    """Initialize database schema: upgrade to the latest Alembic migration"""
+    from alembic import command
+    from alembic.config import Config
 
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
+    config = Config(str(ALEMBIC_INI))
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        tables = inspect(connection).get_table_names()
+        if "projects" in tables and "alembic_version" not in tables:
+            # Created by create_all before migrations: already at the baseline schema
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, "head")
     print("Database initialized successfully")
 
 
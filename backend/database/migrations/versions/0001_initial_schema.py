@@ -0,0 +1,187 @@
+"""Initial schema, as created by Base.metadata.create_all before migrations
+
+Databases created before migrations existed already have these tables:
+init_db() stamps them at this revision instead of running it.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _created_at() -> sa.Column:
+    return sa.Column("created_at", sa.DateTime(), nullable=False)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "projects",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("name", sa.String(200), nullable=False),
+        sa.Column("project_type", sa.Enum("CLOUD", "ON_PREMISE", "HYBRID", name="projecttypeenum"), nullable=False),
+        sa.Column("business_context", sa.Text(), nullable=True),
+        sa.Column(
+            "criticality_level",
+            sa.Enum("LOW", "MEDIUM", "HIGH", "CRITICAL", name="criticalitylevelenum"),
+            nullable=False,
+        ),
+        _created_at(),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_table(
+        "analyses",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("project_id", sa.String(36), sa.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=False),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.Column("global_risk_score", sa.Float(), nullable=True),
+        sa.Column("total_findings", sa.Integer(), nullable=False),
+        sa.Column("critical_findings", sa.Integer(), nullable=False),
+        sa.Column("high_findings", sa.Integer(), nullable=False),
+        sa.Column("medium_findings", sa.Integer(), nullable=False),
+        sa.Column("low_findings", sa.Integer(), nullable=False),
+    )
+    op.create_table(
+        "architectures",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column(
+            "project_id",
+            sa.String(36),
+            sa.ForeignKey("projects.id", ondelete="CASCADE"),
+            nullable=False,
+            unique=True,
+        ),
+        sa.Column("description", sa.Text(), nullable=True),
+        _created_at(),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_table(
+        "maturity_assessments",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("analysis_id", sa.String(36), sa.ForeignKey("analyses.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("domain", sa.String(50), nullable=False),
+        sa.Column("maturity_level", sa.Integer(), nullable=False),
+        sa.Column("score_percentage", sa.Float(), nullable=False),
+        sa.Column("total_rules", sa.Integer(), nullable=False),
+        sa.Column("passed_rules", sa.Integer(), nullable=False),
+        _created_at(),
+    )
+    op.create_table(
+        "zones",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column(
+            "architecture_id", sa.String(36), sa.ForeignKey("architectures.id", ondelete="CASCADE"), nullable=False
+        ),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column(
+            "trust_level", sa.Enum("UNTRUSTED", "LOW", "MEDIUM", "HIGH", name="trustlevelenum"), nullable=False
+        ),
+        sa.Column("description", sa.Text(), nullable=True),
+        _created_at(),
+    )
+    op.create_table(
+        "components",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column(
+            "architecture_id", sa.String(36), sa.ForeignKey("architectures.id", ondelete="CASCADE"), nullable=False
+        ),
+        sa.Column("zone_id", sa.String(36), sa.ForeignKey("zones.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column(
+            "component_type",
+            sa.Enum(
+                "FIREWALL", "LOAD_BALANCER", "SERVER", "DATABASE", "IAM", "BASTION", "API_GATEWAY", "VPN", "OTHER",
+                name="componenttypeenum",
+            ),
+            nullable=False,
+        ),
+        sa.Column("has_admin_interface", sa.Boolean(), nullable=False),
+        sa.Column("requires_mfa", sa.Boolean(), nullable=False),
+        sa.Column("has_logging", sa.Boolean(), nullable=False),
+        sa.Column("encryption_at_rest", sa.Boolean(), nullable=False),
+        sa.Column("encryption_in_transit", sa.Boolean(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        _created_at(),
+    )
+    op.create_table(
+        "flows",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column(
+            "architecture_id", sa.String(36), sa.ForeignKey("architectures.id", ondelete="CASCADE"), nullable=False
+        ),
+        sa.Column(
+            "source_component_id", sa.String(36), sa.ForeignKey("components.id", ondelete="CASCADE"), nullable=False
+        ),
+        sa.Column(
+            "target_component_id", sa.String(36), sa.ForeignKey("components.id", ondelete="CASCADE"), nullable=False
+        ),
+        sa.Column(
+            "protocol",
+            sa.Enum("HTTP", "HTTPS", "SSH", "RDP", "SQL", "LDAP", "DNS", "SMTP", "OTHER", name="flowprotocolenum"),
+            nullable=False,
+        ),
+        sa.Column("port", sa.Integer(), nullable=True),
+        sa.Column("is_authenticated", sa.Boolean(), nullable=False),
+        sa.Column("is_encrypted", sa.Boolean(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        _created_at(),
+    )
+    op.create_table(
+        "findings",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("analysis_id", sa.String(36), sa.ForeignKey("analyses.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("rule_id", sa.String(50), nullable=False),
+        sa.Column("rule_name", sa.String(200), nullable=False),
+        sa.Column("category", sa.String(50), nullable=False),
+        sa.Column("severity", sa.String(20), nullable=False),
+        sa.Column("title", sa.String(500), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("impact", sa.Text(), nullable=False),
+        sa.Column(
+            "affected_component_id",
+            sa.String(36),
+            sa.ForeignKey("components.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+        sa.Column("affected_flow_id", sa.String(36), sa.ForeignKey("flows.id", ondelete="SET NULL"), nullable=True),
+        _created_at(),
+    )
+    op.create_table(
+        "recommendations",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("finding_id", sa.String(36), sa.ForeignKey("findings.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("domain", sa.String(50), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("actions", sa.Text(), nullable=False),
+        sa.Column("priority", sa.String(20), nullable=False),
+        sa.Column("effort", sa.String(20), nullable=False),
+        sa.Column("security_gain", sa.String(20), nullable=False),
+        sa.Column("priority_score", sa.Float(), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        _created_at(),
+    )
+
+
+def downgrade() -> None:
+    for table in (
+        "recommendations",
+        "findings",
+        "flows",
+        "components",
+        "zones",
+        "maturity_assessments",
+        "architectures",
+        "analyses",
+        "projects",
+    ):
+        op.drop_table(table)
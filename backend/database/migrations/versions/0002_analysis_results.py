@@ -0,0 +1,59 @@
+"""Analysis results: result cache key, rule completion and rule profiles
+
+`analyses.content_hash` (result cache), `analyses.rule_completion` (rules
+cut short by the time budget), `analyses.rule_set_version` (incremental
+analysis) and the `rule_profiles` table. Databases created between these
+features and the migrations may already have some of them, added by hand:
+only the missing ones are created.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+ANALYSIS_COLUMNS = {
+    "content_hash": sa.String(64),
+    "rule_completion": sa.Text(),
+    "rule_set_version": sa.String(64),
+}
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    existing = {column["name"] for column in inspector.get_columns("analyses")}
+    missing = [name for name in ANALYSIS_COLUMNS if name not in existing]
+    if missing:
+        with op.batch_alter_table("analyses") as batch:
+            for name in missing:
+                batch.add_column(sa.Column(name, ANALYSIS_COLUMNS[name], nullable=True))
+
+    if "rule_profiles" not in inspector.get_table_names():
+        op.create_table(
+            "rule_profiles",
+            sa.Column("id", sa.String(36), primary_key=True),
+            sa.Column(
+                "analysis_id", sa.String(36), sa.ForeignKey("analyses.id", ondelete="CASCADE"), nullable=False
+            ),
+            sa.Column("rule_id", sa.String(50), nullable=False),
+            sa.Column("duration_seconds", sa.Float(), nullable=False),
+            sa.Column("entities_scanned", sa.Integer(), nullable=False),
+            sa.Column("findings", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("rule_profiles")
+    with op.batch_alter_table("analyses") as batch:
+        for name in reversed(list(ANALYSIS_COLUMNS)):
+            batch.drop_column(name)
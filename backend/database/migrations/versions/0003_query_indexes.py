@@ -0,0 +1,46 @@
+"""Indexes for the hot query paths
+
+Foreign keys every repository filters on, the latest-analysis lookup
+(project_id, started_at), the result cache lookup (project_id,
+content_hash) and findings by analysis and rule. `python cli.py
+check-query-plans` fails if one of these queries falls back to a full scan.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = {
+    "ix_zones_architecture_id": ("zones", ["architecture_id"]),
+    "ix_components_architecture_id": ("components", ["architecture_id"]),
+    "ix_components_zone_id": ("components", ["zone_id"]),
+    "ix_flows_architecture_id": ("flows", ["architecture_id"]),
+    "ix_flows_source_component_id": ("flows", ["source_component_id"]),
+    "ix_flows_target_component_id": ("flows", ["target_component_id"]),
+    "ix_analyses_project_started": ("analyses", ["project_id", "started_at"]),
+    "ix_analyses_project_hash": ("analyses", ["project_id", "content_hash"]),
+    "ix_analyses_status": ("analyses", ["status"]),
+    "ix_findings_analysis_rule": ("findings", ["analysis_id", "rule_id"]),
+    "ix_rule_profiles_analysis_id": ("rule_profiles", ["analysis_id"]),
+    "ix_recommendations_finding_id": ("recommendations", ["finding_id"]),
+    "ix_maturity_assessments_analysis_id": ("maturity_assessments", ["analysis_id"]),
+}
+
+
+def upgrade() -> None:
+    for name, (table, columns) in INDEXES.items():
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, (table, _) in INDEXES.items():
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,61 @@
+"""
+Query guard - count the SELECTs issued on a session
+
+Loading an architecture takes a fixed number of queries. A lazy relationship
+walked once per entity (N+1) instead issues one query per component or flow,
+which goes unnoticed on small architectures. `count_selects` counts every
+ORM-level SELECT of one session, lazy loads and `Session.get` misses
+included, and raises `QueryBudgetExceeded` at the first one over the limit,
+with the offending statement in the message. Other sessions (concurrent
+requests, other threads) are not counted.
+"""
+
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """A session issued more SELECTs than its budget"""
+
+
+class SelectCounter:
+    """`do_orm_execute` listener recording SELECT statements"""
+
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __call__(self, state: ORMExecuteState) -> None:
+        if not state.is_select:
+            return
+        self.statements.append(str(state.statement))
+        if self.limit is not None and self.count > self.limit:
+            limit, self.limit = self.limit, None  # raise once: error handling may still query
+            raise QueryBudgetExceeded(
+                f"{self.count} SELECTs issued, budget is {limit}; last one: {self.statements[-1].splitlines()[0]}"
+            )
+
+
+@contextmanager
+def count_selects(db: Session, limit: Optional[int] = None) -> Iterator[SelectCounter]:
+    """
+    Count the SELECTs issued on `db` inside the block
+
+    Usage:
+        with count_selects(db, limit=8) as counter:
+            ...
+        print(counter.count, counter.statements)
+    """
+    counter = SelectCounter(limit)
+    event.listen(db, "do_orm_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(db, "do_orm_execute", counter)
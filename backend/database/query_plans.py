@@ -0,0 +1,72 @@
+"""
+Query plan check - hot queries must use an index, never scan a whole table
+
+Each entry mirrors a repository query on a hot path. `check_query_plans`
+runs EXPLAIN QUERY PLAN on every one and reports the plan steps that read a
+table without an index ("SCAN <table>"), which is how a missing or unusable
+index shows up. Run it with `python cli.py check-query-plans`.
+"""
+
+from typing import Callable
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import Select
+
+from models.orm import Analysis, Component, Finding, Flow, RuleProfile, Zone
+
+
+# Bound to sample values: the plan only depends on the shape of the query
+ID = "00000000-0000-0000-0000-000000000000"
+
+HOT_QUERIES: dict[str, Callable[[], Select]] = {
+    "zones of an architecture": lambda: select(Zone).where(Zone.architecture_id == ID),
+    "components of an architecture": lambda: select(Component).where(Component.architecture_id == ID),
+    "components of a zone": lambda: select(func.count(Component.id)).where(Component.zone_id == ID),
+    "flows of an architecture": lambda: select(Flow).where(Flow.architecture_id == ID),
+    "flows of a component": lambda: select(Flow).where(
+        or_(Flow.source_component_id == ID, Flow.target_component_id == ID)
+    ),
+    "latest analysis of a project": lambda: (
+        select(Analysis).where(Analysis.project_id == ID).order_by(Analysis.started_at.desc()).limit(1)
+    ),
+    "cached analysis by content hash": lambda: (
+        select(Analysis)
+        .where(Analysis.project_id == ID, Analysis.content_hash == ID, Analysis.status == "completed")
+        .order_by(Analysis.started_at.desc())
+        .limit(1)
+    ),
+    "unfinished analyses": lambda: select(Analysis.id).where(Analysis.status.in_(("pending", "running"))),
+    "findings of an analysis": lambda: select(Finding).where(Finding.analysis_id == ID),
+    "findings of an analysis by rule": lambda: select(Finding).where(
+        Finding.analysis_id == ID, Finding.rule_id.in_(("SEC-001", "SEC-002"))
+    ),
+    "severity counts of an analysis": lambda: (
+        select(Finding.severity, func.count(Finding.id)).where(Finding.analysis_id == ID).group_by(Finding.severity)
+    ),
+    "rule profiles of an analysis": lambda: select(RuleProfile).where(RuleProfile.analysis_id == ID),
+}
+
+
+def explain(connection: Connection, statement: Select) -> list[str]:
+    """EXPLAIN QUERY PLAN steps of a statement"""
+    sql = statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True})
+    return [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def full_scans(plan: list[str]) -> list[str]:
+    """Plan steps reading a whole table ("SCAN t"; "SCAN t USING INDEX ..." only walks an index)"""
+    return [step for step in plan if step.startswith("SCAN ") and "INDEX" not in step]
+
+
+def check_query_plans(connection: Connection) -> dict[str, list[str]]:
+    """
+    Returns:
+        Query name -> its full plan, for every hot query that scans a table
+    """
+    regressions = {}
+    for name, build in HOT_QUERIES.items():
+        plan = explain(connection, build())
+        if full_scans(plan):
+            regressions[name] = plan
+    return regressions
@@ -0,0 +1,64 @@
+"""
+Unit of work - one transaction per request
+
+Repositories only flush: their writes join the session's transaction and are
+committed once by whoever owns the session. For API requests that is
+`UnitOfWorkRoute`, which commits the session `get_db` opened once the
+endpoint has returned and before the response is sent, so a client never
+sees a success that was not stored; an endpoint that raises commits nothing.
+Background work (analysis jobs, portfolio workers, the CLI) opens its own
+session and commits it itself.
+
+Side effects that must only happen once the data is stored (e.g. marking
+entities dirty for incremental analysis) are deferred with `after_commit`,
+and dropped if the transaction is rolled back.
+"""
+
+from functools import partial
+from typing import Any, Callable, Coroutine
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+# Session.info key of the callbacks waiting for the commit
+_PENDING = "after_commit"
+
+
+def after_commit(db: Session, callback: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+    """Call `callback(*args, **kwargs)` once the session's current transaction is committed"""
+    db.info.setdefault(_PENDING, []).append(partial(callback, *args, **kwargs))
+
+
+@event.listens_for(Session, "after_commit")
+def _run_pending(session: Session) -> None:
+    for callback in session.info.pop(_PENDING, ()):
+        callback()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_pending(session: Session, transaction: SessionTransaction) -> None:
+    # Still there at the end of the outermost transaction: it was rolled back
+    if transaction.parent is None:
+        session.info.pop(_PENDING, None)
+
+
+class UnitOfWorkRoute(APIRoute):
+    """Route committing the request's session (see `get_db`, `get_async_db`) once the endpoint has returned"""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def commit_after(request: Request) -> Response:
+            response = await handler(request)
+            db = getattr(request.state, "db", None)
+            if isinstance(db, AsyncSession):
+                await db.commit()
+            elif db is not None:
+                await run_in_threadpool(db.commit)
+            return response
+
+        return commit_after
@@ -9,10 +9,15 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 
 # API routers imports
-from api.v1 import projects, architectures, zones, components, flows, analyses
+from api.v1 import projects, architectures, zones, components, flows, analyses, rules, graph, simulations
+from api import metrics
 # Other routers (to be implemented during MVP development)
 # from api.v1 import analyses, recommendations, maturity, roadmap
-from database.connection import init_db
+from database.connection import dispose_async_engines, init_db, SessionLocal
+from core.job_queue import get_job_queue
+from core.rule_engine import get_rule_engine
+from core.rule_reload import get_rule_pack_watcher
+from repositories.analysis_repository import AnalysisRepository
 
 app = FastAPI(
     title="BLACKMANE API",
@@ -57,6 +62,33 @@ async def startup_event():
     """Initialize database on startup"""
     init_db()
 
+    # Analyses queued by a previous process will never run
+    db = SessionLocal()
+    try:
+        repository = AnalysisRepository(db)
+        repository.fail_unfinished()
+        repository.commit()
+    finally:
+        db.close()
+
+    # Compile the rule set now: an invalid rule pack fails startup, not the first analysis
+    get_rule_engine()
+    watcher = get_rule_pack_watcher()
+    if watcher:
+        watcher.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background analysis workers and the rule pack watcher, close async connections"""
+    get_job_queue().shutdown()
+    get_job_queue.cache_clear()
+    await dispose_async_engines()
+    watcher = get_rule_pack_watcher()
+    if watcher:
+        watcher.stop()
+    get_rule_pack_watcher.cache_clear()
+
 
 @app.get("/")
 async def root():
@@ -75,6 +107,7 @@ async def health():
 
 
 # Include API routers
+app.include_router(metrics.router, tags=["Monitoring"])
 app.include_router(projects.router, prefix="/api/v1", tags=["Projects"])
 app.include_router(architectures.router, prefix="/api/v1", tags=["Architectures"])
 app.include_router(zones.router, prefix="/api/v1", tags=["Zones"])
@@ -83,6 +116,9 @@ app.include_router(flows.router, prefix="/api/v1", tags=["Flows"])
 
 # Other routers (to be implemented)
 app.include_router(analyses.router, prefix="/api/v1", tags=["Analyses"])
+app.include_router(rules.router, prefix="/api/v1", tags=["Rules"])
+app.include_router(graph.router, prefix="/api/v1", tags=["Graph"])
+app.include_router(simulations.router, prefix="/api/v1", tags=["Simulation"])
 # app.include_router(recommendations.router, prefix="/api/v1", tags=["recommendations"])
 # app.include_router(maturity.router, prefix="/api/v1", tags=["maturity"])
 # app.include_router(roadmap.router, prefix="/api/v1", tags=["roadmap"])
@@ -2,9 +2,10 @@
 Pydantic models for Analysis and Finding entities
 """
 
+import json
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 class Finding(BaseModel):
@@ -33,6 +34,25 @@ class FindingList(BaseModel):
     total: int
 
 
+class FindingEvent(BaseModel):
+    """Schema for one finding in a findings stream (id set once stored)"""
+    analysis_id: str
+    rule_id: str
+    rule_name: str
+    category: str
+    severity: str
+    title: str
+    description: str
+    impact: str
+    affected_component_id: Optional[str] = None
+    affected_flow_id: Optional[str] = None
+    id: Optional[str] = None
+
+    model_config = {
+        "from_attributes": True,
+    }
+
+
 class Analysis(BaseModel):
     """Schema for analysis response"""
     id: str
@@ -46,7 +66,69 @@ class Analysis(BaseModel):
     high_findings: int = Field(0, ge=0)
     medium_findings: int = Field(0, ge=0)
     low_findings: int = Field(0, ge=0)
+    content_hash: Optional[str] = None
+    rule_completion: Optional[dict[str, str]] = None
+    rule_set_version: Optional[str] = None
+
+    model_config = {
+        "from_attributes": True,
+    }
+
+    @field_validator("rule_completion", mode="before")
+    @classmethod
+    def parse_rule_completion(cls, value):
+        """Stored as JSON text in the database"""
+        if isinstance(value, str):
+            return json.loads(value)
+        return value
+
+
+class RuleProfile(BaseModel):
+    """Schema for the cost of one rule in one analysis"""
+    rule_id: str
+    duration_seconds: float
+    entities_scanned: int
+    findings: int
 
     model_config = {
         "from_attributes": True,
     }
+
+
+class AnalysisProfile(BaseModel):
+    """Schema for per-rule profiling of an analysis, most expensive rule first"""
+    analysis_id: str
+    total_duration_seconds: float
+    rules: list[RuleProfile]
+
+
+class PortfolioAnalysisRequest(BaseModel):
+    """Schema for a batch analysis over many projects (always full analyses, see `analyze_project`)"""
+    project_ids: Optional[list[str]] = Field(None, description="Projects to analyze (default: all projects)")
+    workers: Optional[int] = Field(None, ge=1, le=64, description="Worker processes (default: CPU count)")
+
+
+class ProjectAnalysisOutcome(BaseModel):
+    """Result of analyzing one project inside a batch"""
+    project_id: str
+    status: str  # completed, skipped, failed
+    analysis_id: Optional[str] = None
+    total_findings: int = 0
+    duration_seconds: float = 0.0
+    error: Optional[str] = None
+
+
+class PortfolioAnalysis(BaseModel):
+    """Schema for batch analysis progress and aggregate throughput"""
+    id: str
+    status: str  # running, completed, cancelled, failed
+    started_at: datetime
+    completed_at: Optional[datetime] = None
+    total_projects: int = Field(0, ge=0)
+    completed_projects: int = Field(0, ge=0)
+    skipped_projects: int = Field(0, ge=0)
+    failed_projects: int = Field(0, ge=0)
+    total_findings: int = Field(0, ge=0)
+    elapsed_seconds: float = 0.0
+    projects_per_second: float = 0.0
+    outcomes: list[ProjectAnalysisOutcome] = []
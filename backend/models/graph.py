@@ -0,0 +1,95 @@
+"""
+Pydantic schemas for graph analyses of an architecture
+"""
+
+from pydantic import BaseModel, Field
+
+
+class AttackPath(BaseModel):
+    """Schema for one path from an entry point to a target component"""
+    entry_component_id: str
+    target_component_id: str
+    hops: int = Field(..., ge=0)
+    component_ids: list[str]  # entry first, target last
+    flow_ids: list[str]  # one per hop
+
+
+class AttackPathReport(BaseModel):
+    """Schema for attack paths from untrusted zones to one component type"""
+    architecture_id: str
+    target_type: str
+    entry_points: list[str]  # components of untrusted zones
+    reachable_targets: list[str]
+    total: int  # paths before `limit`
+    paths: list[AttackPath]
+
+
+class RankedAttackPath(AttackPath):
+    """Schema for an attack path with its control-aware cost"""
+    cost: float = Field(..., ge=0)
+
+
+class RankedAttackPathReport(BaseModel):
+    """Schema for the k cheapest attack paths between two zones"""
+    architecture_id: str
+    source_zone_id: str
+    target_zone_id: str
+    k: int
+    paths: list[RankedAttackPath]  # cheapest first
+
+
+class BlastRadius(BaseModel):
+    """Schema for what an attacker reaches from one compromised component"""
+    component_id: str
+    reachable_components: int = Field(..., ge=0)
+    reachable_zones: int = Field(..., ge=0)
+    component_ids: list[str]  # reachable through flows, the component itself excluded
+    zone_ids: list[str]  # zone of the component and of every reachable component
+
+
+class BlastRadiusReport(BaseModel):
+    """Schema for the blast radius of every component of an architecture"""
+    architecture_id: str
+    total: int
+    components: list[BlastRadius]  # largest blast radius first
+
+
+class ComponentGroup(BaseModel):
+    """Schema for components reaching each other through flows (a strongly connected component)"""
+    component_ids: list[str]
+    zone_ids: list[str]
+    flow_ids: list[str]  # flows between members of the group
+
+
+class BidirectionalPair(BaseModel):
+    """Schema for two components with flows in both directions"""
+    component_ids: list[str]  # direction of the earliest flow
+    flow_ids: list[str]  # one flow per direction (a single one for a flow to itself)
+
+
+class CycleReport(BaseModel):
+    """Schema for the cycles of an architecture's flow graph"""
+    architecture_id: str
+    groups: list[ComponentGroup]  # largest first
+    bidirectional: list[BidirectionalPair]
+
+
+class ZoneLinkInfo(BaseModel):
+    """Schema for the flows from one zone to another"""
+    source_zone_id: str
+    target_zone_id: str
+    crosses_trust_boundary: bool  # zones of different trust levels
+    flow_count: int = Field(..., ge=1)
+    protocols: dict[str, int]
+    encrypted_ratio: float = Field(..., ge=0, le=1)
+    authenticated_ratio: float = Field(..., ge=0, le=1)
+    flow_ids: list[str]
+
+
+class ZoneMatrixReport(BaseModel):
+    """Schema for the zone-by-zone adjacency matrix of an architecture"""
+    architecture_id: str
+    zone_ids: list[str]  # row and column order of `flow_counts`
+    flow_counts: list[list[int]]  # flow_counts[i][j]: flows from zone i to zone j
+    crossing_flows: int  # flows between two different zones
+    links: list[ZoneLinkInfo]  # zone pairs with at least one flow
@@ -2,10 +2,15 @@
 SQLAlchemy ORM Models for BLACKMANE
 
 Database models for all entities
+
+Indexes cover the hot access paths (entities of an architecture, flows of a
+component, findings of an analysis, latest analysis of a project). Schema
+changes ship as Alembic migrations in database/migrations: any change here
+needs a new revision.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, String, Text, Integer, Boolean, Float, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Text, Integer, Boolean, Float, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 import enum
 
@@ -95,6 +100,9 @@ class Architecture(Base):
 class Zone(Base):
     """Zone model - trust zones in the architecture"""
     __tablename__ = "zones"
+    __table_args__ = (
+        Index("ix_zones_architecture_id", "architecture_id"),
+    )
 
     id = Column(String(36), primary_key=True)
     architecture_id = Column(String(36), ForeignKey("architectures.id", ondelete="CASCADE"), nullable=False)
@@ -111,6 +119,10 @@ class Zone(Base):
 class Component(Base):
     """Component model - components in the architecture"""
     __tablename__ = "components"
+    __table_args__ = (
+        Index("ix_components_architecture_id", "architecture_id"),
+        Index("ix_components_zone_id", "zone_id"),
+    )
 
     id = Column(String(36), primary_key=True)
     architecture_id = Column(String(36), ForeignKey("architectures.id", ondelete="CASCADE"), nullable=False)
@@ -135,6 +147,11 @@ class Component(Base):
 class Flow(Base):
     """Flow model - data flows between components"""
     __tablename__ = "flows"
+    __table_args__ = (
+        Index("ix_flows_architecture_id", "architecture_id"),
+        Index("ix_flows_source_component_id", "source_component_id"),
+        Index("ix_flows_target_component_id", "target_component_id"),
+    )
 
     id = Column(String(36), primary_key=True)
     architecture_id = Column(String(36), ForeignKey("architectures.id", ondelete="CASCADE"), nullable=False)
@@ -156,10 +173,15 @@ class Flow(Base):
 class Analysis(Base):
     """Analysis model - security analysis results"""
     __tablename__ = "analyses"
+    __table_args__ = (
+        Index("ix_analyses_project_started", "project_id", "started_at"),  # latest analysis of a project
+        Index("ix_analyses_project_hash", "project_id", "content_hash"),  # result cache lookup
+        Index("ix_analyses_status", "status"),
+    )
 
     id = Column(String(36), primary_key=True)
     project_id = Column(String(36), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
-    status = Column(String(20), nullable=False, default="pending")  # pending, running, completed, failed
+    status = Column(String(20), nullable=False, default="pending")  # pending, running, completed, timed_out, failed, cancelled
     started_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     completed_at = Column(DateTime, nullable=True)
     global_risk_score = Column(Float, nullable=True)
@@ -168,16 +190,23 @@ class Analysis(Base):
     high_findings = Column(Integer, nullable=False, default=0)
     medium_findings = Column(Integer, nullable=False, default=0)
     low_findings = Column(Integer, nullable=False, default=0)
+    content_hash = Column(String(64), nullable=True)  # architecture content + rule-set version
+    rule_completion = Column(Text, nullable=True)  # JSON object: rule id -> completed, partial, skipped
+    rule_set_version = Column(String(64), nullable=True)  # RuleRegistry.version the analysis ran with
 
     # Relationships
     project = relationship("Project", back_populates="analyses")
     findings = relationship("Finding", back_populates="analysis", cascade="all, delete-orphan")
+    rule_profiles = relationship("RuleProfile", back_populates="analysis", cascade="all, delete-orphan")
     maturity_assessments = relationship("MaturityAssessment", back_populates="analysis", cascade="all, delete-orphan")
 
 
 class Finding(Base):
     """Finding model - security issues detected"""
     __tablename__ = "findings"
+    __table_args__ = (
+        Index("ix_findings_analysis_rule", "analysis_id", "rule_id"),
+    )
 
     id = Column(String(36), primary_key=True)
     analysis_id = Column(String(36), ForeignKey("analyses.id", ondelete="CASCADE"), nullable=False)
@@ -197,9 +226,31 @@ class Finding(Base):
     recommendation = relationship("Recommendation", back_populates="finding", uselist=False, cascade="all, delete-orphan")
 
 
+class RuleProfile(Base):
+    """Rule profile model - cost of each rule in one analysis"""
+    __tablename__ = "rule_profiles"
+    __table_args__ = (
+        Index("ix_rule_profiles_analysis_id", "analysis_id"),
+    )
+
+    id = Column(String(36), primary_key=True)
+    analysis_id = Column(String(36), ForeignKey("analyses.id", ondelete="CASCADE"), nullable=False)
+    rule_id = Column(String(50), nullable=False)
+    duration_seconds = Column(Float, nullable=False)
+    entities_scanned = Column(Integer, nullable=False)  # components and/or flows read by the rule
+    findings = Column(Integer, nullable=False)  # produced by evaluation, carried-forward excluded
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    # Relationships
+    analysis = relationship("Analysis", back_populates="rule_profiles")
+
+
 class Recommendation(Base):
     """Recommendation model - security recommendations"""
     __tablename__ = "recommendations"
+    __table_args__ = (
+        Index("ix_recommendations_finding_id", "finding_id"),
+    )
 
     id = Column(String(36), primary_key=True)
     finding_id = Column(String(36), ForeignKey("findings.id", ondelete="CASCADE"), nullable=False)
@@ -220,6 +271,9 @@ class Recommendation(Base):
 class MaturityAssessment(Base):
     """Maturity assessment model - security maturity evaluation"""
     __tablename__ = "maturity_assessments"
+    __table_args__ = (
+        Index("ix_maturity_assessments_analysis_id", "analysis_id"),
+    )
 
     id = Column(String(36), primary_key=True)
     analysis_id = Column(String(36), ForeignKey("analyses.id", ondelete="CASCADE"), nullable=False)
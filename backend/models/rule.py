@@ -0,0 +1,22 @@
+"""
+Pydantic schemas for the active rule set
+"""
+
+from pydantic import BaseModel
+
+
+class RuleInfo(BaseModel):
+    """Schema for one registered rule"""
+    id: str
+    name: str
+    category: str
+    severity: str
+    scope: str
+    declarative: bool  # loaded from a rule pack rather than built in
+
+
+class RuleSet(BaseModel):
+    """Schema for the rule set new analyses run with"""
+    version: str
+    total: int
+    rules: list[RuleInfo]
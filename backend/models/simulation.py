@@ -0,0 +1,93 @@
+"""
+Pydantic models for what-if simulations (nothing is persisted)
+"""
+
+from typing import Optional
+from pydantic import BaseModel, Field
+
+from models.component import ComponentType, ComponentUpdate
+from models.flow import FlowProtocol, FlowUpdate
+
+
+class ComponentChange(ComponentUpdate):
+    """Schema for a hypothetical change to an existing component"""
+    id: str = Field(..., description="Component ID")
+
+
+class FlowChange(FlowUpdate):
+    """Schema for a hypothetical change to an existing flow"""
+    id: str = Field(..., description="Flow ID")
+
+
+class SimulatedComponent(BaseModel):
+    """Schema for a hypothetical new component"""
+    id: Optional[str] = Field(None, description="ID for added flows to refer to (generated if omitted)")
+    zone_id: str = Field(..., description="Zone ID")
+    name: str = Field(..., min_length=1, max_length=100, description="Component name")
+    component_type: ComponentType = Field(..., description="Type of component")
+    has_admin_interface: bool = Field(default=False, description="Has admin interface")
+    requires_mfa: bool = Field(default=False, description="Requires MFA")
+    has_logging: bool = Field(default=False, description="Has logging enabled")
+    encryption_at_rest: bool = Field(default=False, description="Encryption at rest")
+    encryption_in_transit: bool = Field(default=False, description="Encryption in transit")
+
+
+class SimulatedFlow(BaseModel):
+    """Schema for a hypothetical new flow"""
+    id: Optional[str] = Field(None, description="Flow ID (generated if omitted)")
+    source_component_id: str = Field(..., description="Source component ID (existing or added)")
+    target_component_id: str = Field(..., description="Target component ID (existing or added)")
+    protocol: FlowProtocol = Field(..., description="Protocol used")
+    port: Optional[int] = Field(None, ge=1, le=65535, description="Port number")
+    is_authenticated: bool = Field(default=False, description="Flow is authenticated")
+    is_encrypted: bool = Field(default=False, description="Flow is encrypted")
+
+
+class SimulationRequest(BaseModel):
+    """Schema for a set of hypothetical changes to an architecture"""
+    update_components: list[ComponentChange] = Field(default_factory=list)
+    update_flows: list[FlowChange] = Field(default_factory=list)
+    add_components: list[SimulatedComponent] = Field(default_factory=list)
+    add_flows: list[SimulatedFlow] = Field(default_factory=list)
+    remove_components: list[str] = Field(default_factory=list, description="Also removes their flows")
+    remove_flows: list[str] = Field(default_factory=list)
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [{
+                "update_components": [{"id": "123e4567-e89b-12d3-a456-426614174001", "requires_mfa": True}],
+                "update_flows": [{"id": "123e4567-e89b-12d3-a456-426614174002", "is_encrypted": True}],
+            }]
+        }
+    }
+
+
+class SimulatedFinding(BaseModel):
+    """Schema for a finding of a simulation (never stored)"""
+    rule_id: str
+    rule_name: str
+    category: str
+    severity: str
+    title: str
+    description: str
+    impact: str
+    affected_component_id: Optional[str] = None
+    affected_flow_id: Optional[str] = None
+
+    model_config = {
+        "from_attributes": True,
+    }
+
+
+class SimulationResult(BaseModel):
+    """Schema for the effect of hypothetical changes on an architecture's findings"""
+    architecture_id: str
+    rule_set_version: str
+    baseline_risk_score: float
+    simulated_risk_score: float
+    risk_score_delta: float
+    baseline_findings: int = Field(..., ge=0)
+    simulated_findings: int = Field(..., ge=0)
+    severity_delta: dict[str, int]  # simulated minus baseline count, per severity
+    introduced: list[SimulatedFinding]
+    resolved: list[SimulatedFinding]
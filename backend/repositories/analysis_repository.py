@@ -1,12 +1,50 @@
 """Analysis repository - data access for analyses and findings"""
 
+from collections import Counter
 from datetime import datetime
+import json
+from typing import ContextManager, Iterable, Iterator
 import uuid
+from sqlalchemy import DateTime, case, func, insert, literal, select
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
+from core.rule_engine import RuleStats
+from core.rules import RuleFinding
+from core.snapshot import ArchitectureSnapshot
+from database.query_guard import SelectCounter, count_selects
 from models.orm import Analysis as AnalysisORM
 from models.orm import Finding as FindingORM
+from models.orm import RuleProfile as RuleProfileORM
 from models.orm import Project as ProjectORM
+from repositories.architecture_repository import ArchitectureRepository
+
+
+def compute_risk_score(severity_counts: dict[str, int]) -> float:
+    """Global risk score (0-100) from per-severity finding counts"""
+    return min(
+        100.0,
+        severity_counts.get("critical", 0) * 30
+        + severity_counts.get("high", 0) * 15
+        + severity_counts.get("medium", 0) * 7
+        + severity_counts.get("low", 0) * 3,
+    )
+
+
+# Most severe first, for readers that want critical findings early
+SEVERITY_RANK = case(
+    {"critical": 0, "high": 1, "medium": 2, "low": 3},
+    value=FindingORM.severity,
+    else_=4,
+)
+
+
+def _sql_uuid():
+    """Random UUID-formatted id generated by SQLite itself"""
+    def part(size: int):
+        return func.lower(func.hex(func.randomblob(size)))
+
+    return part(4) + "-" + part(2) + "-" + part(2) + "-" + part(2) + "-" + part(6)
 
 
 class AnalysisRepository:
@@ -18,11 +56,32 @@ class AnalysisRepository:
     def get_project(self, project_id: str) -> ProjectORM | None:
         return self.db.query(ProjectORM).filter(ProjectORM.id == project_id).first()
 
-    def create_analysis(self, project_id: str) -> AnalysisORM:
+    def get_architecture_id(self, project_id: str) -> str | None:
+        """ID of a project's architecture, None if the project has none (or does not exist)"""
+        return ArchitectureRepository(self.db).get_id_by_project(project_id)
+
+    def load_snapshot(self, architecture_id: str) -> ArchitectureSnapshot:
+        """Load zones, components and flows of an architecture into a snapshot"""
+        return ArchitectureRepository(self.db).load_snapshot(architecture_id)
+
+    def count_selects(self, limit: int | None = None) -> ContextManager[SelectCounter]:
+        """Count (and optionally cap) the SELECTs issued on this repository's session"""
+        return count_selects(self.db, limit)
+
+    def commit(self) -> None:
+        """
+        Commit the pending writes, if any, and end the transaction
+
+        Analyses are stored as they progress, not at the end of a request;
+        the connection goes back to the pool until the next query.
+        """
+        self.db.commit()
+
+    def create_analysis(self, project_id: str, status: str = "running") -> AnalysisORM:
         analysis = AnalysisORM(
             id=str(uuid.uuid4()),
             project_id=project_id,
-            status="running",
+            status=status,
             started_at=datetime.utcnow(),
             total_findings=0,
             critical_findings=0,
@@ -31,70 +90,242 @@ class AnalysisRepository:
             low_findings=0,
         )
         self.db.add(analysis)
-        self.db.commit()
-        self.db.refresh(analysis)
+        self.db.flush()
         return analysis
 
-    def add_finding(
+    def save_findings(
         self,
         analysis_id: str,
-        rule_id: str,
-        rule_name: str,
-        category: str,
-        severity: str,
-        title: str,
-        description: str,
-        impact: str,
-        affected_component_id: str | None = None,
-        affected_flow_id: str | None = None,
-    ) -> FindingORM:
-        finding = FindingORM(
-            id=str(uuid.uuid4()),
-            analysis_id=analysis_id,
-            rule_id=rule_id,
-            rule_name=rule_name,
-            category=category,
-            severity=severity,
-            title=title,
-            description=description,
-            impact=impact,
-            affected_component_id=affected_component_id,
-            affected_flow_id=affected_flow_id,
-        )
-        self.db.add(finding)
-        self.db.commit()
-        self.db.refresh(finding)
-        return finding
+        findings: Iterable[RuleFinding],
+        content_hash: str | None = None,
+        status: str = "completed",
+        rule_completion: dict[str, str] | str | None = None,
+        recount: bool = False,
+        rule_stats: dict[str, RuleStats] | None = None,
+    ) -> AnalysisORM | None:
+        """
+        Persist all findings of an analysis and complete it, without committing
+
+        Findings are written with a single executemany INSERT; severity
+        counters and the risk score are computed from the in-memory batch, so
+        nothing is read back before the caller commits. With `recount`, other
+        findings were already inserted in this transaction (see
+        `insert_findings_from`) and counters are computed in the database.
 
-    def finalize_analysis(self, analysis_id: str) -> AnalysisORM | None:
-        analysis = self.db.query(AnalysisORM).filter(AnalysisORM.id == analysis_id).first()
+        An analysis that is no longer pending or running (cancelled
+        meanwhile) is returned unchanged.
+        """
+        analysis = self.db.get(AnalysisORM, analysis_id)
         if not analysis:
             return None
+        if not self.finish_if_unfinished(analysis_id, status):
+            # Cancelled while the rules ran: keep that status, store nothing
+            return self.get_analysis(analysis_id, refresh=True)
 
-        findings = (
-            self.db.query(FindingORM)
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "analysis_id": analysis_id,
+                "rule_id": f.rule_id,
+                "rule_name": f.rule_name,
+                "category": f.category,
+                "severity": f.severity,
+                "title": f.title,
+                "description": f.description,
+                "impact": f.impact,
+                "affected_component_id": f.affected_component_id,
+                "affected_flow_id": f.affected_flow_id,
+            }
+            for f in findings
+        ]
+        if rows:
+            self.db.execute(insert(FindingORM), rows)
+        if rule_stats:
+            self.db.execute(
+                insert(RuleProfileORM),
+                [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "analysis_id": analysis_id,
+                        "rule_id": rule_id,
+                        "duration_seconds": stats.duration_seconds,
+                        "entities_scanned": stats.entities_scanned,
+                        "findings": stats.findings,
+                    }
+                    for rule_id, stats in rule_stats.items()
+                ],
+            )
+
+        counts = self._severity_counts(analysis_id) if recount else Counter(row["severity"] for row in rows)
+        self._complete(analysis, counts, status)
+        analysis.content_hash = content_hash
+        if isinstance(rule_completion, dict):
+            rule_completion = json.dumps(rule_completion)
+        analysis.rule_completion = rule_completion
+        self.db.flush()
+        return analysis
+
+    def insert_findings_from(self, analysis_id: str, statement: Select) -> int:
+        """
+        INSERT ... SELECT findings computed by `statement` (FINDING_COLUMNS)
+
+        Rows go from SQLite to SQLite; nothing is committed here.
+
+        Returns:
+            Number of findings inserted
+        """
+        source = statement.subquery()
+        return self.db.execute(
+            insert(FindingORM).from_select(
+                ["id", "analysis_id", "created_at", *source.c.keys()],
+                select(
+                    _sql_uuid(),
+                    literal(analysis_id),
+                    literal(datetime.utcnow(), DateTime),
+                    *source.c,
+                ),
+            )
+        ).rowcount
+
+    def select_rule_findings(self, statement: Select) -> list[RuleFinding]:
+        """Run a compiled rule query and return its rows as findings"""
+        return [RuleFinding(*row) for row in self.db.execute(statement)]
+
+    def _severity_counts(self, analysis_id: str) -> dict[str, int]:
+        return dict(
+            self.db.query(FindingORM.severity, func.count(FindingORM.id))
             .filter(FindingORM.analysis_id == analysis_id)
+            .group_by(FindingORM.severity)
             .all()
         )
 
-        critical_count = sum(1 for f in findings if f.severity == "critical")
-        high_count = sum(1 for f in findings if f.severity == "high")
-        medium_count = sum(1 for f in findings if f.severity == "medium")
-        low_count = sum(1 for f in findings if f.severity == "low")
-
-        analysis.total_findings = len(findings)
-        analysis.critical_findings = critical_count
-        analysis.high_findings = high_count
-        analysis.medium_findings = medium_count
-        analysis.low_findings = low_count
-        analysis.global_risk_score = min(100.0, critical_count * 30 + high_count * 15 + medium_count * 7 + low_count * 3)
-        analysis.status = "completed"
+    def _complete(self, analysis: AnalysisORM, severity_counts: dict[str, int], status: str = "completed") -> None:
+        analysis.total_findings = sum(severity_counts.values())
+        analysis.critical_findings = severity_counts.get("critical", 0)
+        analysis.high_findings = severity_counts.get("high", 0)
+        analysis.medium_findings = severity_counts.get("medium", 0)
+        analysis.low_findings = severity_counts.get("low", 0)
+        analysis.global_risk_score = compute_risk_score(severity_counts)
+        analysis.status = status
         analysis.completed_at = datetime.utcnow()
 
-        self.db.commit()
-        self.db.refresh(analysis)
+    def get_analysis(self, analysis_id: str, refresh: bool = False) -> AnalysisORM | None:
+        """Get an analysis; `refresh` re-reads it even if already loaded in the session"""
+        return self.db.get(AnalysisORM, analysis_id, populate_existing=refresh)
+
+    def mark_running(self, analysis_id: str, rule_set_version: str) -> AnalysisORM | None:
+        """Record that an analysis started with the given rule set"""
+        analysis = self.db.get(AnalysisORM, analysis_id)
+        if not analysis:
+            return None
+
+        analysis.status = "running"
+        analysis.rule_set_version = rule_set_version
+        self.db.flush()
+        return analysis
+
+    def set_status(self, analysis_id: str, status: str) -> AnalysisORM | None:
+        """Update an analysis status; terminal statuses also set completed_at"""
+        analysis = self.db.get(AnalysisORM, analysis_id)
+        if not analysis:
+            return None
+
+        analysis.status = status
+        if status in ("failed", "cancelled"):
+            analysis.completed_at = datetime.utcnow()
+        self.db.flush()
         return analysis
 
+    def rollback(self) -> None:
+        """Discard the pending transaction (after a failed write)"""
+        self.db.rollback()
+
+    def fail_unfinished(self) -> int:
+        """Mark analyses left pending/running (e.g. by a restart) as failed"""
+        count = (
+            self.db.query(AnalysisORM)
+            .filter(AnalysisORM.status.in_(("pending", "running")))
+            .update({"status": "failed", "completed_at": datetime.utcnow()}, synchronize_session=False)
+        )
+        return count
+
+    def finish_if_unfinished(self, analysis_id: str, status: str) -> bool:
+        """
+        Move an analysis to a final status, unless it already has one
+
+        A single conditional UPDATE: a cancellation and the worker's final
+        write cannot overwrite each other.
+
+        Returns:
+            False if the analysis was not pending or running anymore
+        """
+        count = (
+            self.db.query(AnalysisORM)
+            .filter(AnalysisORM.id == analysis_id, AnalysisORM.status.in_(("pending", "running")))
+            .update({"status": status, "completed_at": datetime.utcnow()}, synchronize_session=False)
+        )
+        return count == 1
+
+    def get_rule_findings(self, analysis_id: str) -> list[RuleFinding]:
+        """Findings of an analysis as plain records, ready to be carried forward"""
+        rows = (
+            self.db.query(
+                FindingORM.rule_id,
+                FindingORM.rule_name,
+                FindingORM.category,
+                FindingORM.severity,
+                FindingORM.title,
+                FindingORM.description,
+                FindingORM.impact,
+                FindingORM.affected_component_id,
+                FindingORM.affected_flow_id,
+            )
+            .filter(FindingORM.analysis_id == analysis_id)
+            .all()
+        )
+        return [RuleFinding(*row) for row in rows]
+
+    def find_completed_by_hash(self, project_id: str, content_hash: str) -> AnalysisORM | None:
+        """Latest completed analysis of a project with the given content hash"""
+        return (
+            self.db.query(AnalysisORM)
+            .filter(
+                AnalysisORM.project_id == project_id,
+                AnalysisORM.content_hash == content_hash,
+                AnalysisORM.status == "completed",
+            )
+            .order_by(AnalysisORM.started_at.desc())
+            .first()
+        )
+
+    def get_rule_profiles(self, analysis_id: str) -> list[RuleProfileORM]:
+        """Rule profiles of an analysis, most expensive first"""
+        return (
+            self.db.query(RuleProfileORM)
+            .filter(RuleProfileORM.analysis_id == analysis_id)
+            .order_by(RuleProfileORM.duration_seconds.desc())
+            .all()
+        )
+
+    def get_rule_profile_totals(self) -> list[tuple]:
+        """Per rule over every analysis: (rule_id, runs, total s, max s, entities, findings)"""
+        return (
+            self.db.query(
+                RuleProfileORM.rule_id,
+                func.count(RuleProfileORM.id),
+                func.sum(RuleProfileORM.duration_seconds),
+                func.max(RuleProfileORM.duration_seconds),
+                func.sum(RuleProfileORM.entities_scanned),
+                func.sum(RuleProfileORM.findings),
+            )
+            .group_by(RuleProfileORM.rule_id)
+            .order_by(RuleProfileORM.rule_id)
+            .all()
+        )
+
+    def count_by_status(self) -> dict[str, int]:
+        return dict(self.db.query(AnalysisORM.status, func.count(AnalysisORM.id)).group_by(AnalysisORM.status).all())
+
     def get_latest_by_project(self, project_id: str) -> AnalysisORM | None:
         return (
             self.db.query(AnalysisORM)
@@ -103,10 +334,32 @@ class AnalysisRepository:
             .first()
         )
 
-    def get_findings_by_analysis(self, analysis_id: str) -> list[FindingORM]:
+    def get_findings_by_analysis(
+        self,
+        analysis_id: str,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[FindingORM]:
         return (
             self.db.query(FindingORM)
             .filter(FindingORM.analysis_id == analysis_id)
-            .order_by(FindingORM.created_at.desc())
+            .order_by(FindingORM.created_at.desc(), FindingORM.id)
+            .offset(offset)
+            .limit(limit)
             .all()
         )
+
+    def count_findings(self, analysis_id: str) -> int:
+        return self.db.query(func.count(FindingORM.id)).filter(FindingORM.analysis_id == analysis_id).scalar()
+
+    def iter_findings(
+        self,
+        analysis_id: str,
+        rule_ids: Iterable[str] | None = None,
+        batch_size: int = 500,
+    ) -> Iterator[FindingORM]:
+        """Stream stored findings, most severe first, fetching `batch_size` rows at a time"""
+        query = self.db.query(FindingORM).filter(FindingORM.analysis_id == analysis_id)
+        if rule_ids is not None:
+            query = query.filter(FindingORM.rule_id.in_(list(rule_ids)))
+        return iter(query.order_by(SEVERITY_RANK, FindingORM.created_at, FindingORM.id).yield_per(batch_size))
@@ -4,11 +4,37 @@ Repository for Architecture entity
 
 import uuid
 from typing import Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from models.orm import Architecture
+from core.snapshot import ArchitectureSnapshot
+from models.orm import Architecture, Component, Flow, Zone
 from models.architecture import ArchitectureCreate, ArchitectureUpdate
 
 
+# Columns read into a snapshot (see ArchitectureSnapshot.build)
+SNAPSHOT_ZONE_COLUMNS = (Zone.id, Zone.name, Zone.trust_level)
+SNAPSHOT_COMPONENT_COLUMNS = (
+    Component.id,
+    Component.zone_id,
+    Component.name,
+    Component.component_type,
+    Component.has_admin_interface,
+    Component.requires_mfa,
+    Component.has_logging,
+    Component.encryption_at_rest,
+    Component.encryption_in_transit,
+)
+SNAPSHOT_FLOW_COLUMNS = (
+    Flow.id,
+    Flow.source_component_id,
+    Flow.target_component_id,
+    Flow.protocol,
+    Flow.port,
+    Flow.is_authenticated,
+    Flow.is_encrypted,
+)
+
+
 class ArchitectureRepository:
     """Repository for Architecture CRUD operations"""
 
@@ -23,14 +49,34 @@ class ArchitectureRepository:
             description=architecture_data.description
         )
         self.db.add(architecture)
-        self.db.commit()
-        self.db.refresh(architecture)
+        self.db.flush()
         return architecture
 
     def get_by_id(self, architecture_id: str) -> Optional[Architecture]:
         """Get architecture by ID"""
         return self.db.query(Architecture).filter(Architecture.id == architecture_id).first()
 
+    def load_snapshot(self, architecture_id: str) -> ArchitectureSnapshot:
+        """
+        Load zones, components and flows of an architecture into a snapshot
+
+        Always three queries, whatever the size of the architecture: only the
+        columns the snapshot keeps are read, as plain rows, so no ORM object
+        is built and no relationship can be lazily loaded.
+        """
+        return ArchitectureSnapshot.build(
+            architecture_id,
+            zones=self.db.execute(select(*SNAPSHOT_ZONE_COLUMNS).where(Zone.architecture_id == architecture_id)),
+            components=self.db.execute(
+                select(*SNAPSHOT_COMPONENT_COLUMNS).where(Component.architecture_id == architecture_id)
+            ),
+            flows=self.db.execute(select(*SNAPSHOT_FLOW_COLUMNS).where(Flow.architecture_id == architecture_id)),
+        )
+
+    def get_id_by_project(self, project_id: str) -> Optional[str]:
+        """Get the ID of a project's architecture without loading either"""
+        return self.db.scalar(select(Architecture.id).where(Architecture.project_id == project_id))
+
     def get_by_project_id(self, project_id: str) -> Optional[Architecture]:
         """Get architecture by project ID"""
         return self.db.query(Architecture).filter(Architecture.project_id == project_id).first()
@@ -49,8 +95,7 @@ class ArchitectureRepository:
         for field, value in update_data.items():
             setattr(architecture, field, value)
 
-        self.db.commit()
-        self.db.refresh(architecture)
+        self.db.flush()
         return architecture
 
     def delete(self, architecture_id: str) -> bool:
@@ -60,7 +105,7 @@ class ArchitectureRepository:
             return False
 
         self.db.delete(architecture)
-        self.db.commit()
+        self.db.flush()
         return True
 
     def exists(self, architecture_id: str) -> bool:
@@ -5,6 +5,8 @@ Repository for Component entity
 import uuid
 from typing import Optional
 from sqlalchemy.orm import Session
+from core.change_tracker import get_change_tracker
+from database.unit_of_work import after_commit
 from models.orm import Component
 from models.component import ComponentCreate, ComponentUpdate
 
@@ -14,6 +16,7 @@ class ComponentRepository:
 
     def __init__(self, db: Session):
         self.db = db
+        self.changes = get_change_tracker()
 
     def create(self, component_data: ComponentCreate) -> Component:
         """Create a new component"""
@@ -31,8 +34,8 @@ class ComponentRepository:
             description=component_data.description
         )
         self.db.add(component)
-        self.db.commit()
-        self.db.refresh(component)
+        self.db.flush()
+        after_commit(self.db, self.changes.record, component.architecture_id, component_id=component.id)
         return component
 
     def get_by_id(self, component_id: str) -> Optional[Component]:
@@ -65,8 +68,8 @@ class ComponentRepository:
         for field, value in update_data.items():
             setattr(component, field, value)
 
-        self.db.commit()
-        self.db.refresh(component)
+        self.db.flush()
+        after_commit(self.db, self.changes.record, component.architecture_id, component_id=component.id)
         return component
 
     def delete(self, component_id: str) -> bool:
@@ -75,8 +78,10 @@ class ComponentRepository:
         if not component:
             return False
 
+        architecture_id = component.architecture_id
         self.db.delete(component)
-        self.db.commit()
+        self.db.flush()
+        after_commit(self.db, self.changes.record, architecture_id, component_id=component_id)
         return True
 
     def exists(self, component_id: str) -> bool:
@@ -5,6 +5,8 @@ Repository for Flow entity
 import uuid
 from typing import Optional
 from sqlalchemy.orm import Session
+from core.change_tracker import get_change_tracker
+from database.unit_of_work import after_commit
 from models.orm import Flow
 from models.flow import FlowCreate, FlowUpdate
 
@@ -14,6 +16,7 @@ class FlowRepository:
 
     def __init__(self, db: Session):
         self.db = db
+        self.changes = get_change_tracker()
 
     def create(self, flow_data: FlowCreate) -> Flow:
         """Create a new flow"""
@@ -29,8 +32,8 @@ class FlowRepository:
             description=flow_data.description
         )
         self.db.add(flow)
-        self.db.commit()
-        self.db.refresh(flow)
+        self.db.flush()
+        after_commit(self.db, self.changes.record, flow.architecture_id, flow_id=flow.id)
         return flow
 
     def get_by_id(self, flow_id: str) -> Optional[Flow]:
@@ -63,8 +66,8 @@ class FlowRepository:
         for field, value in update_data.items():
             setattr(flow, field, value)
 
-        self.db.commit()
-        self.db.refresh(flow)
+        self.db.flush()
+        after_commit(self.db, self.changes.record, flow.architecture_id, flow_id=flow.id)
         return flow
 
     def delete(self, flow_id: str) -> bool:
@@ -73,8 +76,10 @@ class FlowRepository:
         if not flow:
             return False
 
+        architecture_id = flow.architecture_id
         self.db.delete(flow)
-        self.db.commit()
+        self.db.flush()
+        after_commit(self.db, self.changes.record, architecture_id, flow_id=flow_id)
         return True
 
     def exists(self, flow_id: str) -> bool:
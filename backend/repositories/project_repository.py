@@ -35,8 +35,7 @@ class ProjectRepository:
             criticality_level=project_data.criticality_level
         )
         self.db.add(project)
-        self.db.commit()
-        self.db.refresh(project)
+        self.db.flush()
         return project
 
     def get_by_id(self, project_id: str) -> Optional[ProjectORM]:
@@ -64,6 +63,15 @@ class ProjectRepository:
         """
         return self.db.query(ProjectORM).offset(skip).limit(limit).all()
 
+    def get_all_ids(self) -> List[str]:
+        """
+        Get the IDs of every project, without loading the projects
+
+        Returns:
+            List of project UUIDs
+        """
+        return [row.id for row in self.db.query(ProjectORM.id).order_by(ProjectORM.created_at).all()]
+
     def count(self) -> int:
         """
         Count total number of projects
@@ -93,8 +101,7 @@ class ProjectRepository:
         for field, value in update_data.items():
             setattr(project, field, value)
 
-        self.db.commit()
-        self.db.refresh(project)
+        self.db.flush()
         return project
 
     def delete(self, project_id: str) -> bool:
@@ -112,7 +119,7 @@ class ProjectRepository:
             return False
 
         self.db.delete(project)
-        self.db.commit()
+        self.db.flush()
         return True
 
     def exists(self, project_id: str) -> bool:
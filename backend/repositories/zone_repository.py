@@ -5,6 +5,8 @@ Repository for Zone entity
 import uuid
 from typing import Optional
 from sqlalchemy.orm import Session
+from core.change_tracker import get_change_tracker
+from database.unit_of_work import after_commit
 from models.orm import Zone
 from models.zone import ZoneCreate, ZoneUpdate
 
@@ -14,6 +16,7 @@ class ZoneRepository:
 
     def __init__(self, db: Session):
         self.db = db
+        self.changes = get_change_tracker()
 
     def create(self, zone_data: ZoneCreate) -> Zone:
         """Create a new zone"""
@@ -25,8 +28,8 @@ class ZoneRepository:
             description=zone_data.description
         )
         self.db.add(zone)
-        self.db.commit()
-        self.db.refresh(zone)
+        self.db.flush()
+        after_commit(self.db, self.changes.record, zone.architecture_id, zone_id=zone.id)
         return zone
 
     def get_by_id(self, zone_id: str) -> Optional[Zone]:
@@ -53,8 +56,8 @@ class ZoneRepository:
         for field, value in update_data.items():
             setattr(zone, field, value)
 
-        self.db.commit()
-        self.db.refresh(zone)
+        self.db.flush()
+        after_commit(self.db, self.changes.record, zone.architecture_id, zone_id=zone.id)
         return zone
 
     def delete(self, zone_id: str) -> bool:
@@ -63,8 +66,10 @@ class ZoneRepository:
         if not zone:
             return False
 
+        architecture_id = zone.architecture_id
         self.db.delete(zone)
-        self.db.commit()
+        self.db.flush()
+        after_commit(self.db, self.changes.record, architecture_id, zone_id=zone_id)
         return True
 
     def exists(self, zone_id: str) -> bool:
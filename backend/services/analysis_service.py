@@ -1,77 +1,296 @@
 """Analysis service - security checks and findings generation"""
 
+import logging
+import time
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import asdict
+from threading import Event
+from typing import Iterator, Optional
+
+from pydantic import BaseModel
+
 from fastapi import HTTPException, status
 
+from core.change_tracker import ChangeTracker, get_change_tracker
+from core.job_queue import JobQueue, JobQueueFull, get_job_queue
+from config import get_settings
+from core.budget import AnalysisCancelled, Budget
+from core.finding_stream import FindingBroker, FindingChannel, get_finding_broker
+from core.rule_engine import RuleEngine, get_rule_engine
+from core.sql_engine import SqlRuleEngine
+from database.connection import ReadSessionLocal, SessionLocal
 from repositories.analysis_repository import AnalysisRepository
-from models.analysis import Analysis, Finding, FindingList
-from models.orm import ComponentTypeEnum
+from models.analysis import Analysis, AnalysisProfile, Finding, FindingEvent, FindingList, RuleProfile
+
+
+# Seconds between keep-alive events on an idle findings stream
+STREAM_HEARTBEAT = 15.0
+# Seconds between status polls for analyses running in another process
+STREAM_POLL_INTERVAL = 1.0
+# SELECTs an analysis may issue, whatever the size of the architecture: the
+# analysis, its architecture id, the snapshot (3), the cached result lookup,
+# then either the cached or baseline findings (+ the baseline analysis) or
+# the SQL pushdown recount
+ANALYSIS_SELECT_BUDGET = 8
+
+logger = logging.getLogger(__name__)
 
 
 class AnalysisService:
     """Service for architecture analysis"""
 
-    def __init__(self, repository: AnalysisRepository):
+    def __init__(
+        self,
+        repository: AnalysisRepository,
+        engine: RuleEngine | None = None,
+        changes: ChangeTracker | None = None,
+        broker: FindingBroker | None = None,
+    ):
         self.repository = repository
+        self.engine = engine or get_rule_engine()
+        self.sql_engine = SqlRuleEngine(self.engine)
+        self.changes = changes or get_change_tracker()
+        self.broker = broker or get_finding_broker()
+
+    def run_analysis(self, project_id: str, incremental: bool = False) -> Analysis:
+        """
+        Analyze a project's architecture synchronously
+
+        With `incremental`, only rules touching entities changed since the
+        previous analysis are re-run and the other findings are carried
+        forward. Falls back to a full analysis when no usable baseline exists,
+        including one produced by a different rule set.
+        """
+        analysis = self._create_analysis(project_id, "running")
+        return self.execute_analysis(analysis.id, incremental)
 
-    def run_analysis(self, project_id: str) -> Analysis:
-        project = self.repository.get_project(project_id)
-        if not project:
+    def enqueue_analysis(self, project_id: str, incremental: bool = False, jobs: JobQueue | None = None) -> Analysis:
+        """Create a pending analysis and run it on the background job queue"""
+        jobs = jobs or get_job_queue()
+        if jobs.is_full():
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Project {project_id} not found",
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many analyses in progress, retry later",
             )
 
-        if not project.architecture:
+        analysis = self._create_analysis(project_id, "pending")
+        # The job runs in its own session: the analysis must be stored before it is queued
+        self.repository.commit()
+        # Open the stream now so clients can follow the analysis while it is queued
+        self.broker.open(analysis.id)
+        try:
+            jobs.submit(analysis.id, lambda cancel: run_analysis_job(analysis.id, incremental, cancel))
+        except JobQueueFull:
+            self.broker.close(analysis.id)
+            self.repository.set_status(analysis.id, "failed")
+            self.repository.commit()
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Project has no architecture to analyze",
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many analyses in progress, retry later",
             )
+        return Analysis.model_validate(analysis)
+
+    def execute_analysis(
+        self,
+        analysis_id: str,
+        incremental: bool = False,
+        cancel: Event | None = None,
+    ) -> Analysis:
+        """
+        Run the rule engine for an existing analysis and persist its findings
+
+        Findings are published to the analysis' stream as the engine produces
+        them; the stream is closed once the result is stored. The analysis
+        outlives the request that may have started it, so its progress is
+        committed here rather than by the request's unit of work.
+        """
+        channel = self.broker.get(analysis_id) or self.broker.open(analysis_id)
+        try:
+            with self._select_guard():
+                return self._execute_analysis(analysis_id, incremental, cancel, channel)
+        finally:
+            self.broker.close(analysis_id)
 
-        analysis = self.repository.create_analysis(project_id)
-
-        for component in project.architecture.components:
-            if component.has_admin_interface and not component.requires_mfa:
-                self.repository.add_finding(
-                    analysis_id=analysis.id,
-                    rule_id="SEC-001",
-                    rule_name="Admin interface requires MFA",
-                    category="identity",
-                    severity="high",
-                    title=f"{component.name} has admin access without MFA",
-                    description="Component exposes an admin interface but does not enforce MFA.",
-                    impact="Account takeover risk is increased for privileged access paths.",
-                    affected_component_id=component.id,
+    def _select_guard(self) -> AbstractContextManager:
+        """With `debug_query_guard`, fail the analysis past ANALYSIS_SELECT_BUDGET SELECTs"""
+        settings = get_settings()
+        # The parity backend re-runs every pushed-down rule as its own SELECT
+        if not settings.debug_query_guard or settings.rule_backend == "parity":
+            return nullcontext()
+        return self.repository.count_selects(ANALYSIS_SELECT_BUDGET)
+
+    def _execute_analysis(
+        self,
+        analysis_id: str,
+        incremental: bool,
+        cancel: Event | None,
+        channel: FindingChannel,
+    ) -> Analysis:
+        analysis = self.repository.get_analysis(analysis_id)
+        if analysis.status not in ("pending", "running"):
+            # Cancelled before the worker picked it up
+            return Analysis.model_validate(analysis)
+
+        architecture_id = self.repository.get_architecture_id(analysis.project_id)
+        # The engine was taken when this service was built: a rule reload
+        # during the analysis does not affect it
+        self.repository.mark_running(analysis_id, self.engine.registry.version)
+        self.repository.commit()
+        baseline_id, changes = self.changes.start(architecture_id, analysis_id)
+        budget = Budget(timeout=get_settings().analysis_timeout, cancel=cancel)
+
+        try:
+            snapshot = self.repository.load_snapshot(architecture_id)
+            result_key = self.engine.result_key(snapshot)
+            cached = self.repository.find_completed_by_hash(analysis.project_id, result_key)
+            if cached:
+                # Same architecture, same rules: reuse the findings as they are
+                findings = self.repository.get_rule_findings(cached.id)
+                for finding in findings:
+                    channel.publish(finding)
+                finalized = self.repository.save_findings(
+                    analysis_id, findings, result_key, rule_completion=cached.rule_completion
                 )
+                if finalized.status == "cancelled":
+                    raise AnalysisCancelled()
+                self.repository.commit()
+                return Analysis.model_validate(finalized)
+
+            baseline = (
+                self.repository.get_analysis(baseline_id)
+                if incremental and baseline_id and changes is not None
+                else None
+            )
+            backend = get_settings().rule_backend
+            pushed_down = False
+            # Findings of another rule set (reloaded since the baseline) cannot be carried forward
+            if (
+                baseline
+                and baseline.status == "completed"
+                and baseline.rule_set_version == self.engine.registry.version
+            ):
+                previous = self.repository.get_rule_findings(baseline.id)
+                # Nothing to write until the result: end the read transaction so
+                # the writer connection is free while the rules run
+                self.repository.commit()
+                result = self.engine.run_incremental(snapshot, changes, previous, budget, channel.publish)
+            elif backend in ("sql", "parity"):
+                if backend == "parity":
+                    self._check_parity(snapshot)
+                # Pushed-down rules are only compiled here: their INSERT ... SELECTs
+                # run with the result below, in one short write transaction
+                self.repository.commit()
+                result = self.sql_engine.run(snapshot, budget, channel.publish)
+                for rule_id, statement in result.statements.items():
+                    channel.defer(rule_id)
+                    stats = result.rule_stats[rule_id]
+                    started = time.perf_counter()
+                    stats.findings = self.repository.insert_findings_from(analysis_id, statement)
+                    stats.duration_seconds += time.perf_counter() - started
+                pushed_down = True
+            else:
+                self.repository.commit()
+                result = self.engine.run(snapshot, budget, channel.publish)
+
+            # Partial results are kept but never reused as a cache entry
+            finalized = self.repository.save_findings(
+                analysis_id,
+                result.findings,
+                None if result.timed_out else result_key,
+                status="timed_out" if result.timed_out else "completed",
+                rule_completion=result.rule_status,
+                recount=pushed_down,
+                rule_stats=result.rule_stats,
+            )
+            if finalized.status == "cancelled":
+                # Cancelled from another request while the rules ran
+                raise AnalysisCancelled()
+        except AnalysisCancelled:
+            self.changes.discard(architecture_id)
+            # Findings already inserted (SQL pushdown) must not be committed
+            self.repository.rollback()
+            self.repository.finish_if_unfinished(analysis_id, "cancelled")
+            finalized = self.repository.get_analysis(analysis_id, refresh=True)
+        except Exception:
+            self.changes.discard(architecture_id)
+            self.repository.rollback()
+            self.repository.finish_if_unfinished(analysis_id, "failed")
+            self.repository.commit()
+            raise
+
+        self.repository.commit()
+        return Analysis.model_validate(finalized)
+
+    def _check_parity(self, snapshot) -> None:
+        """Log every pushed-down rule whose SQL and Python results differ"""
+        for rule_id, (missing, extra) in self.sql_engine.diff(snapshot, self.repository.select_rule_findings).items():
+            logger.warning(
+                "SQL/Python mismatch for %s on architecture %s: %d missing, %d extra",
+                rule_id, snapshot.architecture_id, len(missing), len(extra),
+            )
+
+    def get_analysis(self, analysis_id: str) -> Analysis:
+        analysis = self.repository.get_analysis(analysis_id)
+        if not analysis:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Analysis {analysis_id} not found",
+            )
+        return Analysis.model_validate(analysis)
+
+    def get_profile(self, analysis_id: str) -> AnalysisProfile:
+        """
+        Per-rule wall time, entities scanned and findings of an analysis
 
-            if component.component_type == ComponentTypeEnum.DATABASE and not component.encryption_at_rest:
-                self.repository.add_finding(
-                    analysis_id=analysis.id,
-                    rule_id="SEC-011",
-                    rule_name="Database encryption at rest",
-                    category="data",
-                    severity="critical",
-                    title=f"Database {component.name} is not encrypted at rest",
-                    description="Database component stores data without encryption at rest.",
-                    impact="Sensitive data disclosure risk in case of storage compromise.",
-                    affected_component_id=component.id,
+        Empty when no rule ran (result reused from the cache, or the
+        analysis never started).
+        """
+        self.get_analysis(analysis_id)
+        profiles = [RuleProfile.model_validate(p) for p in self.repository.get_rule_profiles(analysis_id)]
+        return AnalysisProfile(
+            analysis_id=analysis_id,
+            total_duration_seconds=sum(p.duration_seconds for p in profiles),
+            rules=profiles,
+        )
+
+    def cancel_analysis(self, analysis_id: str, jobs: JobQueue | None = None) -> Analysis:
+        """Cancel a pending or running analysis"""
+        jobs = jobs or get_job_queue()
+        analysis = self.get_analysis(analysis_id)
+        if analysis.status not in ("pending", "running"):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Analysis {analysis_id} is already {analysis.status}",
+            )
+
+        if not jobs.cancel(analysis_id):
+            if analysis_id in jobs:
+                # Running here: the worker stops before its next rule and records the status
+                return analysis
+            if analysis.status == "running":
+                # Run by another process (portfolio worker, CLI): nothing here can stop it
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Analysis {analysis_id} is running in another process and cannot be cancelled",
                 )
+        # Never started (or orphaned): nobody else will update it, unless it just finished
+        self.repository.finish_if_unfinished(analysis_id, "cancelled")
+        self.broker.close(analysis_id)
+        return Analysis.model_validate(self.repository.get_analysis(analysis_id, refresh=True))
 
-        for flow in project.architecture.flows:
-            if flow.protocol in ["http", "sql"] and not flow.is_encrypted:
-                self.repository.add_finding(
-                    analysis_id=analysis.id,
-                    rule_id="SEC-013",
-                    rule_name="Sensitive flow must be encrypted",
-                    category="network",
-                    severity="medium",
-                    title=f"Unencrypted flow {flow.source_component_id} → {flow.target_component_id}",
-                    description="Data flow uses an insecure/non-encrypted protocol configuration.",
-                    impact="Traffic interception or manipulation is possible on this communication path.",
-                    affected_flow_id=flow.id,
+    def _create_analysis(self, project_id: str, initial_status: str):
+        if self.repository.get_architecture_id(project_id) is None:
+            if not self.repository.get_project(project_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Project {project_id} not found",
                 )
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Project has no architecture to analyze",
+            )
 
-        finalized = self.repository.finalize_analysis(analysis.id)
-        return Analysis.model_validate(finalized)
+        return self.repository.create_analysis(project_id, status=initial_status)
 
     def get_latest_analysis(self, project_id: str) -> Analysis:
         analysis = self.repository.get_latest_by_project(project_id)
@@ -82,7 +301,13 @@ class AnalysisService:
             )
         return Analysis.model_validate(analysis)
 
-    def get_findings_for_project(self, project_id: str) -> FindingList:
+    def get_findings_for_project(
+        self,
+        project_id: str,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> FindingList:
+        """Findings of the latest analysis; `total` always counts every finding"""
         latest = self.repository.get_latest_by_project(project_id)
         if not latest:
             raise HTTPException(
@@ -90,8 +315,66 @@ class AnalysisService:
                 detail=f"No analysis found for project {project_id}",
             )
 
-        findings = self.repository.get_findings_by_analysis(latest.id)
+        findings = self.repository.get_findings_by_analysis(latest.id, limit, offset)
+        total = (
+            len(findings)
+            if limit is None and offset == 0
+            else self.repository.count_findings(latest.id)
+        )
         return FindingList(
             findings=[Finding.model_validate(f) for f in findings],
-            total=len(findings),
+            total=total,
         )
+
+    def stream_findings(self, analysis_id: str) -> Iterator[tuple[str, Optional[BaseModel]]]:
+        """
+        Stream an analysis' findings as (event, payload) pairs
+
+        A running analysis streams findings live as the engine produces them;
+        a finished one streams its stored findings, most severe first. The
+        stream always ends with an "end" event carrying the final analysis,
+        and emits "heartbeat" events (no payload) while waiting.
+        """
+        self.get_analysis(analysis_id)
+        return _finding_events(analysis_id, self.broker.get(analysis_id))
+
+
+def run_analysis_job(analysis_id: str, incremental: bool, cancel: Event) -> None:
+    """Background job entry point: runs an analysis in its own session"""
+    db = SessionLocal()
+    try:
+        AnalysisService(AnalysisRepository(db)).execute_analysis(analysis_id, incremental, cancel)
+    finally:
+        db.close()
+
+
+def _finding_events(
+    analysis_id: str,
+    channel: FindingChannel | None,
+) -> Iterator[tuple[str, Optional[BaseModel]]]:
+    """Generator behind `stream_findings`; uses its own (read-only) session as it outlives the request"""
+    if channel:
+        for finding in channel.follow(STREAM_HEARTBEAT):
+            if finding is None:
+                yield "heartbeat", None
+            else:
+                yield "finding", FindingEvent(analysis_id=analysis_id, **asdict(finding))
+
+    db = ReadSessionLocal()
+    try:
+        repository = AnalysisRepository(db)
+        analysis = repository.get_analysis(analysis_id)
+        while analysis.status in ("pending", "running"):
+            # Running in another process (e.g. a portfolio worker): wait for its result
+            yield "heartbeat", None
+            time.sleep(STREAM_POLL_INTERVAL)
+            analysis = repository.get_analysis(analysis_id, refresh=True)
+
+        if not channel or channel.deferred_rules:
+            # Everything, or what the live stream could not carry (SQL pushdown)
+            rule_ids = channel.deferred_rules if channel else None
+            for finding in repository.iter_findings(analysis_id, rule_ids):
+                yield "finding", FindingEvent.model_validate(finding)
+        yield "end", Analysis.model_validate(analysis)
+    finally:
+        db.close()
@@ -0,0 +1,38 @@
+"""
+Async service facade - sync services behind `async def` routes
+
+Services and repositories are written against a sync Session. Async routes
+run them on an AsyncSession through `run_sync`: the service executes in a
+greenlet and every query it issues is awaited on aiosqlite, so the request
+holds no threadpool thread while SQLite works, and the same code still
+serves sync routes, analysis jobs and the CLI. Only for services that mostly
+wait for the database: CPU-bound ones (graph, simulation, rule engine) would
+block the event loop and stay behind sync routes.
+"""
+
+from typing import Callable, Concatenate, Generic, ParamSpec, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+S = TypeVar("S")
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+class AsyncService(Generic[S]):
+    """Runs methods of a sync service, built by `factory`, on an AsyncSession"""
+
+    def __init__(self, db: AsyncSession, factory: Callable[[Session], S]):
+        self.db = db
+        self.factory = factory
+
+    async def run(self, method: Callable[Concatenate[S, P], R], *args: P.args, **kwargs: P.kwargs) -> R:
+        """
+        Call `method` on a service bound to the session
+
+        Usage:
+            await service.run(ZoneService.get_zone, zone_id)
+        """
+        return await self.db.run_sync(lambda session: method(self.factory(session), *args, **kwargs))
@@ -0,0 +1,253 @@
+"""Graph service - attack paths, blast radius, cycles and zone matrix of an architecture"""
+
+from fastapi import HTTPException, status
+
+from core.graph import GraphResultCache, get_graph_cache, iter_bits
+from core.paths import WeightedPaths
+from core.snapshot import ArchitectureSnapshot
+from models.component import ComponentType
+from models.graph import (
+    AttackPath,
+    AttackPathReport,
+    BidirectionalPair,
+    BlastRadius,
+    BlastRadiusReport,
+    ComponentGroup,
+    CycleReport,
+    RankedAttackPath,
+    RankedAttackPathReport,
+    ZoneLinkInfo,
+    ZoneMatrixReport,
+)
+from repositories.architecture_repository import ArchitectureRepository
+
+
+class GraphService:
+    """Service for graph analyses of an architecture"""
+
+    def __init__(self, repository: ArchitectureRepository, cache: GraphResultCache | None = None):
+        self.repository = repository
+        self.cache = cache or get_graph_cache()
+
+    def _load_snapshot(self, architecture_id: str) -> ArchitectureSnapshot:
+        if not self.repository.get_by_id(architecture_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Architecture {architecture_id} not found",
+            )
+        return self.repository.load_snapshot(architecture_id)
+
+    def get_attack_paths(
+        self,
+        architecture_id: str,
+        target_type: ComponentType = ComponentType.DATABASE,
+        limit: int | None = None,
+    ) -> AttackPathReport:
+        """
+        Shortest path (in hops) from every untrusted-zone component to every target it reaches
+
+        Reachability bitsets decide which entry points reach a target at all;
+        only those run a breadth-first search, which stops once all their
+        reachable targets are found. Paths are ordered by hop count.
+        """
+        snapshot = self._load_snapshot(architecture_id)
+        graph = snapshot.graph
+
+        untrusted = {z.id for z in snapshot.zones if z.trust_level == "untrusted"}
+        entries = graph.nodes_where(lambda c: c.zone_id in untrusted)
+        targets = graph.nodes_where(lambda c: c.component_type == target_type.value)
+
+        paths = []
+        reached = 0
+        for entry in iter_bits(entries):
+            wanted = graph.reachable(entry) & targets
+            if not wanted:
+                continue
+            reached |= wanted
+            parent = graph.shortest_paths(entry, wanted)
+            for target in iter_bits(wanted):
+                nodes = graph.path_to(parent, target)
+                paths.append(
+                    AttackPath(
+                        entry_component_id=graph.component(entry).id,
+                        target_component_id=graph.component(target).id,
+                        hops=len(nodes) - 1,
+                        component_ids=[graph.component(n).id for n in nodes],
+                        flow_ids=graph.flows_along(nodes),
+                    )
+                )
+
+        paths.sort(key=lambda p: p.hops)
+        return AttackPathReport(
+            architecture_id=architecture_id,
+            target_type=target_type.value,
+            entry_points=[graph.component(n).id for n in iter_bits(entries)],
+            reachable_targets=[graph.component(n).id for n in iter_bits(reached)],
+            total=len(paths),
+            paths=paths[:limit] if limit is not None else paths,
+        )
+
+    def get_ranked_attack_paths(
+        self,
+        architecture_id: str,
+        source_zone_id: str,
+        target_zone_id: str,
+        k: int = 5,
+    ) -> RankedAttackPathReport:
+        """
+        The `k` cheapest attack paths from one zone into another
+
+        Costs count hops and the controls crossed (see `core.paths`).
+        Results are cached until the architecture changes.
+        """
+        snapshot = self._load_snapshot(architecture_id)
+        for zone_id in (source_zone_id, target_zone_id):
+            if zone_id not in snapshot.zones_by_id:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Zone {zone_id} not found in architecture {architecture_id}",
+                )
+        if source_zone_id == target_zone_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Source and target zones must differ",
+            )
+
+        def compute() -> list[RankedAttackPath]:
+            graph = snapshot.graph
+            search = WeightedPaths(
+                snapshot,
+                sources=[graph.node_of[c.id] for c in snapshot.components_by_zone.get(source_zone_id, ())],
+                targets=[graph.node_of[c.id] for c in snapshot.components_by_zone.get(target_zone_id, ())],
+            )
+            return [
+                RankedAttackPath(
+                    entry_component_id=graph.component(nodes[0]).id,
+                    target_component_id=graph.component(nodes[-1]).id,
+                    hops=len(nodes) - 1,
+                    component_ids=[graph.component(n).id for n in nodes],
+                    flow_ids=search.flow_ids(nodes),
+                    cost=cost,
+                )
+                for cost, nodes in search.shortest(k)
+            ]
+
+        paths = self.cache.get_or_compute(snapshot, ("ranked-paths", source_zone_id, target_zone_id, k), compute)
+        return RankedAttackPathReport(
+            architecture_id=architecture_id,
+            source_zone_id=source_zone_id,
+            target_zone_id=target_zone_id,
+            k=k,
+            paths=paths,
+        )
+
+    def get_blast_radius(self, architecture_id: str, component_id: str) -> BlastRadius:
+        """Components and zones reachable once `component_id` is compromised"""
+        snapshot = self._load_snapshot(architecture_id)
+        if component_id not in snapshot.components_by_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Component {component_id} not found in architecture {architecture_id}",
+            )
+        return self._blast_radii(snapshot)[component_id]
+
+    def get_blast_radii(self, architecture_id: str, limit: int | None = None) -> BlastRadiusReport:
+        """Blast radius of every component, largest first"""
+        snapshot = self._load_snapshot(architecture_id)
+        radii = sorted(self._blast_radii(snapshot).values(), key=lambda r: -r.reachable_components)
+        return BlastRadiusReport(
+            architecture_id=architecture_id,
+            total=len(radii),
+            components=radii[:limit] if limit is not None else radii,
+        )
+
+    def _blast_radii(self, snapshot: ArchitectureSnapshot) -> dict[str, BlastRadius]:
+        """
+        Blast radius of every component, cached until the architecture changes
+
+        Reachable sets come from one pass over the SCC condensation; the id
+        lists are decoded once per strongly connected component and shared
+        by its members.
+        """
+
+        def compute() -> dict[str, BlastRadius]:
+            graph = snapshot.graph
+            decoded: dict[int, tuple[list[int], list[str]]] = {}
+            radii = {}
+            for node, component in enumerate(snapshot.components):
+                scc = graph.scc_of(node)
+                if scc not in decoded:
+                    decoded[scc] = (
+                        list(iter_bits(graph.reachable(node))),
+                        [snapshot.zones[z].id for z in iter_bits(graph.reachable_zones(node))],
+                    )
+                nodes, zone_ids = decoded[scc]
+                component_ids = [graph.component(n).id for n in nodes if n != node]
+                radii[component.id] = BlastRadius(
+                    component_id=component.id,
+                    reachable_components=len(component_ids),
+                    reachable_zones=len(zone_ids),
+                    component_ids=component_ids,
+                    zone_ids=zone_ids,
+                )
+            return radii
+
+        return self.cache.get_or_compute(snapshot, ("blast-radius",), compute)
+
+    def get_cycles(self, architecture_id: str) -> CycleReport:
+        """Strongly connected groups and bidirectional pairs of the flow graph"""
+        snapshot = self._load_snapshot(architecture_id)
+
+        def compute() -> CycleReport:
+            graph = snapshot.graph
+            groups = []
+            for nodes, flow_ids in graph.cycles:
+                components = [graph.component(n) for n in nodes]
+                groups.append(
+                    ComponentGroup(
+                        component_ids=[c.id for c in components],
+                        zone_ids=list(dict.fromkeys(c.zone_id for c in components)),
+                        flow_ids=flow_ids,
+                    )
+                )
+            groups.sort(key=lambda g: -len(g.component_ids))
+            pairs = [
+                BidirectionalPair(
+                    component_ids=[graph.component(source).id, graph.component(target).id],
+                    flow_ids=list(dict.fromkeys((graph.edges[(source, target)], graph.edges[(target, source)]))),
+                )
+                for source, target in graph.reverse_pairs
+            ]
+            return CycleReport(architecture_id=architecture_id, groups=groups, bidirectional=pairs)
+
+        return self.cache.get_or_compute(snapshot, ("cycles",), compute)
+
+    def get_zone_matrix(self, architecture_id: str) -> ZoneMatrixReport:
+        """Flows aggregated per pair of zones, with protocols and encryption/authentication ratios"""
+        snapshot = self._load_snapshot(architecture_id)
+
+        def compute() -> ZoneMatrixReport:
+            matrix = snapshot.zone_matrix
+            trust = {z.id: z.trust_level for z in snapshot.zones}
+            links = [
+                ZoneLinkInfo(
+                    source_zone_id=link.source_zone_id,
+                    target_zone_id=link.target_zone_id,
+                    crosses_trust_boundary=trust.get(link.source_zone_id) != trust.get(link.target_zone_id),
+                    flow_count=link.flow_count,
+                    protocols=link.protocols,
+                    encrypted_ratio=link.encrypted_ratio,
+                    authenticated_ratio=link.authenticated_ratio,
+                    flow_ids=[snapshot.flows[i].id for i in link.flow_positions],
+                )
+                for link in matrix.links.values()
+            ]
+            return ZoneMatrixReport(
+                architecture_id=architecture_id,
+                zone_ids=[z.id for z in snapshot.zones],
+                flow_counts=matrix.counts(),
+                crossing_flows=len(snapshot.zone_crossing_flows),
+                links=links,
+            )
+
+        return self.cache.get_or_compute(snapshot, ("zone-matrix",), compute)
@@ -0,0 +1,58 @@
+"""Metrics service - Prometheus text export of analysis instrumentation"""
+
+from repositories.analysis_repository import AnalysisRepository
+
+
+def _sample(name: str, labels: dict[str, str], value) -> str:
+    label_text = ",".join(f'{key}="{val}"' for key, val in labels.items())
+    return f"{name}{{{label_text}}} {value}"
+
+
+class MetricsService:
+    """Renders stored per-rule profiles and analysis counts as Prometheus metrics"""
+
+    def __init__(self, repository: AnalysisRepository):
+        self.repository = repository
+
+    def render(self) -> str:
+        """
+        Prometheus text exposition format (version 0.0.4)
+
+        Built from the database rather than process memory, so analyses run
+        by background workers and portfolio processes are all included.
+        """
+        totals = self.repository.get_rule_profile_totals()
+        lines = [
+            "# HELP blackmane_rule_duration_seconds Wall time spent evaluating each rule",
+            "# TYPE blackmane_rule_duration_seconds summary",
+        ]
+        for rule_id, runs, seconds, _, _, _ in totals:
+            lines.append(_sample("blackmane_rule_duration_seconds_sum", {"rule": rule_id}, seconds))
+            lines.append(_sample("blackmane_rule_duration_seconds_count", {"rule": rule_id}, runs))
+
+        lines += [
+            "# HELP blackmane_rule_duration_seconds_max Longest single evaluation of each rule",
+            "# TYPE blackmane_rule_duration_seconds_max gauge",
+        ]
+        lines += [_sample("blackmane_rule_duration_seconds_max", {"rule": t[0]}, t[3]) for t in totals]
+
+        lines += [
+            "# HELP blackmane_rule_entities_scanned_total Components and flows read by each rule",
+            "# TYPE blackmane_rule_entities_scanned_total counter",
+        ]
+        lines += [_sample("blackmane_rule_entities_scanned_total", {"rule": t[0]}, t[4]) for t in totals]
+
+        lines += [
+            "# HELP blackmane_rule_findings_total Findings produced by each rule",
+            "# TYPE blackmane_rule_findings_total counter",
+        ]
+        lines += [_sample("blackmane_rule_findings_total", {"rule": t[0]}, t[5]) for t in totals]
+
+        lines += [
+            "# HELP blackmane_analyses Analyses by status",
+            "# TYPE blackmane_analyses gauge",
+        ]
+        for status, count in sorted(self.repository.count_by_status().items()):
+            lines.append(_sample("blackmane_analyses", {"status": status}, count))
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,203 @@
+"""Portfolio service - parallel analysis across many projects"""
+
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from threading import Event, Lock
+from typing import Callable, Optional
+
+from fastapi import HTTPException, status
+
+from config import get_settings
+from core.job_queue import JobQueue, JobQueueFull, get_job_queue
+from database.connection import SessionLocal
+from models.analysis import PortfolioAnalysis, PortfolioAnalysisRequest, ProjectAnalysisOutcome
+from repositories.analysis_repository import AnalysisRepository
+from repositories.project_repository import ProjectRepository
+from services.analysis_service import AnalysisService
+
+
+MAX_TRACKED_RUNS = 20
+
+
+def analyze_project(project_id: str) -> ProjectAnalysisOutcome:
+    """
+    Analyze one project in its own session
+
+    Runs inside a worker process: the worker loads its own architecture
+    snapshot and writes its findings in bulk, nothing is shared with the
+    parent process except the returned outcome. Always a full analysis: a
+    fresh process has no change tracking to run an incremental one from,
+    but an unchanged project is still served from the result cache.
+    """
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        analysis = AnalysisService(AnalysisRepository(db)).run_analysis(project_id)
+        return ProjectAnalysisOutcome(
+            project_id=project_id,
+            status="completed",
+            analysis_id=analysis.id,
+            total_findings=analysis.total_findings,
+            duration_seconds=time.perf_counter() - started,
+        )
+    except HTTPException as exc:
+        # Missing project or no architecture: nothing to analyze
+        return ProjectAnalysisOutcome(
+            project_id=project_id,
+            status="skipped",
+            duration_seconds=time.perf_counter() - started,
+            error=str(exc.detail),
+        )
+    except Exception as exc:
+        return ProjectAnalysisOutcome(
+            project_id=project_id,
+            status="failed",
+            duration_seconds=time.perf_counter() - started,
+            error=f"{type(exc).__name__}: {exc}",
+        )
+    finally:
+        db.close()
+
+
+class PortfolioRun:
+    """Progress of one batch analysis, updated as projects complete"""
+
+    def __init__(self, total_projects: int):
+        self.id = str(uuid.uuid4())
+        self.status = "running"
+        self.started_at = datetime.utcnow()
+        self.completed_at: Optional[datetime] = None
+        self.total_projects = total_projects
+        self.outcomes: list[ProjectAnalysisOutcome] = []
+        self._started = time.perf_counter()
+        self._finished: Optional[float] = None
+        self._lock = Lock()
+
+    def record(self, outcome: ProjectAnalysisOutcome) -> None:
+        with self._lock:
+            self.outcomes.append(outcome)
+
+    def finish(self, final_status: str) -> None:
+        with self._lock:
+            self.status = final_status
+            self.completed_at = datetime.utcnow()
+            self._finished = time.perf_counter()
+
+    def to_model(self) -> PortfolioAnalysis:
+        with self._lock:
+            outcomes = list(self.outcomes)
+            elapsed = (self._finished or time.perf_counter()) - self._started
+            counts = {"completed": 0, "skipped": 0, "failed": 0}
+            for outcome in outcomes:
+                counts[outcome.status] += 1
+            return PortfolioAnalysis(
+                id=self.id,
+                status=self.status,
+                started_at=self.started_at,
+                completed_at=self.completed_at,
+                total_projects=self.total_projects,
+                completed_projects=counts["completed"],
+                skipped_projects=counts["skipped"],
+                failed_projects=counts["failed"],
+                total_findings=sum(o.total_findings for o in outcomes),
+                elapsed_seconds=elapsed,
+                projects_per_second=len(outcomes) / elapsed if elapsed > 0 else 0.0,
+                outcomes=outcomes,
+            )
+
+
+def analyze_portfolio(
+    project_ids: list[str],
+    workers: Optional[int] = None,
+    run: Optional[PortfolioRun] = None,
+    progress: Optional[Callable[[PortfolioRun, ProjectAnalysisOutcome], None]] = None,
+    cancel: Optional[Event] = None,
+) -> PortfolioRun:
+    """
+    Fan out project analyses over a process pool
+
+    Args:
+        project_ids: Projects to analyze
+        workers: Worker processes (default: settings.portfolio_workers or CPU count)
+        run: Progress holder to update (created if omitted)
+        progress: Called in the parent after each project completes
+        cancel: Set to stop scheduling remaining projects
+
+    Returns:
+        The finished run
+    """
+    run = run or PortfolioRun(len(project_ids))
+    workers = workers or get_settings().portfolio_workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(project_ids) or 1))
+
+    # spawn: the parent is multi-threaded (uvicorn, job queue), fork is unsafe
+    context = multiprocessing.get_context("spawn")
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            futures = [executor.submit(analyze_project, pid) for pid in project_ids]
+            for future in as_completed(futures):
+                if cancel and cancel.is_set():
+                    for pending in futures:
+                        pending.cancel()
+                    run.finish("cancelled")
+                    return run
+
+                outcome = future.result()
+                run.record(outcome)
+                if progress:
+                    progress(run, outcome)
+    except Exception:
+        run.finish("failed")
+        raise
+
+    run.finish("completed")
+    return run
+
+
+_runs: dict[str, PortfolioRun] = {}
+_runs_lock = Lock()
+
+
+class PortfolioService:
+    """Service for batch analysis of the project portfolio"""
+
+    def __init__(self, repository: ProjectRepository):
+        self.repository = repository
+
+    def start_batch(self, request: PortfolioAnalysisRequest, jobs: JobQueue | None = None) -> PortfolioAnalysis:
+        """Queue a batch analysis in the background and return its progress"""
+        jobs = jobs or get_job_queue()
+        project_ids = request.project_ids if request.project_ids is not None else self.repository.get_all_ids()
+        run = PortfolioRun(len(project_ids))
+
+        try:
+            jobs.submit(
+                run.id,
+                lambda cancel: analyze_portfolio(project_ids, request.workers, run=run, cancel=cancel),
+            )
+        except JobQueueFull:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many analyses in progress, retry later",
+            )
+
+        with _runs_lock:
+            _runs[run.id] = run
+            finished = [r for r in _runs.values() if r.completed_at]
+            for old in sorted(finished, key=lambda r: r.completed_at)[: max(0, len(_runs) - MAX_TRACKED_RUNS)]:
+                _runs.pop(old.id, None)
+        return run.to_model()
+
+    def get_batch(self, batch_id: str) -> PortfolioAnalysis:
+        with _runs_lock:
+            run = _runs.get(batch_id)
+        if not run:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Batch analysis {batch_id} not found",
+            )
+        return run.to_model()
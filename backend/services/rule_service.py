@@ -0,0 +1,45 @@
+"""Rule service - inspection and reload of the active rule set"""
+
+from fastapi import HTTPException, status
+
+from core.rule_engine import RuleEngine, get_rule_engine, reload_rule_engine
+from core.rules.declarative import DeclarativeRule
+from models.rule import RuleInfo, RuleSet
+
+
+class RuleService:
+    """Service for the rule set used by new analyses"""
+
+    def get_rule_set(self) -> RuleSet:
+        return self._describe(get_rule_engine())
+
+    def reload(self) -> RuleSet:
+        """
+        Rebuild the rule set from the rule packs and swap it in
+
+        Analyses already running keep the rule set they started with; the
+        returned version is recorded by every analysis started afterwards.
+        """
+        try:
+            engine = reload_rule_engine()
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Rule set not reloaded: {exc}",
+            )
+        return self._describe(engine)
+
+    @staticmethod
+    def _describe(engine: RuleEngine) -> RuleSet:
+        rules = [
+            RuleInfo(
+                id=rule.id,
+                name=rule.name,
+                category=rule.category.value,
+                severity=rule.severity.value,
+                scope=rule.scope.value,
+                declarative=isinstance(rule, DeclarativeRule),
+            )
+            for rule in engine.registry.scheduled()
+        ]
+        return RuleSet(version=engine.registry.version, total=len(rules), rules=rules)
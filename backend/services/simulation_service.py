@@ -0,0 +1,92 @@
+"""Simulation service - what-if analyses computed in memory"""
+
+from collections import Counter
+
+from fastapi import HTTPException, status
+
+from config import get_settings
+from core.budget import Budget
+from core.graph import GraphResultCache, get_graph_cache
+from core.rule_engine import RuleEngine, get_rule_engine
+from core.rules import RuleFinding
+from core.simulation import OverlayError, finding_delta, overlay
+from core.snapshot import ArchitectureSnapshot
+from models.simulation import SimulatedFinding, SimulationRequest, SimulationResult
+from repositories.analysis_repository import compute_risk_score
+from repositories.architecture_repository import ArchitectureRepository
+
+
+class SimulationService:
+    """Service for what-if simulations: nothing is written to the database"""
+
+    def __init__(
+        self,
+        repository: ArchitectureRepository,
+        engine: RuleEngine | None = None,
+        cache: GraphResultCache | None = None,
+    ):
+        self.repository = repository
+        self.engine = engine or get_rule_engine()
+        self.cache = cache or get_graph_cache()
+
+    def simulate(self, architecture_id: str, request: SimulationRequest) -> SimulationResult:
+        """
+        Findings and risk score the architecture would have after the requested changes
+
+        The changes are applied as an overlay on the architecture snapshot
+        and both versions go through the rule engine in memory. Findings of
+        the unchanged architecture are cached per architecture version and
+        rule set, so repeated simulations only run the engine once.
+        """
+        if not self.repository.get_by_id(architecture_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Architecture {architecture_id} not found",
+            )
+        snapshot = self.repository.load_snapshot(architecture_id)
+
+        try:
+            simulated = overlay(
+                snapshot,
+                component_updates={c.id: c.model_dump(mode="json") for c in request.update_components},
+                flow_updates={f.id: f.model_dump(mode="json") for f in request.update_flows},
+                added_components=[c.model_dump(mode="json") for c in request.add_components],
+                added_flows=[f.model_dump(mode="json") for f in request.add_flows],
+                removed_components=request.remove_components,
+                removed_flows=request.remove_flows,
+            )
+        except OverlayError as exc:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc))
+
+        baseline = self.cache.get_or_compute(
+            snapshot, ("findings", self.engine.registry.version), lambda: self._findings(snapshot)
+        )
+        findings = self._findings(simulated)
+        delta = finding_delta(baseline, findings)
+
+        before = Counter(f.severity for f in baseline)
+        after = Counter(f.severity for f in findings)
+        baseline_score = compute_risk_score(before)
+        simulated_score = compute_risk_score(after)
+        return SimulationResult(
+            architecture_id=architecture_id,
+            rule_set_version=self.engine.registry.version,
+            baseline_risk_score=baseline_score,
+            simulated_risk_score=simulated_score,
+            risk_score_delta=simulated_score - baseline_score,
+            baseline_findings=len(baseline),
+            simulated_findings=len(findings),
+            severity_delta={s: after[s] - before[s] for s in sorted(before.keys() | after.keys())},
+            introduced=[SimulatedFinding.model_validate(f) for f in delta.introduced],
+            resolved=[SimulatedFinding.model_validate(f) for f in delta.resolved],
+        )
+
+    def _findings(self, snapshot: ArchitectureSnapshot) -> list[RuleFinding]:
+        result = self.engine.run(snapshot, Budget(timeout=get_settings().analysis_timeout))
+        if result.timed_out:
+            # A partial run would report unevaluated rules as resolved
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Simulation exceeded the analysis timeout",
+            )
+        return result.findings
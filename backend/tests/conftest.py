@@ -0,0 +1,171 @@
+"""
+Shared test fixtures
+
+The application's engines are built from DATABASE_URL when
+`database.connection` is first imported, so it is pointed at a temporary
+file here, before any test module imports the application.
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+import uuid
+from typing import Iterator
+
+import pytest
+
+_DB_DIR = tempfile.mkdtemp(prefix="blackmane-tests-")
+atexit.register(shutil.rmtree, _DB_DIR, ignore_errors=True)
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/blackmane.db"
+
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.engine import Connection, Engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from core.snapshot import ArchitectureSnapshot, ComponentSnapshot, FlowSnapshot, ZoneSnapshot  # noqa: E402
+from database.connection import ALEMBIC_INI, SessionLocal, init_db  # noqa: E402
+from models.orm import Architecture, Component, Flow, Project, Zone  # noqa: E402
+
+
+def migrate(connection: Connection, revision: str = "head") -> None:
+    """Upgrade the database behind `connection` to `revision` with Alembic"""
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["connection"] = connection
+    command.upgrade(config, revision)
+
+
+@pytest.fixture
+def empty_engine(tmp_path) -> Iterator[Engine]:
+    """Engine on a new, empty SQLite file"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def database() -> None:
+    """Application database, migrated once for the whole run"""
+    init_db()
+
+
+@pytest.fixture
+def db(database) -> Iterator[Session]:
+    """Session on the application's writer connection"""
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+def seed_architecture(db: Session, servers: int = 0) -> dict[str, str]:
+    """
+    Store a project with the reference architecture and commit it
+
+    Internet user -> API gateway -> database <-> IAM, plus an SSH flow from
+    the Internet to an admin server; `servers` more admin servers are chained
+    behind it over HTTP. Covers every rule the SQL backend pushes down.
+
+    Returns:
+        Entity ids by name: project, architecture, zones (internet, internal,
+        management), components (user, api, db, iam, admin, server-<i>)
+    """
+    ids = {"project": str(uuid.uuid4()), "architecture": str(uuid.uuid4())}
+    db.add(Project(id=ids["project"], name="Reference", project_type="cloud", criticality_level="high"))
+    db.add(Architecture(id=ids["architecture"], project_id=ids["project"]))
+
+    def zone(name, trust_level):
+        ids[name.lower()] = str(uuid.uuid4())
+        db.add(Zone(id=ids[name.lower()], architecture_id=ids["architecture"], name=name, trust_level=trust_level))
+
+    def component(key, zone_key, component_type, **attributes):
+        ids[key] = str(uuid.uuid4())
+        db.add(Component(
+            id=ids[key], architecture_id=ids["architecture"], zone_id=ids[zone_key],
+            name=key.title(), component_type=component_type, **attributes,
+        ))
+
+    def flow(source, target, protocol, **attributes):
+        db.add(Flow(
+            id=str(uuid.uuid4()), architecture_id=ids["architecture"],
+            source_component_id=ids[source], target_component_id=ids[target], protocol=protocol, **attributes,
+        ))
+
+    zone("Internet", "untrusted")
+    zone("Internal", "high")
+    zone("Management", "medium")
+    component("user", "internet", "other")
+    component("api", "internal", "api_gateway", has_admin_interface=True, has_logging=True)
+    component("db", "internal", "database")
+    component("iam", "internal", "iam")
+    component("admin", "management", "server", has_admin_interface=True)
+    db.flush()
+    flow("user", "api", "http")
+    flow("api", "db", "sql")
+    flow("db", "iam", "ldap")
+    flow("iam", "db", "ldap")
+    flow("user", "admin", "ssh")
+    previous = "admin"
+    for i in range(servers):
+        component(f"server-{i}", "management", "server", has_admin_interface=True)
+        db.flush()
+        flow(previous, f"server-{i}", "http")
+        previous = f"server-{i}"
+    db.commit()
+    return ids
+
+
+def make_snapshot(
+    zones: dict[str, str],
+    components: dict[str, tuple],
+    flows: list[tuple],
+) -> ArchitectureSnapshot:
+    """
+    In-memory snapshot where ids double as names
+
+    Args:
+        zones: zone id -> trust level
+        components: component id -> (zone id, component type[, attribute overrides])
+        flows: (source id, target id, protocol[, attribute overrides]); the
+            flow id is "source->target"
+    """
+    return ArchitectureSnapshot(
+        "architecture",
+        tuple(ZoneSnapshot(id=z, name=z.title(), trust_level=trust) for z, trust in zones.items()),
+        tuple(
+            ComponentSnapshot(**{
+                "id": c, "zone_id": spec[0], "name": c.title(), "component_type": spec[1],
+                "has_admin_interface": False, "requires_mfa": False, "has_logging": False,
+                "encryption_at_rest": False, "encryption_in_transit": False,
+                **(spec[2] if len(spec) > 2 else {}),
+            })
+            for c, spec in components.items()
+        ),
+        tuple(
+            FlowSnapshot(**{
+                "id": f"{spec[0]}->{spec[1]}", "source_component_id": spec[0], "target_component_id": spec[1],
+                "protocol": spec[2], "port": None, "is_authenticated": False, "is_encrypted": False,
+                **(spec[3] if len(spec) > 3 else {}),
+            })
+            for spec in flows
+        ),
+    )
+
+
+# In-memory twin of `seed_architecture(db)`
+REFERENCE_ZONES = {"internet": "untrusted", "internal": "high", "management": "medium"}
+REFERENCE_COMPONENTS = {
+    "user": ("internet", "other"),
+    "api": ("internal", "api_gateway", {"has_admin_interface": True, "has_logging": True}),
+    "db": ("internal", "database"),
+    "iam": ("internal", "iam"),
+    "admin": ("management", "server", {"has_admin_interface": True}),
+}
+REFERENCE_FLOWS = [
+    ("user", "api", "http"),
+    ("api", "db", "sql"),
+    ("db", "iam", "ldap"),
+    ("iam", "db", "ldap"),
+    ("user", "admin", "ssh"),
+]
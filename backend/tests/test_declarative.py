@@ -0,0 +1,90 @@
+"""
+Tests for declarative rule packs: compilation, evaluation and definition errors
+"""
+
+import json
+
+import pytest
+
+from core.rules import RuleScope
+from core.rules.declarative import RuleDefinitionError, compile_rule_pack
+from tests.conftest import REFERENCE_COMPONENTS, REFERENCE_FLOWS, REFERENCE_ZONES, make_snapshot
+
+
+def rule(**overrides) -> dict:
+    definition = {
+        "id": "ORG-001",
+        "name": "Database without logging",
+        "description": "Databases must keep an audit trail",
+        "category": "observability",
+        "severity": "high",
+        "rationale": "Audit trails are required on every data store",
+        "target": "component",
+        "when": {"all": [{"field": "component_type", "eq": "database"}, {"field": "has_logging", "eq": False}]},
+        "finding": {"title": "No logging on {component.name}", "description": "d", "impact": "i"},
+    }
+    definition.update(overrides)
+    return definition
+
+
+def pack(*rules) -> bytes:
+    return json.dumps({"rules": list(rules)}).encode()
+
+
+def test_rule_pack_compiles_and_evaluates():
+    (compiled,) = compile_rule_pack(pack(rule()), "pack.json")
+    snapshot = make_snapshot(REFERENCE_ZONES, REFERENCE_COMPONENTS, REFERENCE_FLOWS)
+    findings = list(compiled.evaluate(snapshot))
+    assert [(f.rule_id, f.title, f.affected_component_id) for f in findings] == [("ORG-001", "No logging on Db", "db")]
+    assert compiled.scope == RuleScope.COMPONENT
+
+
+def test_rule_reading_zones_runs_on_the_whole_architecture():
+    zone_rule = rule(when={"field": "zone.trust_level", "eq": "high"})
+    (compiled,) = compile_rule_pack(pack(zone_rule), "pack.json")
+    assert compiled.scope == RuleScope.ARCHITECTURE
+
+
+def test_yaml_rule_pack():
+    pytest.importorskip("yaml")
+    content = b"""
+rules:
+  - id: ORG-002
+    name: Cleartext admin protocol
+    description: d
+    category: network
+    severity: medium
+    rationale: r
+    target: flow
+    when: {field: protocol, in: [ssh, rdp]}
+    finding: {title: "{flow.protocol} to {target.name}", description: d, impact: i}
+"""
+    (compiled,) = compile_rule_pack(content, "pack.yaml")
+    snapshot = make_snapshot(REFERENCE_ZONES, REFERENCE_COMPONENTS, REFERENCE_FLOWS)
+    assert [f.title for f in compiled.evaluate(snapshot)] == ["ssh to Admin"]
+
+
+@pytest.mark.parametrize(
+    "content, message",
+    [
+        (b"{not json", "pack.json"),
+        (json.dumps({"rule": []}).encode(), "top-level 'rules' list"),
+        (pack(rule(), rule()), "duplicate rule ids ORG-001"),
+        (pack({k: v for k, v in rule().items() if k != "rationale"}), "missing rationale"),
+        (pack(rule(colour="red")), "unknown colour"),
+        (pack(rule(severity="urgent")), "urgent"),
+        (pack(rule(target="zone")), "target must be one of"),
+        (pack(rule(when={"field": "colour", "eq": "red"})), "unknown component field 'colour'"),
+        (pack(rule(when={"field": "source.name", "eq": "x"})), "unknown reference 'source'"),
+        (pack(rule(when={"field": "component_type", "eq": "mainframe"})), "cannot be 'mainframe'"),
+        (pack(rule(when={"field": "has_logging", "eq": "no"})), "expects a bool"),
+        (pack(rule(when={"field": "has_logging", "eq": False, "ne": True})), "exactly one operator"),
+        (pack(rule(when={"field": "component_type", "in": []})), "non-empty list"),
+        (pack(rule(when={"field": "has_logging", "contains": "x"})), "contains expects a text field"),
+        (pack(rule(finding={"title": "t", "description": "d"})), "finding must define exactly"),
+        (pack(rule(cost=-1)), "cost must be a non-negative integer"),
+    ],
+)
+def test_invalid_rule_pack_is_rejected(content, message):
+    with pytest.raises(RuleDefinitionError, match=message):
+        compile_rule_pack(content, "pack.json")
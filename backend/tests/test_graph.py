@@ -0,0 +1,93 @@
+"""
+Tests for the component graph: strongly connected groups, reachability and paths
+"""
+
+from core.paths import WeightedPaths
+from tests.conftest import make_snapshot
+
+ZONES = {"edge": "untrusted", "core": "high"}
+
+
+def graph_of(components, flows):
+    return make_snapshot(ZONES, components, flows).graph
+
+
+def names(graph, nodes):
+    return [graph.component(node).id for node in nodes]
+
+
+def test_cycles_group_components_reaching_each_other():
+    graph = graph_of(
+        {name: ("core", "server") for name in "abcde"},
+        [("a", "b", "http"), ("b", "c", "http"), ("c", "a", "http"), ("c", "d", "http"), ("e", "e", "http")],
+    )
+    groups = {frozenset(names(graph, nodes)): set(flows) for nodes, flows in graph.cycles}
+    assert groups == {
+        frozenset("abc"): {"a->b", "b->c", "c->a"},
+        frozenset("e"): {"e->e"},
+    }
+    assert graph.scc_of(graph.node_of["a"]) == graph.scc_of(graph.node_of["c"])
+    assert graph.scc_of(graph.node_of["a"]) != graph.scc_of(graph.node_of["d"])
+
+
+def test_acyclic_graph_has_no_cycles():
+    graph = graph_of({name: ("core", "server") for name in "abc"}, [("a", "b", "http"), ("b", "c", "http")])
+    assert graph.cycles == []
+    assert graph.reverse_pairs == []
+
+
+def test_reverse_pairs_report_each_pair_once():
+    graph = graph_of(
+        {name: ("core", "server") for name in "abc"},
+        [("a", "b", "http"), ("b", "a", "http"), ("b", "c", "http")],
+    )
+    assert [tuple(names(graph, pair)) for pair in graph.reverse_pairs] == [("a", "b")]
+
+
+def test_reachability_follows_flow_direction():
+    graph = graph_of(
+        {"u": ("edge", "other"), "a": ("core", "server"), "b": ("core", "server")},
+        [("u", "a", "http"), ("a", "b", "http")],
+    )
+    node = graph.node_of
+    assert graph.reachable(node["u"]) == graph.bits(["u", "a", "b"])
+    assert graph.reachable(node["b"]) == graph.bits(["b"])
+    assert graph.reachable_zones(node["b"]) == 0b10  # core only
+
+
+def test_shortest_path_takes_the_fewest_hops():
+    graph = graph_of(
+        {name: ("core", "server") for name in "abcd"},
+        [("a", "b", "http"), ("b", "c", "http"), ("c", "d", "http"), ("a", "d", "http")],
+    )
+    source, target = graph.node_of["a"], graph.node_of["d"]
+    path = graph.path_to(graph.shortest_paths(source), target)
+    assert names(graph, path) == ["a", "d"]
+    assert graph.flows_along(path) == ["a->d"]
+    assert graph.path_to(graph.shortest_paths(target), source) == []
+
+
+def test_weighted_paths_rank_cheapest_first():
+    snapshot = make_snapshot(
+        ZONES,
+        {
+            "user": ("edge", "other"),
+            "firewall": ("core", "firewall"),
+            "web": ("core", "server"),
+            "db": ("core", "database"),
+        },
+        [
+            # Through a firewall: 1 + 5, then 1
+            ("user", "firewall", "https"),
+            ("firewall", "db", "sql"),
+            # Two plain hops: 1, then 1
+            ("user", "web", "http"),
+            ("web", "db", "sql"),
+        ],
+    )
+    graph = snapshot.graph
+    paths = WeightedPaths(snapshot, [graph.node_of["user"]], [graph.node_of["db"]]).shortest(k=3)
+    assert [(cost, names(graph, path)) for cost, path in paths] == [
+        (2.0, ["user", "web", "db"]),
+        (7.0, ["user", "firewall", "db"]),
+    ]
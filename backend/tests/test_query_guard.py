@@ -0,0 +1,38 @@
+"""
+Tests for the query guard: an analysis issues a fixed number of SELECTs
+"""
+
+import pytest
+
+from core.change_tracker import ChangeTracker
+from database.query_guard import QueryBudgetExceeded, count_selects
+from models.orm import Component
+from repositories.analysis_repository import AnalysisRepository
+from services.analysis_service import ANALYSIS_SELECT_BUDGET, AnalysisService
+from tests.conftest import seed_architecture
+
+
+def analysis_selects(db, project_id: str) -> int:
+    repository = AnalysisRepository(db)
+    analysis_id = repository.create_analysis(project_id, "pending").id
+    repository.commit()
+    with count_selects(db, ANALYSIS_SELECT_BUDGET) as counter:
+        result = AnalysisService(repository, changes=ChangeTracker()).execute_analysis(analysis_id)
+    assert result.status == "completed"
+    return counter.count
+
+
+def test_analysis_selects_do_not_grow_with_the_architecture(db):
+    small = seed_architecture(db)
+    large = seed_architecture(db, servers=60)
+    assert analysis_selects(db, small["project"]) == analysis_selects(db, large["project"])
+
+
+def test_lazy_loads_exceed_the_budget(db):
+    ids = seed_architecture(db, servers=20)
+    db.expunge_all()
+    with pytest.raises(QueryBudgetExceeded):
+        with count_selects(db, ANALYSIS_SELECT_BUDGET):
+            # One SELECT per component: the N+1 pattern the guard is for
+            for component in db.query(Component).filter(Component.architecture_id == ids["architecture"]):
+                component.flows_as_source
@@ -0,0 +1,47 @@
+"""
+Tests for the schema migrations and the hot query plans
+"""
+
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import inspect
+
+from database.connection import Base
+from database.query_plans import HOT_QUERIES, explain, full_scans
+from tests.conftest import migrate
+
+
+def schema_diff(connection):
+    return compare_metadata(MigrationContext.configure(connection), Base.metadata)
+
+
+def test_migrations_build_the_orm_schema(empty_engine):
+    with empty_engine.begin() as connection:
+        migrate(connection)
+        assert schema_diff(connection) == []
+
+
+def test_baseline_database_is_upgraded(empty_engine):
+    # A database from before the analysis result columns, some of them added by hand
+    with empty_engine.begin() as connection:
+        migrate(connection, "0001")
+        connection.exec_driver_sql("ALTER TABLE analyses ADD COLUMN content_hash VARCHAR(64)")
+        migrate(connection)
+        columns = {column["name"] for column in inspect(connection).get_columns("analyses")}
+        assert {"content_hash", "rule_completion", "rule_set_version"} <= columns
+        assert schema_diff(connection) == []
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_an_index(empty_engine, name):
+    with empty_engine.begin() as connection:
+        migrate(connection)
+        plan = explain(connection, HOT_QUERIES[name]())
+    assert full_scans(plan) == [], plan
+
+
+def test_full_scans_detects_a_table_scan():
+    assert full_scans(["SCAN findings"]) == ["SCAN findings"]
+    assert full_scans(["SCAN findings USING COVERING INDEX ix_findings_analysis_rule"]) == []
+    assert full_scans(["SEARCH findings USING INDEX ix_findings_analysis_rule (analysis_id=?)"]) == []
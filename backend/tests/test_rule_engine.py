@@ -0,0 +1,142 @@
+"""
+Tests for the rule engine: findings, incremental runs and time budgets
+"""
+
+import time
+from collections import Counter
+
+from core.budget import Budget, checkpoint
+from core.change_tracker import ChangeSet
+from core.rule_engine import RULE_COMPLETED, RULE_PARTIAL, RULE_SKIPPED, RuleEngine, RuleRegistry
+from core.rules import Rule, RuleCategory, Severity, default_rules
+from tests.conftest import REFERENCE_COMPONENTS, REFERENCE_FLOWS, REFERENCE_ZONES, make_snapshot
+
+# Findings of the built-in rules on the reference architecture, as first released
+REFERENCE_FINDINGS = [
+    ("SEC-001", "high", "Admin interface without MFA on Admin", "admin", None),
+    ("SEC-001", "high", "Admin interface without MFA on Api", "api", None),
+    ("SEC-002", "critical", "Critical component Api accessible without authentication", "api", None),
+    ("SEC-002", "critical", "Critical component Db accessible without authentication", "db", None),
+    ("SEC-002", "critical", "Critical component Iam accessible without authentication", "iam", None),
+    ("SEC-003", "critical", "Direct Internet access to Admin in internal zone", None, "user->admin"),
+    ("SEC-003", "critical", "Direct Internet access to Api in internal zone", None, "user->api"),
+    ("SEC-004", "high", "No bastion host for administrative access", "api", None),
+    ("SEC-005", "medium", "Uncontrolled flow between User and Admin", None, "user->admin"),
+    ("SEC-005", "medium", "Uncontrolled flow between User and Api", None, "user->api"),
+    ("SEC-006", "critical", "Management zone accessible from Internet", None, "user->admin"),
+    ("SEC-007", "high", "Unencrypted flow between Internet and Internal", None, "user->api"),
+    ("SEC-007", "high", "Unencrypted flow between Internet and Management", None, "user->admin"),
+    ("SEC-008", "medium", "No segmentation between Db and Iam", "db", None),
+    ("SEC-009", "high", "Internet-exposed Admin without firewall protection", "admin", None),
+    ("SEC-009", "high", "Internet-exposed Api without firewall protection", "api", None),
+    ("SEC-010", "low", "Bidirectional flow between Db and Iam", None, "db->iam"),
+    ("SEC-011", "high", "Database Db without encryption at rest", "db", None),
+    ("SEC-012", "high", "Unencrypted ldap flow between Db and Iam", None, "db->iam"),
+    ("SEC-012", "high", "Unencrypted ldap flow between Iam and Db", None, "iam->db"),
+    ("SEC-012", "high", "Unencrypted sql flow between Api and Db", None, "api->db"),
+    ("SEC-013", "critical", "API Api exposed over HTTP", None, "user->api"),
+    ("SEC-014", "medium", "No logging enabled on Admin", "admin", None),
+    ("SEC-014", "medium", "No logging enabled on Db", "db", None),
+    ("SEC-014", "medium", "No logging enabled on Iam", "iam", None),
+    ("SEC-015", "medium", "No centralized logging solution detected", "api", None),
+]
+
+
+def default_engine() -> RuleEngine:
+    return RuleEngine(RuleRegistry(default_rules()))
+
+
+def reference_snapshot():
+    return make_snapshot(REFERENCE_ZONES, REFERENCE_COMPONENTS, REFERENCE_FLOWS)
+
+
+def summary(findings) -> list[tuple]:
+    return sorted(
+        (f.rule_id, f.severity, f.title, f.affected_component_id, f.affected_flow_id) for f in findings
+    )
+
+
+class SlowRule(Rule):
+    """Runs until the budget stops it"""
+
+    def __init__(self):
+        super().__init__("SEC-999", "Slow", "Never ends", RuleCategory.NETWORK, Severity.CRITICAL, "Tests")
+
+    def evaluate(self, architecture):
+        while True:
+            checkpoint()
+            time.sleep(0.001)
+        yield
+
+
+def test_reference_findings_are_unchanged():
+    result = default_engine().run(reference_snapshot())
+    assert summary(result.findings) == REFERENCE_FINDINGS
+    assert set(result.rule_status.values()) == {RULE_COMPLETED}
+
+
+def test_incremental_run_matches_full_run_after_edits():
+    engine = default_engine()
+    components = dict(REFERENCE_COMPONENTS)
+    flows = list(REFERENCE_FLOWS)
+    previous = engine.run(reference_snapshot()).findings
+
+    edits = [
+        # Attribute changes
+        (
+            lambda: components.update(
+                admin=("management", "server", {"has_admin_interface": True, "requires_mfa": True}),
+                db=("internal", "database", {"encryption_at_rest": True}),
+            ),
+            ChangeSet(component_ids={"admin", "db"}),
+        ),
+        # A component deleted with its flows
+        (
+            lambda: (components.pop("iam"), flows.remove(("db", "iam", "ldap")), flows.remove(("iam", "db", "ldap"))),
+            ChangeSet(component_ids={"iam"}),
+        ),
+        # A new flow
+        (lambda: flows.append(("api", "admin", "https", {"is_encrypted": True})), ChangeSet(flow_ids={"api->admin"})),
+    ]
+    for edit, changes in edits:
+        edit()
+        snapshot = make_snapshot(REFERENCE_ZONES, components, flows)
+        incremental = engine.run_incremental(snapshot, changes, previous)
+        full = engine.run(snapshot)
+        assert Counter(incremental.findings) == Counter(full.findings)
+        previous = full.findings
+
+
+def test_incremental_run_without_changes_carries_everything_forward():
+    engine = default_engine()
+    snapshot = reference_snapshot()
+    previous = engine.run(snapshot).findings
+    result = engine.run_incremental(snapshot, ChangeSet(), previous)
+    assert Counter(result.findings) == Counter(previous)
+
+
+def test_timeout_marks_remaining_rules_skipped():
+    engine = RuleEngine(RuleRegistry(default_rules() + [SlowRule()]))
+    result = engine.run(reference_snapshot(), Budget(timeout=0.05))
+
+    assert result.timed_out
+    order = [rule.id for rule in engine.registry.scheduled()]
+    slow = order.index("SEC-999")
+    assert slow < len(order) - 1, "the slow rule must not be the last one scheduled"
+    assert result.rule_status["SEC-999"] == RULE_PARTIAL
+    assert all(result.rule_status[rule_id] == RULE_COMPLETED for rule_id in order[:slow])
+    assert all(result.rule_status[rule_id] == RULE_SKIPPED for rule_id in order[slow + 1:])
+    assert {f.rule_id for f in result.findings} <= set(order[:slow])
+
+
+def test_result_key_depends_on_content_and_rule_set():
+    engine = default_engine()
+    snapshot = reference_snapshot()
+    assert engine.result_key(snapshot) == default_engine().result_key(reference_snapshot())
+
+    logged_db = {**REFERENCE_COMPONENTS, "db": ("internal", "database", {"has_logging": True})}
+    changed = make_snapshot(REFERENCE_ZONES, logged_db, REFERENCE_FLOWS)
+    assert engine.result_key(changed) != engine.result_key(snapshot)
+
+    extended = RuleEngine(RuleRegistry(default_rules() + [SlowRule()]))
+    assert extended.result_key(snapshot) != engine.result_key(snapshot)
@@ -1,16 +1,47 @@
-import { api } from './api'
-import type { Analysis, FindingList } from '../types/analysis'
+import { api, API_BASE_URL } from './api'
+import type { Analysis, FindingEvent, FindingList } from '../types/analysis'
+
+const POLL_INTERVAL_MS = 500
 
 export const analysisService = {
   async run(projectId: string): Promise<Analysis> {
-    return api.post<Analysis>(`/api/v1/projects/${projectId}/analyze`, {})
+    let analysis = await api.post<Analysis>(`/api/v1/projects/${projectId}/analyze`, {})
+    while (analysis.status === 'pending' || analysis.status === 'running') {
+      await new Promise((resolve) => setTimeout(resolve, POLL_INTERVAL_MS))
+      analysis = await analysisService.get(analysis.id)
+    }
+    return analysis
+  },
+
+  async get(analysisId: string): Promise<Analysis> {
+    return api.get<Analysis>(`/api/v1/analyses/${analysisId}`)
+  },
+
+  async cancel(analysisId: string): Promise<Analysis> {
+    return api.post<Analysis>(`/api/v1/analyses/${analysisId}/cancel`, {})
   },
 
   async getLatest(projectId: string): Promise<Analysis> {
     return api.get<Analysis>(`/api/v1/projects/${projectId}/analysis/latest`)
   },
 
-  async getFindings(projectId: string): Promise<FindingList> {
-    return api.get<FindingList>(`/api/v1/projects/${projectId}/findings`)
+  async getFindings(projectId: string, limit?: number, offset = 0): Promise<FindingList> {
+    const page = limit ? `?limit=${limit}&offset=${offset}` : ''
+    return api.get<FindingList>(`/api/v1/projects/${projectId}/findings${page}`)
+  },
+
+  /** Follow findings as they are produced; returns a function closing the stream */
+  streamFindings(
+    analysisId: string,
+    onFinding: (finding: FindingEvent) => void,
+    onEnd: (analysis: Analysis) => void
+  ): () => void {
+    const source = new EventSource(`${API_BASE_URL}/api/v1/analyses/${analysisId}/findings/stream?format=sse`)
+    source.addEventListener('finding', (e) => onFinding(JSON.parse((e as MessageEvent).data)))
+    source.addEventListener('end', (e) => {
+      source.close()
+      onEnd(JSON.parse((e as MessageEvent).data))
+    })
+    return () => source.close()
   },
 }
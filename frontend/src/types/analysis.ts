@@ -31,3 +31,5 @@ export interface FindingList {
   findings: Finding[]
   total: number
 }
+
+export type FindingEvent = Omit<Finding, 'id' | 'created_at'> & { id?: string | null }